@@ -0,0 +1,360 @@
+"""
+Offline SwiftStore benchmarks against the in-process FakeSwift server.
+
+Measures throughput and latency of chunk writes and reads, partial reads,
+listings and zarr array create/overwrite, for each transport and
+concurrency level. Network conditions are emulated with ``--latency``,
+``--bandwidth`` and ``--error-rate``::
+
+    python -m benchmarks.bench_store
+    python -m benchmarks.bench_store --latency 0.01 --concurrency 1 16 64
+    python -m benchmarks.bench_store --scenario read partial --json before.json
+
+Compare two ``--json`` outputs with ``--compare before.json after.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+import zarr
+import zarr.api.asynchronous
+from zarr.abc.store import RangeByteRequest
+from zarr.core.buffer import cpu, default_buffer_prototype
+
+from zarrswift import SwiftStore, storage
+from zarrswift.limiter import ConcurrencyLimits
+from zarrswift.readahead import ReadAhead
+from zarrswift.retry import RetryPolicy
+from zarrswift.testing import FakeSwift
+
+MiB = 1 << 20
+SCENARIOS = ("write", "read", "scan", "partial", "list", "array")
+
+
+@dataclass
+class Result:
+    scenario: str
+    transport: str
+    concurrency: int
+    ops: int
+    seconds: float
+    nbytes: int
+    requests: int
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.seconds
+
+    @property
+    def mib_per_second(self) -> float:
+        return self.nbytes / MiB / self.seconds
+
+
+async def _run(
+    ops: list[Callable[[], Awaitable[Any]]], concurrency: int
+) -> tuple[float, list[float]]:
+    """Run ``ops`` with at most ``concurrency`` in flight; wall time and latencies."""
+    latencies: list[float] = []
+    queue = iter(ops)
+
+    async def worker() -> None:
+        for op in queue:
+            started = time.perf_counter()
+            await op()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+
+
+async def bench_write(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    payload = cpu.Buffer.from_bytes(os.urandom(args.chunk_size))
+    ops = [
+        lambda i=i: store.set(f"chunks/c/{i}", payload) for i in range(args.chunks)
+    ]
+    return ops, args.chunks * args.chunk_size
+
+
+async def bench_read(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    await _ensure_chunks(store, args)
+    proto = default_buffer_prototype()
+    ops = [lambda i=i: store.get(f"chunks/c/{i}", proto) for i in range(args.chunks)]
+    return ops, args.chunks * args.chunk_size
+
+
+async def bench_scan(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    # walk an array's chunk grid in order, as a time-series scan does
+    await _ensure_chunks(store, args)
+    proto = default_buffer_prototype()
+    ops = [lambda i=i: store.get(f"chunks/c/{i}", proto) for i in range(args.chunks)]
+    return ops, args.chunks * args.chunk_size
+
+
+async def bench_partial(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    # sharded-array access: many small ranges of one large object
+    shard_size = max(args.chunk_size * 4, 64 * args.range_size)
+    if not await store.exists("shard"):
+        await store.set("shard", cpu.Buffer.from_bytes(os.urandom(shard_size)))
+    proto = default_buffer_prototype()
+    rng = random.Random(0)
+
+    def request() -> list[tuple[str, RangeByteRequest]]:
+        starts = rng.sample(range(0, shard_size - args.range_size, args.range_size), 16)
+        return [("shard", RangeByteRequest(s, s + args.range_size)) for s in starts]
+
+    ops = [lambda: store.get_partial_values(proto, request())] * args.chunks
+    return ops, args.chunks * 16 * args.range_size
+
+
+async def bench_list(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    if not await store.exists(f"listing/{args.list_keys - 1}"):
+        empty = cpu.Buffer.from_bytes(b"")
+        await _run(
+            [lambda i=i: store.set(f"listing/{i}", empty) for i in range(args.list_keys)],
+            32,
+        )
+
+    async def listing() -> None:
+        async for _ in store.list_prefix("listing/"):
+            pass
+
+    return [listing] * max(args.chunks // 8, 1), 0
+
+
+async def bench_array(store: SwiftStore, args: argparse.Namespace, concurrency: int):
+    side = round((args.chunks * args.chunk_size // 8) ** 0.5)
+    chunk_side = max(int((args.chunk_size // 8) ** 0.5), 1)
+    data = np.random.default_rng(0).random((side, side))
+    zarr.config.set({"async.concurrency": concurrency})
+
+    # created up front: the timed writes may run concurrently
+    await zarr.api.asynchronous.create_array(
+        store, name="array", shape=data.shape, chunks=(chunk_side, chunk_side),
+        dtype=data.dtype, overwrite=True,
+    )
+
+    async def overwrite() -> None:
+        array = await zarr.api.asynchronous.open_array(store=store, path="array")
+        await array.setitem(slice(None), data)
+
+    return [overwrite] * 3, 3 * data.nbytes
+
+
+async def _ensure_chunks(store: SwiftStore, args: argparse.Namespace) -> None:
+    if await store.exists(f"chunks/c/{args.chunks - 1}"):
+        return
+    ops, _ = await bench_write(store, args, 32)
+    await _run(ops, 32)
+
+
+BENCHMARKS = {
+    "write": bench_write,
+    "read": bench_read,
+    "scan": bench_scan,
+    "partial": bench_partial,
+    "list": bench_list,
+    "array": bench_array,
+}
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+
+
+async def run_scenario(
+    servers: list[FakeSwift], scenario: str, transport: str, concurrency: int,
+    args: argparse.Namespace,
+) -> Result:
+    options = servers[0].auth_options
+    if len(servers) > 1:
+        options["endpoints"] = [server.url for server in servers]
+    store = await SwiftStore.open(
+        "bench",
+        prefix=scenario,
+        storage_options=options,
+        transport=transport,
+        max_connections=max(concurrency, 1) + args.read_ahead,
+        retry=RetryPolicy(max_attempts=20, backoff_base=0.01),
+        concurrency=_limits(args),
+        read_ahead=ReadAhead(depth=args.read_ahead) if args.read_ahead else None,
+    )
+    try:
+        ops, nbytes = await BENCHMARKS[scenario](store, args, concurrency)
+        before = sum(server.count() for server in servers)
+        seconds, latencies = await _run(ops, concurrency)
+        requests = sum(server.count() for server in servers) - before
+    finally:
+        store.close()
+    return Result(
+        scenario, transport, concurrency, len(ops), seconds, nbytes, requests,
+        _quantile(latencies, 0.5), _quantile(latencies, 0.99),
+    )
+
+
+def _limits(args: argparse.Namespace) -> ConcurrencyLimits | None:
+    if args.limits is None and not args.adaptive:
+        return None
+    read, write, listing = args.limits or (64, 32, 4)
+    return ConcurrencyLimits(read=read, write=write, listing=listing, adaptive=args.adaptive)
+
+
+def _print(results: list[Result]) -> None:
+    header = (
+        f"{'scenario':<9} {'transport':<11} {'conc':>5} {'ops':>6} {'ops/s':>9} "
+        f"{'MiB/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'req/op':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.scenario:<9} {r.transport:<11} {r.concurrency:>5} {r.ops:>6} "
+            f"{r.ops_per_second:>9.1f} {r.mib_per_second:>9.1f} {r.p50_ms:>8.2f} "
+            f"{r.p99_ms:>8.2f} {r.requests / r.ops:>7.2f}"
+        )
+
+
+def _compare(before_path: str, after_path: str) -> None:
+    def load(path: str) -> dict[tuple[str, str, int], dict[str, Any]]:
+        with open(path) as f:
+            rows = json.load(f)["results"]
+        return {(r["scenario"], r["transport"], r["concurrency"]): r for r in rows}
+
+    before, after = load(before_path), load(after_path)
+    print(f"{'scenario':<9} {'transport':<11} {'conc':>5} {'ops/s':>19} {'p99 ms':>19}")
+    for key in sorted(before.keys() & after.keys()):
+        b, a = before[key], after[key]
+        b_ops, a_ops = b["ops"] / b["seconds"], a["ops"] / a["seconds"]
+        print(
+            f"{key[0]:<9} {key[1]:<11} {key[2]:>5} "
+            f"{b_ops:>8.1f} -> {a_ops:>8.1f} {b['p99_ms']:>8.2f} -> {a['p99_ms']:>8.2f}"
+            f"  ({a_ops / b_ops - 1:+.0%})"
+        )
+
+
+async def main(args: argparse.Namespace) -> list[Result]:
+    results = []
+    with FakeSwift(
+        latency=args.latency,
+        bandwidth=args.bandwidth * MiB if args.bandwidth else None,
+        error_rate=args.error_rate,
+        max_in_flight=args.server_limit,
+    ) as server:
+        # more proxies of the same cluster, each with the same network conditions
+        servers = [server] + [
+            server.proxy(
+                latency=server.latency,
+                bandwidth=server.bandwidth,
+                error_rate=server.error_rate,
+                max_in_flight=server.max_in_flight,
+            ).start()
+            for _ in range(args.proxies - 1)
+        ]
+        for scenario in args.scenario:
+            for transport in args.transport:
+                for concurrency in args.concurrency:
+                    storage._known_containers.clear()
+                    samples = [
+                        await run_scenario(servers, scenario, transport, concurrency, args)
+                        for _ in range(args.repeat)
+                    ]
+                    # report the median run by throughput
+                    samples.sort(key=lambda r: r.ops_per_second)
+                    results.append(samples[len(samples) // 2])
+                    if args.verbose:
+                        _print(results[-1:])
+        for proxy in servers[1:]:
+            proxy.stop()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--transport", nargs="+", choices=storage.TRANSPORTS,
+                        default=list(storage.TRANSPORTS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--chunks", type=int, default=128,
+                        help="operations per scenario (default: 128)")
+    parser.add_argument("--chunk-size", type=int, default=256 * 1024,
+                        help="bytes per chunk (default: 256 KiB)")
+    parser.add_argument("--range-size", type=int, default=4096,
+                        help="bytes per range of partial reads (default: 4096)")
+    parser.add_argument("--list-keys", type=int, default=2000,
+                        help="objects listed by the list scenario (default: 2000)")
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="seconds added to every request (default: 0.002)")
+    parser.add_argument("--bandwidth", type=float, default=None,
+                        help="MiB/s per request body (default: unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of object requests failing with 503")
+    parser.add_argument("--server-limit", type=int, default=None, metavar="N",
+                        help="server answers 429 beyond N concurrent requests")
+    parser.add_argument("--limits", nargs=3, type=int, metavar=("READ", "WRITE", "LIST"),
+                        help="store ConcurrencyLimits (default: none)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="adapt the store's limits to throttling (AIMD)")
+    parser.add_argument("--proxies", type=int, default=1, metavar="N",
+                        help="proxies the store balances requests over (default: 1)")
+    parser.add_argument("--read-ahead", type=int, default=0, metavar="DEPTH",
+                        help="store ReadAhead depth (default: no read-ahead)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per configuration; the median is reported")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two --json outputs and exit")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="print each result as soon as it is measured")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.compare:
+        _compare(*args.compare)
+        sys.exit()
+    if "aiohttp" in args.transport:
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            args.transport.remove("aiohttp")
+    results = asyncio.run(main(args))
+    _print(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "config": {k: v for k, v in vars(args).items() if k != "compare"},
+                    "results": [asdict(r) for r in results],
+                    "median_ops_per_second": statistics.median(
+                        r.ops_per_second for r in results
+                    ),
+                },
+                f,
+                indent=2,
+            )
@@ -1,4 +1,4 @@
-from .storage import SwiftStore
+from .storage import SwiftBulkError, SwiftStore
 from importlib.metadata import version, PackageNotFoundError
 
 try:
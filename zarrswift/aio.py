@@ -0,0 +1,457 @@
+"""
+Native asyncio transport for SwiftStore, built on aiohttp.
+
+``AsyncConnection`` mirrors the subset of ``swiftclient.Connection`` used by
+SwiftStore (same method names, arguments, return values and
+``ClientException`` errors) but runs every request on the event loop, so
+thousands of chunk requests can be in flight without a thread per request.
+
+aiohttp is an optional dependency: ``pip install zarr-swiftstore[aiohttp]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import weakref
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, urlencode, urlsplit
+
+from swiftclient.exceptions import ClientException
+
+from .endpoints import current_endpoint, rebase
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from .utils import TokenProvider
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without aiohttp
+    aiohttp = None
+
+
+class AsyncConnection:
+    """asyncio counterpart of ``swiftclient.Connection``.
+
+    Accepts the same auth options that ``utils.getenv_auth`` produces:
+    either ``preauthurl``/``preauthtoken`` or TempAuth v1.0
+    ``authurl``/``user``/``key`` (or both, in which case the credentials are
+    used to re-authenticate when the token is rejected). Other
+    ``swiftclient.Connection`` keyword arguments are accepted and ignored,
+    except ``timeout`` and ``insecure``. With a ``token_provider`` (see
+    ``utils.TokenProvider``) tokens are taken from, and refreshed through,
+    the provider instead.
+
+    aiohttp sessions are bound to an event loop, so one session is kept per
+    loop the connection is used from (e.g. zarr's sync loop and the caller's).
+    """
+
+    def __init__(
+        self,
+        authurl: str | None = None,
+        user: str | None = None,
+        key: str | None = None,
+        preauthurl: str | None = None,
+        preauthtoken: str | None = None,
+        *,
+        timeout: float | None = None,
+        insecure: bool = False,
+        max_connections: int = 100,
+        token_provider: TokenProvider | None = None,
+        **_ignored: Any,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "The aiohttp transport requires aiohttp: pip install aiohttp"
+            )
+        self.authurl = authurl
+        self.user = user
+        self.key = key
+        self.url = preauthurl
+        self.token = preauthtoken
+        self.timeout = timeout
+        self.insecure = insecure
+        self.max_connections = max_connections
+        self.token_provider = token_provider
+        # sessions and locks are bound to the event loop that created them
+        self._sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = weakref.WeakKeyDictionary()
+        self._auth_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    # ------------------------------------------------------------------
+    # Session and auth
+    # ------------------------------------------------------------------
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, ssl=False if self.insecure else None
+            )
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout, auto_decompress=False
+            )
+            self._sessions[loop] = session
+            self._auth_locks[loop] = asyncio.Lock()
+        return session
+
+    def close(self) -> None:
+        """Close all sessions; new ones are opened on next use."""
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        self._auth_locks.clear()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for loop, session in sessions:
+            if session.closed:
+                continue
+            if running is loop:
+                loop.create_task(session.close())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            elif running is None and not loop.is_closed():
+                loop.run_until_complete(session.close())
+            else:
+                session.detach()  # its loop is gone or cannot be entered
+
+    async def get_auth(self) -> tuple[str, str]:
+        """Authenticate with TempAuth v1.0 and return ``(url, token)``."""
+        if not (self.authurl and self.user and self.key):
+            raise ClientException("No credentials available to (re-)authenticate.")
+        session = self._get_session()
+        headers = {"X-Auth-User": self.user, "X-Auth-Key": self.key}
+        async with session.get(self.authurl, headers=headers) as resp:
+            body = await resp.read()
+            if resp.status < 200 or resp.status >= 300:
+                raise self._error(resp, "Auth GET failed", body)
+            self.url = resp.headers.get("x-storage-url")
+            self.token = resp.headers.get("x-storage-token") or resp.headers.get(
+                "x-auth-token"
+            )
+        return self.url, self.token
+
+    async def _ensure_auth(self, stale_token: str | None = None) -> None:
+        if self.token_provider is not None:
+            self.url, self.token = await self.token_provider.aget(stale_token)
+            return
+        self._get_session()
+        async with self._auth_locks[asyncio.get_running_loop()]:
+            # only the first waiter re-authenticates; the rest reuse its token
+            if self.url and self.token and self.token != stale_token:
+                return
+            await self.get_auth()
+
+    # ------------------------------------------------------------------
+    # Request plumbing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _error(resp: aiohttp.ClientResponse, msg: str, body: bytes) -> ClientException:
+        parsed = urlsplit(str(resp.url))
+        return ClientException(
+            msg,
+            http_scheme=parsed.scheme,
+            http_host=parsed.hostname or "",
+            http_port=parsed.port or "",
+            http_path=parsed.path,
+            http_query=parsed.query,
+            http_status=resp.status,
+            http_reason=resp.reason or "",
+            http_response_content=body,
+            http_response_headers=_lower_headers(resp),
+        )
+
+    def _path(self, container: str | None = None, obj: str | None = None) -> str:
+        path = rebase(self.url, current_endpoint.get()).rstrip("/")
+        if container:
+            path += "/" + quote(container)
+        if obj:
+            path += "/" + quote(obj)
+        return path
+
+    async def _request(
+        self,
+        method: str,
+        msg: str,
+        container: str | None = None,
+        obj: str | None = None,
+        *,
+        headers: dict[str, str] | None = None,
+        query: dict[str, Any] | None = None,
+        query_string: str | None = None,
+        data: Any = None,
+    ) -> tuple[dict[str, str], bytes]:
+        resp = await self._response(
+            method, msg, container, obj,
+            headers=headers, query=query, query_string=query_string, data=data,
+        )
+        async with resp:
+            return _lower_headers(resp), await resp.read()
+
+    async def _response(
+        self,
+        method: str,
+        msg: str,
+        container: str | None = None,
+        obj: str | None = None,
+        *,
+        headers: dict[str, str] | None = None,
+        query: dict[str, Any] | None = None,
+        query_string: str | None = None,
+        data: Any = None,
+    ) -> aiohttp.ClientResponse:
+        """Successful response whose body is still to be read."""
+        if self.token_provider is not None:
+            self.url, self.token = await self.token_provider.aget()
+        elif not (self.url and self.token):
+            await self._ensure_auth()
+        session = self._get_session()
+        for attempt in range(2):
+            token = self.token
+            url = self._path(container, obj)
+            params = {k: v for k, v in (query or {}).items() if v is not None}
+            qs = "&".join(filter(None, [urlencode(params), query_string]))
+            if qs:
+                url += "?" + qs
+            req_headers = dict(headers or {})
+            req_headers["X-Auth-Token"] = token
+            resp = await session.request(method, url, headers=req_headers, data=data)
+            if 200 <= resp.status < 300:
+                return resp
+            async with resp:
+                body = await resp.read()
+            if resp.status == 401 and attempt == 0 and (self.authurl or self.token_provider):
+                await self._ensure_auth(stale_token=token)
+                continue
+            raise self._error(resp, msg, body)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    # ------------------------------------------------------------------
+    # swiftclient.Connection API
+    # ------------------------------------------------------------------
+
+    async def get_account(
+        self,
+        marker: str | None = None,
+        limit: int | None = None,
+        prefix: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[dict[str, str], list[dict[str, Any]]]:
+        query = {"format": "json", "marker": marker, "limit": limit, "prefix": prefix}
+        rheaders, body = await self._request(
+            "GET", "Account GET failed", headers=headers, query=query
+        )
+        return rheaders, json.loads(body) if body else []
+
+    async def post_account(
+        self,
+        headers: dict[str, str],
+        response_dict: dict[str, Any] | None = None,
+        query_string: str | None = None,
+        data: Any = None,
+    ) -> tuple[dict[str, str], bytes]:
+        return await self._request(
+            "POST", "Account POST failed",
+            headers=headers, query_string=query_string, data=data,
+        )
+
+    async def head_container(
+        self, container: str, headers: dict[str, str] | None = None
+    ) -> dict[str, str]:
+        rheaders, _ = await self._request(
+            "HEAD", "Container HEAD failed", container, headers=headers
+        )
+        return rheaders
+
+    async def get_container(
+        self,
+        container: str,
+        marker: str | None = None,
+        limit: int | None = None,
+        prefix: str | None = None,
+        delimiter: str | None = None,
+        end_marker: str | None = None,
+        headers: dict[str, str] | None = None,
+        query_string: str | None = None,
+    ) -> tuple[dict[str, str], list[dict[str, Any]]]:
+        query = {
+            "format": "json",
+            "marker": marker,
+            "limit": limit,
+            "prefix": prefix,
+            "delimiter": delimiter,
+            "end_marker": end_marker,
+        }
+        rheaders, body = await self._request(
+            "GET", "Container GET failed", container,
+            headers=headers, query=query, query_string=query_string,
+        )
+        return rheaders, json.loads(body) if body else []
+
+    async def put_container(
+        self,
+        container: str,
+        headers: dict[str, str] | None = None,
+        response_dict: dict[str, Any] | None = None,
+        query_string: str | None = None,
+    ) -> None:
+        await self._request(
+            "PUT", "Container PUT failed", container,
+            headers=headers, query_string=query_string,
+        )
+
+    async def post_container(
+        self,
+        container: str,
+        headers: dict[str, str],
+        response_dict: dict[str, Any] | None = None,
+    ) -> None:
+        await self._request("POST", "Container POST failed", container, headers=headers)
+
+    async def delete_container(self, container: str, query_string: str | None = None) -> None:
+        await self._request(
+            "DELETE", "Container DELETE failed", container, query_string=query_string
+        )
+
+    async def head_object(
+        self,
+        container: str,
+        obj: str,
+        headers: dict[str, str] | None = None,
+        query_string: str | None = None,
+    ) -> dict[str, str]:
+        rheaders, _ = await self._request(
+            "HEAD", "Object HEAD failed", container, obj,
+            headers=headers, query_string=query_string,
+        )
+        return rheaders
+
+    async def get_object(
+        self,
+        container: str,
+        obj: str,
+        resp_chunk_size: int | None = None,
+        query_string: str | None = None,
+        response_dict: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[dict[str, str], Any]:
+        """With ``resp_chunk_size``, the body is an async iterator of chunks
+        of at most that many bytes, read as they arrive; close it with
+        ``aclose()`` when it is not exhausted."""
+        if resp_chunk_size is None:
+            return await self._request(
+                "GET", "Object GET failed", container, obj,
+                headers=headers, query_string=query_string,
+            )
+        resp = await self._response(
+            "GET", "Object GET failed", container, obj,
+            headers=headers, query_string=query_string,
+        )
+        return _lower_headers(resp), _iter_body(resp, resp_chunk_size)
+
+    async def put_object(
+        self,
+        container: str,
+        obj: str | None,
+        contents: Any,
+        content_length: int | None = None,
+        etag: str | None = None,
+        content_type: str | None = None,
+        headers: dict[str, str] | None = None,
+        query_string: str | None = None,
+        response_dict: dict[str, Any] | None = None,
+    ) -> str:
+        headers = dict(headers or {})
+        if etag:
+            headers["ETag"] = etag.strip('"')
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        if content_type is not None:
+            headers["Content-Type"] = content_type
+        if not contents:
+            contents = b""
+        rheaders, _ = await self._request(
+            "PUT", "Object PUT failed", container, obj,
+            headers=headers, query_string=query_string, data=contents,
+        )
+        return rheaders.get("etag", "").strip('"')
+
+    async def copy_object(
+        self,
+        container: str,
+        obj: str,
+        destination: str | None = None,
+        headers: dict[str, str] | None = None,
+        fresh_metadata: bool | None = None,
+        response_dict: dict[str, Any] | None = None,
+    ) -> None:
+        headers = dict(headers or {})
+        if destination is not None:
+            headers["Destination"] = quote(destination)
+        if fresh_metadata:
+            headers["X-Fresh-Metadata"] = "true"
+        await self._request("COPY", "Object COPY failed", container, obj, headers=headers)
+
+    async def delete_object(
+        self,
+        container: str,
+        obj: str,
+        query_string: str | None = None,
+        response_dict: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        await self._request(
+            "DELETE", "Object DELETE failed", container, obj,
+            headers=headers, query_string=query_string,
+        )
+
+    async def request(
+        self,
+        method: str,
+        container: str,
+        obj: str | None = None,
+        *,
+        headers: dict[str, str] | None = None,
+        query_string: str | None = None,
+        data: Any = None,
+    ) -> tuple[dict[str, str], bytes]:
+        """Generic request returning ``(headers, body)``."""
+        return await self._request(
+            method, f"{method} failed", container, obj,
+            headers=headers, query_string=query_string, data=data,
+        )
+
+    async def get_capabilities(self, url: str | None = None) -> dict[str, Any]:
+        if not self.url:
+            await self._ensure_auth()
+        parsed = urlsplit(url or rebase(self.url, current_endpoint.get()))
+        info = f"{parsed.scheme}://{parsed.netloc}/info"
+        async with self._get_session().get(info) as resp:
+            body = await resp.read()
+            if resp.status < 200 or resp.status >= 300:
+                raise self._error(resp, "Capabilities GET failed", body)
+            return json.loads(body)
+
+
+async def _iter_body(resp: aiohttp.ClientResponse, chunk_size: int) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            yield chunk
+    finally:
+        if resp.content.at_eof():
+            resp.release()  # keep the connection alive
+        else:
+            resp.close()
+
+
+def _lower_headers(resp: aiohttp.ClientResponse) -> dict[str, str]:
+    return {k.lower(): v for k, v in resp.headers.items()}
@@ -0,0 +1,480 @@
+"""
+Client-side caches for SwiftStore.
+
+``ChunkCache`` is a read-through cache for object contents: an in-memory
+LRU tier bounded by bytes plus an optional on-disk tier whose hits are
+served from memory-mapped files, so repeated reads of the same dataset are
+bound by local memory or disk rather than by the network.
+
+``MetadataCache`` is a TTL-bounded cache of what the store learned about
+individual objects (existence, size, ETag and, for metadata documents, the
+contents), so that opening a hierarchy does not cost one round trip per
+``zarr.json`` lookup, ``exists`` or ``getsize``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+DEFAULT_CACHE_MAX_BYTES = 256 << 20  # 256 MiB
+DEFAULT_METADATA_TTL = 60.0  # seconds
+DEFAULT_METADATA_MAX_ENTRIES = 100_000
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached object: its contents and the validators Swift returned."""
+
+    data: bytes | memoryview
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers to revalidate this entry with Swift."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ChunkCache:
+    """Read-through object cache with an LRU memory tier and a disk tier.
+
+    Parameters
+    ----------
+    max_bytes:
+        Size bound of the in-memory tier. Least recently used entries are
+        evicted first; objects larger than the bound are not kept in memory.
+    directory:
+        Optional directory for the on-disk tier. Entries written to memory
+        are also written here and survive the process, so later sessions
+        start warm. Disk hits are memory-mapped rather than read.
+    max_disk_bytes:
+        Size bound of the on-disk tier (default: unbounded).
+    validate:
+        Revalidate every hit with a conditional GET (``If-None-Match`` /
+        ``If-Modified-Since``). A ``304 Not Modified`` answer costs a round
+        trip but no payload. Disable for datasets known to be immutable.
+
+    Attributes
+    ----------
+    hits, misses, evictions:
+        Counters since creation (``stats()`` returns a snapshot).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        directory: str | os.PathLike[str] | None = None,
+        max_disk_bytes: int | None = None,
+        *,
+        validate: bool = True,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.directory = os.fspath(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (file stem, size); ordered by recency of use
+        self._disk: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_bytes = 0
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_disk_index()
+
+    # ------------------------------------------------------------------
+    # Pickle support (locks and mmaps are not picklable)
+    # ------------------------------------------------------------------
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "max_bytes": self.max_bytes,
+            "directory": self.directory,
+            "max_disk_bytes": self.max_disk_bytes,
+            "validate": self.validate,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        validate = state.pop("validate")
+        self.__init__(**state, validate=validate)  # type: ignore[misc]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkCache(max_bytes={self.max_bytes}, directory={self.directory!r}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Look ``key`` up in memory, then on disk. Does not count hits."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return self._read_disk(key)
+        return None
+
+    def put(
+        self,
+        key: str,
+        data: bytes | bytearray | memoryview,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Insert or replace ``key`` in both tiers."""
+        entry = CacheEntry(bytes(data) if isinstance(data, bytearray) else data,
+                           etag, last_modified)
+        with self._lock:
+            self._drop_memory(key)
+            if len(data) <= self.max_bytes:
+                self._memory[key] = entry
+                self._memory_bytes += len(data)
+                while self._memory_bytes > self.max_bytes:
+                    _, old = self._memory.popitem(last=False)
+                    self._memory_bytes -= len(old.data)
+                    self.evictions += 1
+            if self.directory is not None:
+                self._write_disk(key, entry)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._drop_memory(key)
+            self._drop_disk(key)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                self._drop_memory(key)
+            for key in [k for k in self._disk if k.startswith(prefix)]:
+                self._drop_disk(key)
+
+    def clear(self) -> None:
+        self.invalidate_prefix("")
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _drop_memory(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry.data)
+
+    def _path(self, stem: str, suffix: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, stem + suffix)
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            stem = name[:-5]
+            try:
+                with open(self._path(stem, ".json")) as f:
+                    meta = json.load(f)
+                mtime = os.path.getmtime(self._path(stem, ".bin"))
+            except (OSError, ValueError):
+                continue
+            entries.append((mtime, meta["key"], stem, meta["size"]))
+        for _, key, stem, size in sorted(entries):
+            self._disk[key] = (stem, size)
+            self._disk_bytes += size
+
+    def _read_disk(self, key: str) -> CacheEntry | None:
+        stem, size = self._disk[key]
+        try:
+            with open(self._path(stem, ".json")) as f:
+                meta = json.load(f)
+            if size == 0:
+                data: bytes | memoryview = b""
+            else:
+                with open(self._path(stem, ".bin"), "rb") as f:
+                    data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            os.utime(self._path(stem, ".bin"))  # recency survives restarts
+        except (OSError, ValueError):
+            self._drop_disk(key)
+            return None
+        return CacheEntry(data, meta.get("etag"), meta.get("last_modified"))
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.data)
+        if self.max_disk_bytes is not None and size > self.max_disk_bytes:
+            self._drop_disk(key)
+            return
+        self._drop_disk(key)
+        stem = hashlib.sha256(key.encode()).hexdigest()
+        # write to temporary names and rename so readers never see partial files
+        tmp = self._path(stem, f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(entry.data)
+        os.replace(tmp, self._path(stem, ".bin"))
+        meta = {"key": key, "size": size, "etag": entry.etag,
+                "last_modified": entry.last_modified}
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path(stem, ".json"))
+        self._disk[key] = (stem, size)
+        self._disk_bytes += size
+        if self.max_disk_bytes is not None:
+            while self._disk_bytes > self.max_disk_bytes:
+                old = next(iter(self._disk))
+                self._drop_disk(old)
+                self.evictions += 1
+
+    def _drop_disk(self, key: str) -> None:
+        item = self._disk.pop(key, None)
+        if item is None:
+            return
+        stem, size = item
+        self._disk_bytes -= size
+        for suffix in (".json", ".bin"):
+            try:
+                os.remove(self._path(stem, suffix))
+            except FileNotFoundError:
+                pass
+
+
+# ----------------------------------------------------------------------
+# Metadata cache
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class MetadataEntry:
+    """What is known about one object; ``size is None`` means it does not exist."""
+
+    size: int | None
+    etag: str | None = None
+    data: bytes | None = None
+
+    @property
+    def exists(self) -> bool:
+        return self.size is not None
+
+
+MISSING = MetadataEntry(None)
+
+
+class MetadataCache:
+    """TTL-bounded cache of object metadata and "not found" answers.
+
+    Parameters
+    ----------
+    ttl:
+        Seconds an answer stays valid. Changes made by other clients become
+        visible after at most this long.
+    max_entries:
+        Bound on the number of cached objects; least recently used entries
+        are evicted first.
+
+    Besides per-object entries, the cache remembers which prefixes were
+    listed completely (``put_listing``): until that listing expires, a key
+    under such a prefix without an entry is known not to exist, unless it
+    was ``invalidate``-d since.
+
+    Attributes
+    ----------
+    hits, misses:
+        Counters since creation (``stats()`` returns a snapshot).
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_METADATA_TTL,
+        max_entries: int = DEFAULT_METADATA_MAX_ENTRIES,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (expiry, entry); ordered by recency of use
+        self._entries: OrderedDict[str, tuple[float, MetadataEntry]] = OrderedDict()
+        # prefix -> expiry of a complete listing of that prefix
+        self._listed: dict[str, float] = {}
+        # key -> expiry of the listings it was invalidated under
+        self._unknown: dict[str, float] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"ttl": self.ttl, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __repr__(self) -> str:
+        return (
+            f"MetadataCache(ttl={self.ttl}, max_entries={self.max_entries}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def get(self, key: str) -> MetadataEntry | None:
+        """Return the entry for ``key``, ``MISSING``, or ``None`` if unknown."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires, entry = item
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self._entries[key]
+            unknown = self._unknown.get(key)
+            if unknown is not None and unknown <= now:
+                del self._unknown[key]
+                unknown = None
+            if unknown is None and self._covered(key, now):
+                self.hits += 1
+                return MISSING
+            self.misses += 1
+            return None
+
+    def covers(self, prefix: str) -> bool:
+        """Whether an unexpired complete listing covers ``prefix``."""
+        with self._lock:
+            return self._covered(prefix, time.monotonic())
+
+    def put(
+        self,
+        key: str,
+        size: int | None,
+        etag: str | None = None,
+        data: bytes | None = None,
+    ) -> None:
+        """Record ``key``; ``size=None`` records that it does not exist."""
+        entry = MetadataEntry(size, etag, data) if size is not None else MISSING
+        with self._lock:
+            self._insert(key, entry, time.monotonic() + self.ttl)
+
+    def put_missing(self, key: str) -> None:
+        self.put(key, None)
+
+    def put_listing(
+        self, prefix: str, entries: Iterable[tuple[str, int, str | None]]
+    ) -> None:
+        """Record a complete listing of ``prefix`` as ``(key, size, etag)``.
+
+        Cached contents are kept for keys whose ETag did not change. The
+        prefix is only marked as complete if every entry fits the cache.
+        """
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            evictions = 0
+            for key, size, etag in entries:
+                old = self._entries.get(key)
+                data = None
+                if old is not None and etag is not None and old[1].etag == etag:
+                    data = old[1].data
+                evictions += self._insert(key, MetadataEntry(size, etag, data), expires)
+            if not evictions:
+                self._listed[prefix] = expires
+
+    def invalidate(self, key: str) -> None:
+        """Forget ``key``: ``get`` answers "unknown" rather than ``MISSING``,
+        also under a listed prefix.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            covering = [
+                expires
+                for prefix, expires in self._listed.items()
+                if expires > now and key.startswith(prefix)
+            ]
+            if covering:
+                self._unknown[key] = max(covering)
+                if len(self._unknown) > self.max_entries:
+                    # too many exceptions to keep: forget the listings instead
+                    self._listed.clear()
+                    self._unknown.clear()
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+            for listed in [p for p in self._listed if p.startswith(prefix)]:
+                del self._listed[listed]
+            for key in [k for k in self._unknown if k.startswith(prefix)]:
+                del self._unknown[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._listed.clear()
+            self._unknown.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "listed_prefixes": len(self._listed),
+            }
+
+    def _insert(self, key: str, entry: MetadataEntry, expires: float) -> int:
+        self._unknown.pop(key, None)
+        self._entries[key] = (expires, entry)
+        self._entries.move_to_end(key)
+        evictions = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evictions += 1
+        if evictions:
+            # an evicted key would otherwise read as missing under its listing
+            self._listed.clear()
+            self._unknown.clear()
+        return evictions
+
+    def _covered(self, key: str, now: float) -> bool:
+        for prefix, expires in list(self._listed.items()):
+            if expires <= now:
+                del self._listed[prefix]
+            elif key.startswith(prefix):
+                return True
+        return False
@@ -0,0 +1,288 @@
+"""
+Client-side load balancing over the proxy nodes of a Swift cluster.
+
+With ``storage_options["endpoints"]`` set to the base URLs of several proxies
+serving the same account, a SwiftStore sends each request to one of them
+instead of to the host of its storage URL: the proxy with the fewest
+requests in flight, or the next one in turn. A proxy whose requests keep
+failing (connection errors, timeouts, 5xx), or with ``slow_factor`` one
+much slower than the others, is ejected for a while; it is readmitted when
+its ``/healthcheck`` answers again. Aggregate throughput then grows with
+the number of proxies, and one failed proxy does not fail the store.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from swiftclient.exceptions import ClientException
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without aiohttp
+    aiohttp = None
+
+STRATEGIES = ("least_outstanding", "round_robin")
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+# proxy base URL chosen for the request being sent (``None``: storage URL host)
+current_endpoint: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "zarrswift_endpoint", default=None
+)
+
+
+def rebase(url: str, endpoint: str | None) -> str:
+    """``url`` with the scheme and host of ``endpoint``."""
+    if endpoint is None:
+        return url
+    target = urlsplit(endpoint)
+    return urlsplit(url)._replace(scheme=target.scheme, netloc=target.netloc).geturl()
+
+
+@dataclass(frozen=True)
+class Endpoints:
+    """Proxies of one Swift cluster and how requests are spread over them.
+
+    Parameters
+    ----------
+    urls:
+        Base URLs of the proxies (``"https://proxy1.example.org:8080"``).
+        Request paths are those of the account's storage URL.
+    strategy:
+        ``"least_outstanding"`` (default) sends a request to the proxy
+        with the fewest requests in flight; ``"round_robin"`` to each
+        proxy in turn.
+    max_failures:
+        Consecutive failed requests after which a proxy is ejected.
+    eject_time:
+        Seconds before an ejected proxy is health-checked. The time
+        doubles with every consecutive ejection, up to ``max_eject_time``.
+    max_eject_time:
+        Upper bound of the ejection time.
+    slow_factor:
+        Also eject a proxy whose average latency exceeds this multiple of
+        the median average latency of the others. ``None`` (default)
+        ejects on failures only, which suits stores whose request sizes,
+        and therefore latencies, vary widely.
+    min_samples:
+        Requests a proxy must have answered before it can be found slow.
+    health_check:
+        Path requested to readmit an ejected proxy (Swift's healthcheck
+        middleware). ``None`` readmits it when its ejection time is over,
+        on probation: one more failure ejects it again.
+    check_timeout:
+        Seconds to wait for a health check.
+    """
+
+    urls: tuple[str, ...]
+    strategy: str = "least_outstanding"
+    max_failures: int = 3
+    eject_time: float = 5.0
+    max_eject_time: float = 120.0
+    slow_factor: float | None = None
+    min_samples: int = 20
+    health_check: str | None = "/healthcheck"
+    check_timeout: float = 2.0
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "urls", tuple(url.rstrip("/") for url in self.urls))
+        if not self.urls:
+            raise ValueError("At least one endpoint URL is required.")
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {self.strategy!r}.")
+        if self.max_failures < 1:
+            raise ValueError(f"max_failures must be >= 1, got {self.max_failures}.")
+        if self.slow_factor is not None and self.slow_factor <= 1:
+            raise ValueError(f"slow_factor must be > 1, got {self.slow_factor}.")
+
+    def balancer(self, verify: bool = True) -> EndpointBalancer:
+        return EndpointBalancer(self, verify)
+
+
+def balancer_for(storage_options: dict[str, Any]) -> EndpointBalancer | None:
+    """Balancer for ``storage_options["endpoints"]`` (URLs or ``Endpoints``), or None."""
+    endpoints = storage_options.get("endpoints")
+    if not endpoints:
+        return None
+    if not isinstance(endpoints, Endpoints):
+        endpoints = Endpoints(tuple(endpoints))
+    return endpoints.balancer(verify=not storage_options.get("insecure"))
+
+
+class Endpoint:
+    """Health and load of one proxy."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0  # consecutive
+        self.ejections = 0
+        self.ejected_streak = 0  # consecutive ejections, for the backoff
+        self.ejected_until: float | None = None
+        self.checking = False
+        self.latency: float | None = None  # moving average of successes
+        self.samples = 0
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url!r})"
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until is None
+
+
+class EndpointBalancer:
+    """Chooses a proxy per request and tracks the proxies' health.
+
+    Thread-safe: used by the connection pool's workers and event loops.
+    """
+
+    def __init__(self, config: Endpoints, verify: bool = True) -> None:
+        self.config = config
+        self.verify = verify
+        self.endpoints = [Endpoint(url) for url in config.urls]
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"config": self.config, "verify": self.verify}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def acquire(self) -> Endpoint:
+        """Proxy for the next request; pair with ``release``."""
+        now = time.monotonic()
+        with self._lock:
+            for endpoint in self.endpoints:
+                if (
+                    endpoint.ejected_until is not None
+                    and now >= endpoint.ejected_until
+                    and not endpoint.checking
+                ):
+                    self._readmit(endpoint)
+            candidates = [e for e in self.endpoints if e.healthy]
+            if not candidates:
+                # all ejected: use the one due back first
+                candidates = [min(self.endpoints, key=lambda e: e.ejected_until or 0.0)]
+            turn, self._turn = self._turn, self._turn + 1
+            start = turn % len(candidates)
+            candidates = candidates[start:] + candidates[:start]
+            if self.config.strategy == "least_outstanding":
+                endpoint = min(candidates, key=lambda e: e.in_flight)
+            else:
+                endpoint = candidates[0]
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(
+        self, endpoint: Endpoint, seconds: float, exc: BaseException | None = None
+    ) -> None:
+        """Record the outcome of a request sent to ``endpoint``."""
+        config = self.config
+        with self._lock:
+            endpoint.in_flight -= 1
+            if exc is not None and _node_failure(exc):
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= config.max_failures:
+                    self._eject(endpoint)
+                return
+            if exc is not None:
+                return  # the proxy answered; the request itself was refused
+            endpoint.failures = 0
+            endpoint.ejected_streak = 0
+            endpoint.samples += 1
+            average = endpoint.latency
+            endpoint.latency = seconds if average is None else 0.9 * average + 0.1 * seconds
+            if config.slow_factor is not None and endpoint.samples >= config.min_samples:
+                others = [
+                    e.latency for e in self.endpoints
+                    if e is not endpoint and e.healthy and e.latency is not None
+                    and e.samples >= config.min_samples
+                ]
+                if others and endpoint.latency > config.slow_factor * statistics.median(others):
+                    self._eject(endpoint)
+
+    def _eject(self, endpoint: Endpoint) -> None:
+        if not endpoint.healthy:
+            return
+        if sum(e.healthy for e in self.endpoints) <= 1:
+            return  # never eject the last proxy standing
+        endpoint.ejections += 1
+        self._suspend(endpoint)
+
+    def _suspend(self, endpoint: Endpoint) -> None:
+        delay = min(
+            self.config.eject_time * 2 ** endpoint.ejected_streak, self.config.max_eject_time
+        )
+        endpoint.ejected_until = time.monotonic() + delay
+        endpoint.ejected_streak += 1
+
+    def _readmit(self, endpoint: Endpoint) -> None:
+        """Health-check an endpoint whose ejection time is over (lock held)."""
+        if self.config.health_check is None:
+            self._restore(endpoint, probation=True)
+            return
+        endpoint.checking = True
+        threading.Thread(
+            target=self._check, args=(endpoint,), name="zarrswift-healthcheck", daemon=True
+        ).start()
+
+    def _check(self, endpoint: Endpoint) -> None:
+        try:
+            response = requests.get(
+                endpoint.url + self.config.health_check,
+                timeout=self.config.check_timeout,
+                verify=self.verify,
+            )
+            ok = response.ok
+        except requests.RequestException:
+            ok = False
+        with self._lock:
+            endpoint.checking = False
+            if ok:
+                self._restore(endpoint)
+            else:
+                self._suspend(endpoint)
+
+    def _restore(self, endpoint: Endpoint, probation: bool = False) -> None:
+        endpoint.ejected_until = None
+        endpoint.failures = self.config.max_failures - 1 if probation else 0
+        endpoint.latency = None  # learn its latency afresh
+        endpoint.samples = 0
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.healthy,
+                    "in_flight": e.in_flight,
+                    "requests": e.requests,
+                    "errors": e.errors,
+                    "ejections": e.ejections,
+                    "latency": e.latency,
+                }
+                for e in self.endpoints
+            ]
+
+
+def _node_failure(exc: BaseException) -> bool:
+    """Whether ``exc`` means the proxy itself failed, rather than the request."""
+    if isinstance(exc, ClientException):
+        return exc.http_status is None or exc.http_status in FAILURE_STATUSES
+    if aiohttp is not None and isinstance(exc, aiohttp.ClientError):
+        return True
+    # requests' RequestException and socket errors are OSErrors
+    return isinstance(exc, (TimeoutError, OSError))
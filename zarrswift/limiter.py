@@ -0,0 +1,183 @@
+"""
+Concurrency limits for SwiftStore requests.
+
+``ConcurrencyLimits`` caps the number of Swift requests a store has in
+flight, separately for reads, writes and listings, however many operations
+zarr starts at once. With ``adaptive=True`` each cap follows an AIMD rule
+(additive increase, multiplicative decrease, as in TCP congestion control):
+it is cut by ``decrease`` when Swift throttles (429, 498, 503) or a request
+times out, and grows by about one slot per round of successful requests
+until it is back at the configured maximum. This keeps a store near the
+request rate a cluster can sustain instead of bouncing off its rate limits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from swiftclient.exceptions import ClientException
+
+THROTTLE_STATUSES = frozenset({429, 498, 503})
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimits:
+    """Maximum number of Swift requests in flight per request class.
+
+    Parameters
+    ----------
+    read:
+        Object GETs and HEADs.
+    write:
+        Object PUTs and DELETEs, bulk requests and container creation.
+    listing:
+        Container listing pages.
+    adaptive:
+        Shrink a limit when Swift throttles or requests time out, and grow
+        it back (up to the configured value) while requests succeed.
+    min_limit:
+        Lower bound of adaptive limits.
+    decrease:
+        Factor applied to a limit on throttling (at most once per typical
+        request latency, so a burst of rejections counts once).
+    latency_factor:
+        Also treat a request as congestion when it takes longer than this
+        multiple of the recent average latency of its class. ``None``
+        (default) reacts to errors only, which suits stores whose object
+        sizes, and therefore latencies, vary widely.
+    throttle_statuses:
+        HTTP statuses that signal throttling.
+    """
+
+    read: int = 64
+    write: int = 32
+    listing: int = 4
+    adaptive: bool = False
+    min_limit: int = 1
+    decrease: float = 0.5
+    latency_factor: float | None = None
+    throttle_statuses: frozenset[int] = THROTTLE_STATUSES
+
+    def __post_init__(self) -> None:
+        for name in ("read", "write", "listing", "min_limit"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1, got {getattr(self, name)}.")
+        if not 0 < self.decrease < 1:
+            raise ValueError(f"decrease must be in (0, 1), got {self.decrease}.")
+        if self.latency_factor is not None and self.latency_factor <= 1:
+            raise ValueError(f"latency_factor must be > 1, got {self.latency_factor}.")
+
+    def limiters(self) -> dict[str, AdaptiveLimiter]:
+        """One limiter per request class."""
+        return {
+            name: AdaptiveLimiter(getattr(self, name), self)
+            for name in ("read", "write", "listing")
+        }
+
+
+class AdaptiveLimiter:
+    """Async semaphore whose size may adapt to congestion signals.
+
+    Usable from several event loops (zarr's sync API runs its own): waiters
+    are woken on their own loop.
+    """
+
+    def __init__(self, maximum: int, limits: ConcurrencyLimits) -> None:
+        self.maximum = maximum
+        self.limits = limits
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.decreases = 0
+        self._waiters: collections.deque[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]
+        self._waiters = collections.deque()
+        self._latency: float | None = None  # moving average of successes
+        self._calm_until = 0.0  # no further decrease before this time
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"maximum": self.maximum, "limits": self.limits}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    async def __aenter__(self) -> None:
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:  # the slot was handed over already
+                    self._release()
+            raise
+
+    async def __aexit__(self, *exc: object) -> None:
+        with self._lock:
+            self._release()
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        # give free slots to waiters in arrival order
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            self.in_flight += 1
+            loop.call_soon_threadsafe(_wake, future)
+
+    def record(self, seconds: float, exc: BaseException | None = None) -> None:
+        """Feed the outcome of one request into the adaptive limit."""
+        limits = self.limits
+        if not limits.adaptive:
+            return
+        with self._lock:
+            if exc is None:
+                average = self._latency
+                congested = (
+                    limits.latency_factor is not None
+                    and average is not None
+                    and seconds > limits.latency_factor * average
+                )
+                self._latency = seconds if average is None else 0.9 * average + 0.1 * seconds
+            elif isinstance(exc, ClientException):
+                congested = exc.http_status in limits.throttle_statuses
+            else:
+                congested = isinstance(exc, TimeoutError)
+            now = time.monotonic()
+            if congested:
+                if now >= self._calm_until:
+                    self.limit = max(float(limits.min_limit), self.limit * limits.decrease)
+                    self.decreases += 1
+                    self._calm_until = now + (self._latency or seconds)
+            elif exc is None and self.limit < self.maximum:
+                # about one slot per round of `limit` successful requests
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                self._hand_over()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "maximum": self.maximum,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "decreases": self.decreases,
+            }
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
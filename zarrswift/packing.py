@@ -0,0 +1,866 @@
+"""
+Packing of small zarr chunks into large Swift objects.
+
+``PackedStore`` wraps a store (usually a SwiftStore) and keeps zarr's keys
+unchanged while storing small chunks of each array together. Chunk writes
+that arrive within ``linger`` seconds of each other are committed as one
+*pack* object under ``<array>/.zpack/``; every pack ends with a footer that
+maps its chunk keys to ``(offset, length)``. The pack *index*
+``<array>/.zpack/index`` is a compressed snapshot of the key →
+``(pack, offset, length)`` map. It is loaded on first access to an array,
+together with the footers of the packs written after it, and kept in
+memory. Reads become ranged GETs into the packs. Concurrent reads are
+handed to the wrapped store's ``get_partial_values`` at once, so a
+SwiftStore fetches neighbouring chunks with a single request.
+
+``compact()`` rewrites packs whose data was largely overwritten or
+deleted, merges small packs into packs of ``pack_size``, and writes a fresh
+index.
+
+Keys are parsed with zarr v3's default chunk key encoding (see
+``readahead.parse_chunk_key``). Metadata documents, other keys and chunks
+larger than ``max_value_size`` are stored as ordinary objects. Packs assume
+one writing process per array at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import struct
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self
+
+from zarr.abc.store import (
+    OffsetByteRequest,
+    RangeByteRequest,
+    Store,
+    SuffixByteRequest,
+)
+from zarr.core.buffer import default_buffer_prototype
+from zarr.storage import WrapperStore
+
+from .readahead import parse_chunk_key
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator, Iterable
+
+    from zarr.abc.store import ByteRequest
+    from zarr.core.buffer import Buffer, BufferPrototype
+
+PACK_DIR = ".zpack"
+INDEX_NAME = "index"
+DEFAULT_MAX_VALUE_SIZE = 32 << 10  # 32 KiB
+DEFAULT_PACK_SIZE = 8 << 20  # 8 MiB
+DEFAULT_LINGER = 0.002
+DEFAULT_INDEX_INTERVAL = 64
+FOOTER_PROBE = 64 << 10  # tail of a pack read to find its footer
+FORMAT_VERSION = 1
+
+_PACK_KEY = re.compile(rf"(?P<array>(?:.*/)?){re.escape(PACK_DIR)}/(?P<name>[^/]+)")
+_TRAILER = struct.Struct(">4sQ")  # magic, footer length
+_MAGIC = b"ZPK1"
+_DELETED = (-1, 0, 0)  # index entry of a deleted key
+
+
+@dataclass
+class CompactResult:
+    """Outcome of ``PackedStore.compact``."""
+
+    packs_before: int = 0
+    packs_after: int = 0
+    bytes_reclaimed: int = 0
+    objects_deleted: int = 0
+
+    def __iadd__(self, other: CompactResult) -> Self:
+        self.packs_before += other.packs_before
+        self.packs_after += other.packs_after
+        self.bytes_reclaimed += other.bytes_reclaimed
+        self.objects_deleted += other.objects_deleted
+        return self
+
+
+class _Batch:
+    """Writes to one array waiting to be committed as one pack.
+
+    ``values`` maps chunk keys (relative to the array) to their new value,
+    ``None`` for a deletion, or ``False`` to hand the key back to its
+    ordinary object.
+    """
+
+    def __init__(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.loop = loop
+        self.values: dict[str, bytes | None | bool] = {}
+        self.nbytes = 0
+        self.full = asyncio.Event()
+        self.done: asyncio.Future[None] = loop.create_future()
+        self.done.add_done_callback(_retrieve)
+        self.task: asyncio.Task[None] | None = None
+
+
+class _Packs:
+    """Pack index of one array, as loaded and updated by this store."""
+
+    def __init__(self) -> None:
+        self.batch: _Batch | None = None  # collecting writes
+        self.writing: _Batch | None = None  # being stored as a pack
+        self.lock: asyncio.Lock | None = None
+        self.loaded_at: float | None = None
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.sizes: list[int] = []  # value bytes written to each pack
+        self.live: list[int] = []  # value bytes of each pack still referenced
+        # chunk key relative to the array → (pack id, offset, length)
+        self.entries: dict[str, tuple[int, int, int]] = {}
+        self.through = ""  # packs named up to this are covered by the index
+        self.indexed = 0  # entries in the index object
+        self.unindexed = 0  # packs applied on top of it
+        self.unindexed_entries = 0
+        self.stale: list[str] = []  # packs replaced by compaction, not deleted yet
+
+    def adopt(self, other: _Packs) -> None:
+        """Take over the index of ``other`` in one step, so that readers
+        never see it half loaded.
+        """
+        self.names, self.ids = other.names, other.ids
+        self.sizes, self.live = other.sizes, other.live
+        self.entries, self.through = other.entries, other.through
+        self.indexed, self.unindexed = other.indexed, other.unindexed
+        self.unindexed_entries, self.stale = other.unindexed_entries, other.stale
+
+    def mutex(self) -> asyncio.Lock:
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        return self.lock
+
+    def add_pack(self, name: str, nbytes: int) -> int:
+        pack_id = self.ids[name] = len(self.names)
+        self.names.append(name)
+        self.sizes.append(nbytes)
+        self.live.append(0)
+        return pack_id
+
+    def put(self, suffix: str, entry: tuple[int, int, int] | None) -> None:
+        old = self.entries.pop(suffix, None)
+        if old is not None and old[0] >= 0:
+            self.live[old[0]] -= old[2]
+        if entry is not None:
+            self.entries[suffix] = entry
+            if entry[0] >= 0:
+                self.live[entry[0]] += entry[2]
+
+    def apply(self, name: str, footer: dict[str, Any]) -> None:
+        """Apply the footer of pack ``name`` on top of the entries."""
+        pack_id = self.add_pack(name, footer["bytes"])
+        for suffix, value in footer["entries"].items():
+            if value is None:
+                self.put(suffix, None)  # back to its ordinary object
+            elif value == 0:
+                self.put(suffix, _DELETED)
+            else:
+                self.put(suffix, (pack_id, value[0], value[1]))
+
+    def restore(self, index: dict[str, Any]) -> None:
+        """Load an index object."""
+        for name, nbytes in index["packs"]:
+            self.add_pack(name, nbytes)
+        for suffix, value in index["entries"].items():
+            self.put(suffix, _DELETED if value == 0 else tuple(value))
+        self.through = index["through"]
+        self.indexed = len(self.entries)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Contents of an index object for the current entries."""
+        return {
+            "version": FORMAT_VERSION,
+            "through": max(self.names, default=""),
+            "packs": [[name, size] for name, size in zip(self.names, self.sizes)],
+            "entries": {
+                suffix: 0 if entry[0] < 0 else list(entry)
+                for suffix, entry in self.entries.items()
+            },
+        }
+
+    def find(self, suffix: str) -> tuple[bool, bytes | tuple[str, int, int] | None]:
+        """``(True, value)`` for a packed key: its pending value, its
+        ``(pack, offset, length)``, or ``None`` if deleted. ``(False, None)``
+        if the key is left to its ordinary object.
+        """
+        for batch in (self.batch, self.writing):
+            if batch is not None and suffix in batch.values:
+                value = batch.values[suffix]
+                if value is False:
+                    return False, None
+                return True, value  # type: ignore[return-value]
+        entry = self.entries.get(suffix)
+        if entry is None:
+            return False, None
+        if entry[0] < 0:
+            return True, None
+        return True, (self.names[entry[0]], entry[1], entry[2])
+
+    def keys(self, array: str, prefix: str) -> list[str]:
+        """Existing packed keys starting with ``prefix``."""
+        keys = {
+            array + suffix for suffix, entry in self.entries.items() if entry[0] >= 0
+        }
+        for batch in (self.writing, self.batch):
+            if batch is None:
+                continue
+            for suffix, value in batch.values.items():
+                if isinstance(value, bytes):
+                    keys.add(array + suffix)
+                else:
+                    keys.discard(array + suffix)
+        return sorted(key for key in keys if key.startswith(prefix))
+
+
+class PackedStore(WrapperStore[Store]):
+    """Store that packs small chunks of every array into large objects.
+
+    Parameters
+    ----------
+    store:
+        Store holding the packs, index objects and all other keys.
+    max_value_size:
+        Chunks up to this size are packed; larger ones are stored as
+        ordinary objects.
+    pack_size:
+        Size at which a pack is committed without waiting for
+        ``linger``, and size of the packs written by ``compact``.
+    linger:
+        Seconds a chunk write waits for more writes to the same array
+        before their pack is committed. ``set`` returns once the pack is
+        stored.
+    index_interval:
+        Write a new index object when this many packs were committed since
+        the last one and they hold at least a quarter as many entries as
+        it. Readers then load the index and the footers of these packs.
+    ttl:
+        Seconds a loaded index is used before it is loaded again to see
+        packs written by other clients. ``None`` (default) keeps it for the
+        lifetime of the store.
+
+    Examples
+    --------
+    >>> swift = await SwiftStore.open("tiles", storage_options=opts)
+    >>> store = PackedStore(swift, max_value_size=16 << 10)
+    >>> array = await zarr.api.asynchronous.open_array(store=store, path="mask")
+    >>> await store.compact()
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        *,
+        max_value_size: int = DEFAULT_MAX_VALUE_SIZE,
+        pack_size: int = DEFAULT_PACK_SIZE,
+        linger: float = DEFAULT_LINGER,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+        ttl: float | None = None,
+    ) -> None:
+        for name, value in (
+            ("max_value_size", max_value_size),
+            ("pack_size", pack_size),
+            ("index_interval", index_interval),
+        ):
+            if value < 1:
+                raise ValueError(f"{name} must be >= 1, got {value}.")
+        if linger < 0:
+            raise ValueError(f"linger must be >= 0, got {linger}.")
+        super().__init__(store)
+        self.max_value_size = max_value_size
+        self.pack_size = pack_size
+        self.linger = linger
+        self.index_interval = index_interval
+        self.ttl = ttl
+        self._arrays: dict[str, _Packs] = {}
+        self._reads: dict[tuple[Any, BufferPrototype], list[Any]] = {}
+        self._last_name = 0
+        self._counters = dict.fromkeys(
+            ("commits", "values_packed", "reads", "read_requests", "indexes", "loads"), 0
+        )
+
+    def _with_store(self, store: Store) -> PackedStore:
+        return type(self)(
+            store,
+            max_value_size=self.max_value_size,
+            pack_size=self.pack_size,
+            linger=self.linger,
+            index_interval=self.index_interval,
+            ttl=self.ttl,
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        state["_reads"] = {}
+        return state
+
+    def __repr__(self) -> str:
+        return f"PackedStore({self._store!r})"
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    async def _packs(self, array: str) -> _Packs:
+        """Pack index of ``array``, loaded on first use (and after ``ttl``)."""
+        packs = self._arrays.get(array)
+        if packs is None:
+            packs = self._arrays[array] = _Packs()
+        if not self._fresh(packs):
+            async with packs.mutex():
+                if not self._fresh(packs):  # not loaded meanwhile by another task
+                    await self._load(array, packs)
+        return packs
+
+    def _fresh(self, packs: _Packs) -> bool:
+        loaded = packs.loaded_at
+        return loaded is not None and (
+            self.ttl is None or time.monotonic() - loaded < self.ttl
+        )
+
+    async def _load(self, array: str, packs: _Packs) -> None:
+        """Read the index object of ``array`` and the footers of newer packs."""
+        self._counters["loads"] += 1
+        proto = default_buffer_prototype()
+        index = _Packs()  # readers keep the old index until this one is complete
+        raw = await self._store.get(f"{array}{PACK_DIR}/{INDEX_NAME}", proto)
+        if raw is not None:
+            index.restore(json.loads(zlib.decompress(raw.to_bytes())))
+        newer = []
+        async for key in self._store.list_prefix(f"{array}{PACK_DIR}/"):
+            match = _PACK_KEY.fullmatch(key)
+            if match is None or match["array"] != array or match["name"] == INDEX_NAME:
+                continue
+            name = match["name"]
+            if name > index.through:
+                newer.append(name)
+            elif name not in index.ids:
+                index.stale.append(name)  # replaced by a compaction that did not finish
+        newer.sort()
+        footers = await asyncio.gather(*(self._footer(array, name) for name in newer))
+        for name, footer in zip(newer, footers):
+            if footer is not None:
+                index.apply(name, footer)
+                index.unindexed += 1
+                index.unindexed_entries += len(footer["entries"])
+        packs.adopt(index)
+        packs.loaded_at = time.monotonic()
+
+    async def _footer(self, array: str, name: str) -> dict[str, Any] | None:
+        """Footer of a pack, from one read of its tail (two if the footer is large)."""
+        key = f"{array}{PACK_DIR}/{name}"
+        proto = default_buffer_prototype()
+        tail = await self._store.get(key, proto, SuffixByteRequest(FOOTER_PROBE))
+        if tail is None:
+            return None  # deleted since it was listed
+        data = tail.to_bytes()
+        magic, length = _TRAILER.unpack(data[-_TRAILER.size:])
+        if magic != _MAGIC:
+            raise ValueError(f"{key!r} is not a pack.")
+        if length + _TRAILER.size > len(data):
+            tail = await self._store.get(key, proto, SuffixByteRequest(length + _TRAILER.size))
+            if tail is None:
+                return None
+            data = tail.to_bytes()
+        footer = data[-_TRAILER.size - length:-_TRAILER.size]
+        return json.loads(zlib.decompress(footer))
+
+    async def _write_index(self, array: str, packs: _Packs) -> None:
+        snapshot = packs.snapshot()
+        blob = zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode())
+        await self._store.set(
+            f"{array}{PACK_DIR}/{INDEX_NAME}",
+            default_buffer_prototype().buffer.from_bytes(blob),
+        )
+        packs.through = snapshot["through"]
+        packs.indexed = len(packs.entries)
+        packs.unindexed = packs.unindexed_entries = 0
+        self._counters["indexes"] += 1
+
+    def _pack_name(self) -> str:
+        # names order packs by time, also when the clock steps back
+        stamp = self._last_name = max(time.time_ns(), self._last_name + 1)
+        return f"{stamp:020d}-{uuid.uuid4().hex[:8]}"
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def _commit(
+        self, array: str, packs: _Packs, values: dict[str, bytes | None | bool]
+    ) -> None:
+        """Add ``values`` to the array's next pack and wait until it is stored."""
+        batch = packs.batch
+        if batch is None or batch.loop is not asyncio.get_running_loop():
+            batch = packs.batch = _Batch()
+            batch.task = asyncio.ensure_future(self._flush_later(array, packs, batch))
+        for suffix, value in values.items():
+            batch.values[suffix] = value
+            if isinstance(value, bytes):
+                batch.nbytes += len(value)
+        if batch.nbytes >= self.pack_size:
+            batch.full.set()
+        await asyncio.shield(batch.done)
+
+    async def _flush_later(self, array: str, packs: _Packs, batch: _Batch) -> None:
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.linger)
+        except TimeoutError:
+            pass
+        try:
+            async with packs.mutex():
+                if packs.batch is batch:
+                    packs.batch = None
+                packs.writing = batch
+                try:
+                    await self._write_pack(array, packs, batch.values)
+                finally:
+                    packs.writing = None
+        except BaseException as exc:
+            if packs.batch is batch:
+                packs.batch = None
+            batch.done.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+        else:
+            batch.done.set_result(None)
+
+    async def _write_pack(
+        self, array: str, packs: _Packs, values: dict[str, bytes | None | bool]
+    ) -> None:
+        """Commit ``values`` as a new pack (array lock held)."""
+        name, footer = await self._put_pack(array, values)
+        packs.apply(name, footer)
+        packs.unindexed += 1
+        packs.unindexed_entries += len(footer["entries"])
+        self._counters["commits"] += 1
+        if (
+            packs.unindexed >= self.index_interval
+            and 4 * packs.unindexed_entries >= packs.indexed
+        ):
+            await self._write_index(array, packs)
+
+    async def _put_pack(
+        self, array: str, values: dict[str, bytes | None | bool]
+    ) -> tuple[str, dict[str, Any]]:
+        """Store a pack object holding ``values``; returns its name and footer."""
+        name = self._pack_name()
+        parts, entries, offset = [], {}, 0
+        for suffix, value in values.items():
+            if isinstance(value, bytes):
+                entries[suffix] = [offset, len(value)]
+                parts.append(value)
+                offset += len(value)
+            else:
+                entries[suffix] = 0 if value is None else None
+        footer = {"bytes": offset, "entries": entries}
+        blob = zlib.compress(json.dumps(footer, separators=(",", ":")).encode())
+        self._counters["values_packed"] += len(parts)
+        parts += [blob, _TRAILER.pack(_MAGIC, len(blob))]
+        await self._store.set(
+            f"{array}{PACK_DIR}/{name}",
+            default_buffer_prototype().buffer.from_bytes(b"".join(parts)),
+        )
+        return name, footer
+
+    async def flush(self) -> None:
+        """Commit the writes waiting for more writes to their array now."""
+        waiting = []
+        for packs in self._arrays.values():
+            batch = packs.batch
+            if batch is not None and batch.loop is asyncio.get_running_loop():
+                batch.full.set()
+                waiting.append(asyncio.shield(batch.done))
+        await asyncio.gather(*waiting)
+
+    async def set(self, key: str, value: Buffer) -> None:
+        self._check_writable()
+        parsed = parse_chunk_key(key)
+        if parsed is None:
+            return await self._store.set(key, value)
+        array = parsed[0]
+        suffix = key[len(array):]
+        packs = await self._packs(array)
+        if len(value) > self.max_value_size:
+            await self._store.set(key, value)
+            found, _ = packs.find(suffix)
+            if found:
+                await self._commit(array, packs, {suffix: False})
+            return
+        await self._commit(array, packs, {suffix: value.to_bytes()})
+
+    async def set_if_not_exists(self, key: str, value: Buffer) -> None:
+        if not await self.exists(key):
+            await self.set(key, value)
+
+    async def _set_many(self, values: Iterable[tuple[str, Buffer]]) -> None:
+        await asyncio.gather(*(self.set(key, value) for key, value in values))
+
+    async def delete(self, key: str) -> None:
+        self._check_writable()
+        parsed = parse_chunk_key(key)
+        if parsed is None:
+            return await self._store.delete(key)
+        array = parsed[0]
+        suffix = key[len(array):]
+        packs = await self._packs(array)
+        found, value = packs.find(suffix)
+        if not found:
+            return await self._store.delete(key)
+        if value is not None:
+            # the deletion also hides an ordinary object left under the key
+            await self._commit(array, packs, {suffix: None})
+
+    async def delete_dir(self, prefix: str) -> None:
+        self._check_writable()
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        await self.flush()
+        for array in _enclosing_arrays(prefix):
+            packs = await self._packs(array)
+            deleted = {key[len(array):]: None for key in packs.keys(array, prefix)}
+            if deleted:
+                await self._commit(array, packs, deleted)  # type: ignore[arg-type]
+        await self._store.delete_dir(prefix)
+        for array in [a for a in self._arrays if a.startswith(prefix)]:
+            del self._arrays[array]
+
+    async def clear(self) -> None:
+        await self.delete_dir("")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get(
+        self, key: str, prototype: BufferPrototype, byte_range: ByteRequest | None = None
+    ) -> Buffer | None:
+        parsed = parse_chunk_key(key)
+        if parsed is None:
+            return await self._store.get(key, prototype, byte_range)
+        array = parsed[0]
+        suffix = key[len(array):]
+        packs = await self._packs(array)
+        for attempt in range(2):
+            found, value = packs.find(suffix)
+            if not found:
+                return await self._store.get(key, prototype, byte_range)
+            if value is None:
+                return None
+            if isinstance(value, bytes):
+                start, stop = _span(byte_range, len(value))
+                return prototype.buffer.from_bytes(value[start:stop])
+            name, offset, length = value
+            start, stop = _span(byte_range, length)
+            data = await self._read(
+                prototype, f"{array}{PACK_DIR}/{name}", offset + start, offset + stop
+            )
+            if data is not None or attempt:
+                return data
+            # the pack was replaced by a compaction elsewhere: reload the index
+            async with packs.mutex():
+                await self._load(array, packs)
+        return None  # pragma: no cover
+
+    async def _read(
+        self, prototype: BufferPrototype, pack_key: str, start: int, stop: int
+    ) -> Buffer | None:
+        """Bytes ``[start, stop)`` of a pack, read together with the other
+        pack reads started in the same event loop iteration.
+        """
+        self._counters["reads"] += 1
+        if start >= stop:
+            return prototype.buffer.from_bytes(b"")
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Buffer | None] = loop.create_future()
+        group = (loop, prototype)
+        batch = self._reads.get(group)
+        if batch is None:
+            batch = self._reads[group] = []
+            loop.create_task(self._read_batch(group, batch))
+        batch.append((pack_key, RangeByteRequest(start, stop), future))
+        return await future
+
+    async def _read_batch(self, group: tuple[Any, BufferPrototype], batch: list[Any]) -> None:
+        await asyncio.sleep(0)  # let the other reads of this iteration join
+        if self._reads.get(group) is batch:
+            del self._reads[group]
+        self._counters["read_requests"] += 1
+        try:
+            results = await self._store.get_partial_values(
+                group[1], [(key, byte_range) for key, byte_range, _ in batch]
+            )
+        except BaseException as exc:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def get_partial_values(
+        self,
+        prototype: BufferPrototype,
+        key_ranges: Iterable[tuple[str, ByteRequest | None]],
+    ) -> list[Buffer | None]:
+        return list(
+            await asyncio.gather(
+                *(self.get(key, prototype, byte_range) for key, byte_range in key_ranges)
+            )
+        )
+
+    async def _get_many(
+        self, requests: Iterable[tuple[str, BufferPrototype, ByteRequest | None]]
+    ) -> AsyncGenerator[tuple[str, Buffer | None], None]:
+        for key, prototype, byte_range in requests:
+            yield key, await self.get(key, prototype, byte_range)
+
+    async def exists(self, key: str) -> bool:
+        parsed = parse_chunk_key(key)
+        if parsed is None:
+            return await self._store.exists(key)
+        array = parsed[0]
+        found, value = (await self._packs(array)).find(key[len(array):])
+        if not found:
+            return await self._store.exists(key)
+        return value is not None
+
+    async def getsize(self, key: str) -> int:
+        parsed = parse_chunk_key(key)
+        if parsed is None:
+            return await self._store.getsize(key)
+        array = parsed[0]
+        found, value = (await self._packs(array)).find(key[len(array):])
+        if not found:
+            return await self._store.getsize(key)
+        if value is None:
+            raise FileNotFoundError(key)
+        return len(value) if isinstance(value, bytes) else value[2]
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def list(self) -> AsyncIterator[str]:
+        return self.list_prefix("")
+
+    async def list_prefix(self, prefix: str) -> AsyncIterator[str]:
+        arrays: dict[str, _Packs] = {}
+        for array in _enclosing_arrays(prefix):
+            packs = arrays[array] = await self._packs(array)
+            for key in packs.keys(array, prefix):
+                yield key
+        async for key in self._store.list_prefix(prefix):
+            match = _PACK_KEY.fullmatch(key)
+            parsed = parse_chunk_key(key) if match is None else None
+            array = match["array"] if match is not None else parsed and parsed[0]
+            if array is None:
+                yield key  # not a chunk: a metadata document or other key
+                continue
+            if array not in arrays:
+                packs = arrays[array] = await self._packs(array)
+                for packed in packs.keys(array, prefix):
+                    yield packed
+            if match is not None:
+                continue  # packs and index objects are not keys of the store
+            found, _ = arrays[array].find(key[len(array):])
+            if not found:
+                yield key  # not listed above, nor deleted
+
+    async def list_dir(self, prefix: str) -> AsyncIterator[str]:
+        base = prefix.rstrip("/") + "/" if prefix else ""
+        children = {child async for child in self._store.list_dir(prefix)}
+        arrays = _enclosing_arrays(base)
+        if PACK_DIR in children:
+            children.discard(PACK_DIR)
+            arrays.append(base)
+        for array in arrays:
+            packs = await self._packs(array)
+            for child in list(children):
+                found, value = packs.find(f"{base}{child}"[len(array):])
+                if found and value is None:
+                    children.discard(child)  # a deleted chunk
+            for key in packs.keys(array, base):
+                children.add(key[len(base):].split("/", 1)[0])
+        for child in sorted(children):
+            yield child
+
+    async def is_empty(self, prefix: str) -> bool:
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        async for _ in self.list_prefix(prefix):
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    async def compact(self, prefix: str = "", max_garbage: float = 0.25) -> CompactResult:
+        """Rewrite the packs of the arrays under ``prefix``.
+
+        Packs with more than ``max_garbage`` of their bytes overwritten or
+        deleted are rewritten, and so are packs smaller than half of
+        ``pack_size``: their values go to new packs of up to ``pack_size``.
+        Ordinary objects hidden by packed or deleted keys are deleted. A
+        new index replaces the old one before the rewritten packs are
+        deleted, so readers of the old index never miss a value.
+        """
+        self._check_writable()
+        if not 0 <= max_garbage < 1:
+            raise ValueError(f"max_garbage must be in [0, 1), got {max_garbage}.")
+        await self.flush()
+        arrays = set(_enclosing_arrays(prefix))
+        async for key in self._store.list_prefix(prefix):
+            match = _PACK_KEY.fullmatch(key)
+            if match is not None:
+                arrays.add(match["array"])
+        result = CompactResult()
+        for array in sorted(arrays):
+            packs = await self._packs(array)
+            async with packs.mutex():
+                await self._load(array, packs)  # include packs written elsewhere
+                result += await self._compact(array, packs, max_garbage)
+        return result
+
+    async def _compact(self, array: str, packs: _Packs, max_garbage: float) -> CompactResult:
+        """Compact the packs of one array (array lock held)."""
+        result = CompactResult(packs_before=len(packs.names))
+        rewrite = [
+            pack_id
+            for pack_id, size in enumerate(packs.sizes)
+            if packs.live[pack_id] < (1 - max_garbage) * size or size < self.pack_size // 2
+        ]
+        if len(rewrite) == 1 and packs.live[rewrite[0]] == packs.sizes[rewrite[0]]:
+            rewrite = []  # a small pack without garbage: nothing to merge it with
+        hidden = []  # ordinary objects under keys of the index
+        async for key in self._store.list_prefix(f"{array}c"):
+            parsed = parse_chunk_key(key)
+            if parsed is not None and parsed[0] == array and key[len(array):] in packs.entries:
+                hidden.append(key)
+        deleted = [suffix for suffix, entry in packs.entries.items() if entry[0] < 0]
+        if not (rewrite or hidden or deleted or packs.stale):
+            result.packs_after = len(packs.names)
+            return result
+
+        # copy the values still referenced by the rewritten packs to new packs
+        moved: dict[int, list[tuple[str, int, int]]] = {pack_id: [] for pack_id in rewrite}
+        for suffix, (pack_id, offset, length) in packs.entries.items():
+            if pack_id in moved:
+                moved[pack_id].append((suffix, offset, length))
+        written = []
+        values: dict[str, bytes | None | bool] = {}
+        nbytes = 0
+        proto = default_buffer_prototype()
+        for pack_id, entries in moved.items():
+            result.bytes_reclaimed += packs.sizes[pack_id] - packs.live[pack_id]
+            if not entries:
+                continue
+            key = f"{array}{PACK_DIR}/{packs.names[pack_id]}"
+            data = await self._store.get(key, proto)
+            if data is None:
+                raise FileNotFoundError(key)
+            content = data.to_bytes()
+            for suffix, offset, length in sorted(entries, key=lambda entry: entry[1]):
+                values[suffix] = content[offset:offset + length]
+                nbytes += length
+                if nbytes >= self.pack_size:
+                    written.append(await self._put_pack(array, values))
+                    values, nbytes = {}, 0
+        if values:
+            written.append(await self._put_pack(array, values))
+
+        # the new index: the packs kept and written, without deleted keys
+        retired = [packs.names[pack_id] for pack_id in rewrite] + packs.stale
+        index = _Packs()
+        kept = {
+            pack_id: index.add_pack(name, packs.sizes[pack_id])
+            for pack_id, name in enumerate(packs.names)
+            if pack_id not in moved
+        }
+        for suffix, (pack_id, offset, length) in packs.entries.items():
+            if pack_id in kept:
+                index.put(suffix, (kept[pack_id], offset, length))
+        for name, footer in written:
+            index.apply(name, footer)
+        await self._delete_keys(hidden)
+        await self._write_index(array, index)
+        packs.adopt(index)  # readers switch over before the old packs go
+        await self._delete_keys([f"{array}{PACK_DIR}/{name}" for name in retired])
+        result.objects_deleted = len(hidden) + len(retired)
+        result.packs_after = len(packs.names)
+        return result
+
+    async def _delete_keys(self, keys: list[str]) -> None:
+        await asyncio.gather(*(self._store.delete(key) for key in keys))
+
+    # ------------------------------------------------------------------
+    # Convenience
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """``stats()`` of the wrapped store (if it has one) and ``packing``
+        counters: packs and entries of the loaded arrays, their ``live``
+        and ``garbage`` bytes, ``commits``, ``values_packed``, pack
+        ``reads`` and the ``read_requests`` serving them, index
+        ``loads`` and index objects written (``indexes``).
+        """
+        inner = getattr(self._store, "stats", None)
+        snapshot = inner() if callable(inner) else {}
+        packs = list(self._arrays.values())
+        live = sum(sum(p.live) for p in packs)
+        snapshot["packing"] = {
+            "arrays": len(packs),
+            "packs": sum(len(p.names) for p in packs),
+            "entries": sum(len(p.entries) for p in packs),
+            "live_bytes": live,
+            "garbage_bytes": sum(sum(p.sizes) for p in packs) - live,
+            **self._counters,
+        }
+        return snapshot
+
+
+def _enclosing_arrays(prefix: str) -> list[str]:
+    """Arrays outside ``prefix`` whose chunk keys may start with ``prefix``.
+
+    ``"temp/c/0/"`` gives ``["temp/"]``: the chunks of ``temp`` in the
+    first row, whose packs are under ``temp/.zpack/``.
+    """
+    arrays = []
+    for i in range(len(prefix)):
+        if i and prefix[i - 1] != "/":
+            continue
+        rest = prefix[i:]
+        if rest == "c" or rest.startswith(("c/", "c.")):
+            arrays.append(prefix[:i])
+    return arrays
+
+
+def _span(byte_range: ByteRequest | None, length: int) -> tuple[int, int]:
+    """``[start, stop)`` of a ``ByteRequest`` within a value of ``length`` bytes."""
+    if byte_range is None:
+        return 0, length
+    if isinstance(byte_range, RangeByteRequest):
+        return min(byte_range.start, length), min(byte_range.end, length)
+    if isinstance(byte_range, OffsetByteRequest):
+        return min(byte_range.offset, length), length
+    if isinstance(byte_range, SuffixByteRequest):
+        return max(length - byte_range.suffix, 0), length
+    raise TypeError(f"Unexpected byte_range, got {byte_range}.")
+
+
+def _retrieve(future: asyncio.Future[Any]) -> None:
+    """Mark a commit failure as seen when every writer waiting for it was cancelled."""
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,239 @@
+"""
+Read-ahead of zarr chunks for SwiftStore.
+
+``ReadAhead`` lets a store watch the chunk keys zarr reads from each array.
+Keys are parsed with zarr v3's default chunk key encoding
+(``<array>/c/i/j/k``, or ``c.i.j.k`` with the ``"."`` separator). When
+consecutive reads of an array move by the same step in chunk coordinates,
+as when scanning along one axis, the next ``depth`` chunks of that walk are
+fetched in the background into a bounded buffer. A read that breaks the
+walk cancels the fetches still in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+_CHUNK_KEY = re.compile(r"(?P<array>(?:.*/)?)c(?P<sep>[/.])(?P<coords>\d+(?:(?P=sep)\d+)*)")
+
+
+def parse_chunk_key(key: str) -> tuple[str, str, tuple[int, ...]] | None:
+    """Split a zarr v3 default chunk key into ``(array, separator, coordinates)``.
+
+    ``"temp/c/3/0/1"`` gives ``("temp/", "/", (3, 0, 1))``. Other keys
+    (metadata documents, v2 chunk keys) give ``None``.
+    """
+    match = _CHUNK_KEY.fullmatch(key)
+    if match is None:
+        return None
+    sep = match["sep"]
+    return match["array"], sep, tuple(int(c) for c in match["coords"].split(sep))
+
+
+@dataclass(frozen=True)
+class ReadAhead:
+    """Chunk read-ahead settings of a SwiftStore.
+
+    Parameters
+    ----------
+    depth:
+        Chunks fetched ahead of a detected walk.
+    confirm:
+        Consecutive reads of an array with the same step required before
+        the walk is followed (``1``: follow every step at once).
+    max_bytes:
+        Size of the buffer of fetched chunks not read yet. The oldest are
+        dropped when it is full.
+    """
+
+    depth: int = 4
+    confirm: int = 2
+    max_bytes: int = 64 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        for name in ("depth", "confirm", "max_bytes"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1, got {getattr(self, name)}.")
+
+    def prefetcher(self) -> Prefetcher:
+        return Prefetcher(self)
+
+
+class _Walk:
+    """Last chunk read from one array and the step that led to it."""
+
+    __slots__ = ("last", "step", "streak")
+
+    def __init__(self, last: tuple[int, ...]) -> None:
+        self.last = last
+        self.step: tuple[int, ...] | None = None
+        self.streak = 0
+
+
+class Prefetcher:
+    """Follows chunk walks and serves chunks fetched ahead of the reader.
+
+    Background fetches run on the event loop of the read that started them
+    and are only awaited from that loop.
+    """
+
+    def __init__(self, config: ReadAhead) -> None:
+        self.config = config
+        self._walks: dict[str, _Walk] = {}
+        self._pending: dict[str, asyncio.Task[Any]] = {}
+        self._buffer: collections.OrderedDict[str, bytes | bytearray]
+        self._buffer = collections.OrderedDict()
+        self._buffered_bytes = 0
+        self.issued = self.hits = self.misses = self.wasted = self.cancelled = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"config": self.config}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    async def get(
+        self,
+        full_key: str,
+        fetch: Callable[[str], Awaitable[bytes | bytearray | None]],
+    ) -> bytes | bytearray | None:
+        """Value of ``full_key`` from the buffer, or from ``fetch(full_key)``."""
+        parsed = parse_chunk_key(full_key)
+        if parsed is None:
+            return await fetch(full_key)
+        data = self._buffer.pop(full_key, None)
+        task = self._pending.pop(full_key, None)
+        self._follow(fetch, *parsed)
+        if data is not None:
+            self._buffered_bytes -= len(data)
+            self.hits += 1
+            return data
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            try:
+                data = await task
+            except Exception:
+                pass  # a failed guess: read the key itself
+            else:
+                self.hits += 1
+                return data
+        self.misses += 1
+        return await fetch(full_key)
+
+    def _follow(
+        self,
+        fetch: Callable[[str], Awaitable[bytes | bytearray | None]],
+        array: str,
+        sep: str,
+        coords: tuple[int, ...],
+    ) -> None:
+        """Record a read of chunk ``coords`` and fetch ahead if it continues a walk."""
+        walk = self._walks.get(array)
+        if walk is None or len(walk.last) != len(coords):
+            self._walks[array] = _Walk(coords)
+            return
+        step = tuple(c - last for c, last in zip(coords, walk.last))
+        if step == walk.step:
+            walk.streak += 1
+        else:
+            if walk.step is not None:
+                self._cancel(array)  # the walk changed: drop its guesses
+            walk.step, walk.streak = step, 1
+        walk.last = coords
+        if walk.streak < self.config.confirm or not any(step):
+            return
+        for k in range(1, self.config.depth + 1):
+            ahead = [c + k * s for c, s in zip(coords, step)]
+            if min(ahead) < 0:
+                break
+            full_key = f"{array}c{sep}{sep.join(map(str, ahead))}"
+            if full_key not in self._buffer and full_key not in self._pending:
+                self._fetch_ahead(fetch, full_key)
+
+    def _fetch_ahead(
+        self, fetch: Callable[[str], Awaitable[bytes | bytearray | None]], full_key: str
+    ) -> None:
+        task = asyncio.ensure_future(fetch(full_key))
+        self._pending[full_key] = task
+        self.issued += 1
+        task.add_done_callback(lambda task: self._landed(full_key, task))
+
+    def _landed(self, full_key: str, task: asyncio.Task[Any]) -> None:
+        """Move a finished fetch nobody waits for yet into the buffer."""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if self._pending.get(full_key) is not task:
+            return  # awaited by a reader, or discarded by a write
+        del self._pending[full_key]
+        data = task.result() if error is None else None
+        if data is None:
+            self.wasted += 1  # the chunk does not exist, or could not be read
+            return
+        self._buffer[full_key] = data
+        self._buffered_bytes += len(data)
+        while self._buffered_bytes > self.config.max_bytes and self._buffer:
+            _, dropped = self._buffer.popitem(last=False)
+            self._buffered_bytes -= len(dropped)
+            self.wasted += 1
+
+    def _cancel(self, array: str) -> None:
+        for full_key in [k for k in self._pending if k.startswith(array)]:
+            parsed = parse_chunk_key(full_key)
+            if parsed is not None and parsed[0] == array:
+                _cancel_task(self._pending.pop(full_key))
+                self.cancelled += 1
+
+    def discard(self, full_key: str) -> None:
+        """Forget ``full_key`` after this store wrote or deleted it."""
+        task = self._pending.pop(full_key, None)
+        if task is not None:
+            _cancel_task(task)
+        data = self._buffer.pop(full_key, None)
+        if data is not None:
+            self._buffered_bytes -= len(data)
+
+    def discard_prefix(self, full_prefix: str) -> None:
+        for full_key in [k for k in (*self._pending, *self._buffer) if k.startswith(full_prefix)]:
+            self.discard(full_key)
+
+    def close(self) -> None:
+        """Cancel fetches in flight and empty the buffer."""
+        for task in self._pending.values():
+            _cancel_task(task)
+        self._pending.clear()
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        self._walks.clear()
+
+    def stats(self) -> dict[str, Any]:
+        reads = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / reads if reads else 0.0,
+            "issued": self.issued,
+            "wasted": self.wasted,
+            "cancelled": self.cancelled,
+            "in_flight": len(self._pending),
+            "buffered": len(self._buffer),
+            "buffered_bytes": self._buffered_bytes,
+        }
+
+
+def _cancel_task(task: asyncio.Task[Any]) -> None:
+    loop = task.get_loop()
+    if loop.is_closed():
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        task.cancel()
+    else:
+        loop.call_soon_threadsafe(task.cancel)
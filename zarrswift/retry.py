@@ -0,0 +1,151 @@
+"""
+Retry policy and request hedging for SwiftStore.
+
+``RetryPolicy`` decides which failed requests are retried (throttling,
+server errors, timeouts and dropped connections, but never a 404) and how
+long to wait in between: exponential backoff with full jitter, honouring
+``Retry-After``. Optionally, reads are hedged: when a GET has not answered
+within a high percentile of recent GET latencies, a duplicate is sent and
+whichever answers first wins.
+"""
+
+from __future__ import annotations
+
+import collections
+import random
+import ssl
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from swiftclient.exceptions import ClientException
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without aiohttp
+    aiohttp = None
+
+RETRY_STATUSES = frozenset({408, 429, 498, 499, 500, 502, 503, 504})
+# failures without a response that are retried
+_TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    requests.ConnectionError,
+    requests.Timeout,
+)
+# failures that another attempt would repeat
+_PERMANENT_ERRORS: tuple[type[BaseException], ...] = (
+    ssl.SSLCertVerificationError,
+    requests.exceptions.SSLError,
+)
+if aiohttp is not None:
+    _TRANSIENT_ERRORS += (aiohttp.ClientError,)
+    _PERMANENT_ERRORS += (aiohttp.ClientSSLError,)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How SwiftStore retries failed requests and hedges slow reads.
+
+    Parameters
+    ----------
+    max_attempts:
+        Attempts per request, including the first (``1`` disables retries).
+    backoff_base, backoff_max:
+        The wait before retry ``n`` is drawn uniformly from
+        ``[0, min(backoff_max, backoff_base * 2 ** (n - 1))]`` seconds, or
+        is the server's ``Retry-After`` if that is longer.
+    timeout:
+        Seconds after which a single attempt is abandoned and counts as a
+        retryable failure (default: no limit). On the ``"swiftclient"``
+        transport the abandoned request cannot be interrupted: it keeps its
+        pool worker busy until it ends, so also set a socket-level timeout
+        with ``storage_options["timeout"]``.
+    retry_statuses:
+        HTTP statuses that are retried. Requests that fail without a
+        response (connection errors, timeouts) are always retried; other
+        errors, such as TLS certificate failures or swiftclient errors
+        without a status (bad credentials or configuration), are not.
+    hedge_quantile:
+        Hedge GETs that take longer than this quantile (e.g. ``0.95``) of
+        recent GET latencies. ``None`` (default) disables hedging.
+    hedge_min_samples:
+        Number of recent latencies required before hedging starts.
+    """
+
+    max_attempts: int = 6
+    backoff_base: float = 0.25
+    backoff_max: float = 10.0
+    timeout: float | None = None
+    retry_statuses: frozenset[int] = RETRY_STATUSES
+    hedge_quantile: float | None = None
+    hedge_min_samples: int = 20
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {self.max_attempts}.")
+        if self.hedge_quantile is not None and not 0 < self.hedge_quantile < 1:
+            raise ValueError(
+                f"hedge_quantile must be in (0, 1), got {self.hedge_quantile}."
+            )
+
+    def retryable(self, exc: BaseException) -> bool:
+        """Whether a request that raised ``exc`` should be tried again."""
+        if isinstance(exc, ClientException):
+            # without a status: auth and configuration errors
+            return exc.http_status in self.retry_statuses
+        if isinstance(exc, _PERMANENT_ERRORS):
+            return False
+        return isinstance(exc, _TRANSIENT_ERRORS)
+
+    def backoff(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (from 1)."""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, cap)
+        headers = getattr(exc, "http_response_headers", None) or {}
+        retry_after = {k.lower(): v for k, v in headers.items()}.get("retry-after")
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass  # an HTTP date; keep the jittered delay
+        return delay
+
+
+class LatencyWindow:
+    """Sliding window of recent request latencies with quantile lookup.
+
+    Quantiles are recomputed at most every ``refresh`` new samples.
+    """
+
+    def __init__(self, size: int = 1000, refresh: int = 32) -> None:
+        self._samples: collections.deque[float] = collections.deque(maxlen=size)
+        self._refresh = refresh
+        self._cached: tuple[float, float] | None = None  # (q, value)
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"size": self._samples.maxlen, "refresh": self._refresh}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._added += 1
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            cached = self._cached
+            if cached is not None and cached[0] == q and self._added < self._refresh:
+                return cached[1]
+            ordered = sorted(self._samples)
+            value = ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+            self._cached, self._added = (q, value), 0
+            return value
@@ -0,0 +1,209 @@
+"""
+Instrumentation for SwiftStore.
+
+A ``StatsCollector`` passed as ``SwiftStore(metrics=...)`` records, per
+store operation (``get``, ``set``, ``list_prefix``, ...) and per Swift
+request (``get_object``, ``put_object``, ...): counts, errors, bytes
+transferred, a latency histogram and in-flight gauges, plus retries, error
+codes and the most frequently accessed keys. ``SwiftStore.stats()`` returns
+a snapshot; hooks receive every finished operation as an ``OpEvent``.
+Without a collector the store skips all of this.
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# upper bounds of the latency buckets: 1 ms, 2 ms, ... ~16 s, then +inf
+LATENCY_BUCKETS = tuple(0.001 * 2**i for i in range(15))
+DEFAULT_HOT_KEYS = 100
+
+
+@dataclass(frozen=True)
+class OpEvent:
+    """One finished store operation (``kind="op"``) or Swift request."""
+
+    kind: str
+    name: str
+    key: str | None
+    seconds: float
+    nbytes: int
+    error: str | None
+
+
+class Histogram:
+    """Latency histogram over ``LATENCY_BUCKETS``."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile ``q`` (``max`` for the last)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts, strict=False):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip((*LATENCY_BUCKETS, float("inf")), self.counts, strict=True)),
+        }
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class StatsCollector:
+    """Thread-safe collector of SwiftStore metrics.
+
+    Parameters
+    ----------
+    hooks:
+        Callables invoked with an ``OpEvent`` after every store operation
+        and Swift request, e.g. to export metrics. Exceptions raised by a
+        hook are turned into warnings. Hooks are not pickled.
+    hot_keys:
+        Number of most frequently accessed keys to track (approximately,
+        in bounded memory). ``0`` disables key tracking.
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[Callable[[OpEvent], Any]] = (),
+        hot_keys: int = DEFAULT_HOT_KEYS,
+    ) -> None:
+        self.hooks = list(hooks)
+        self.hot_keys = hot_keys
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"hot_keys": self.hot_keys}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def add_hook(self, hook: Callable[[OpEvent], Any]) -> None:
+        self.hooks.append(hook)
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self._counters: dict[tuple[str, str], _Counters] = {}
+            self._errors: collections.Counter[str] = collections.Counter()
+            self._keys: collections.Counter[str] = collections.Counter()
+            self.retries = 0
+            self.started = time.time()
+
+    def start(self, kind: str, name: str) -> float:
+        """Count an operation as in flight; pass the result to ``finish``."""
+        with self._lock:
+            counters = self._counters.get((kind, name))
+            if counters is None:
+                counters = self._counters[(kind, name)] = _Counters()
+            counters.in_flight += 1
+            counters.max_in_flight = max(counters.max_in_flight, counters.in_flight)
+        return time.perf_counter()
+
+    def finish(
+        self,
+        kind: str,
+        name: str,
+        started: float,
+        key: str | None = None,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        error: str | None = None,
+    ) -> None:
+        seconds = time.perf_counter() - started
+        with self._lock:
+            counters = self._counters.get((kind, name))
+            if counters is None:  # started before a reset
+                counters = self._counters[(kind, name)] = _Counters()
+            counters.in_flight = max(counters.in_flight - 1, 0)
+            counters.count += 1
+            counters.bytes_in += bytes_in
+            counters.bytes_out += bytes_out
+            counters.latency.observe(seconds)
+            if error is not None:
+                counters.errors += 1
+                self._errors[error] += 1
+            if key is not None and self.hot_keys:
+                self._keys[key] += 1
+                if len(self._keys) > 10 * self.hot_keys:
+                    # keep memory bounded: forget the rarely accessed keys
+                    self._keys = collections.Counter(dict(self._keys.most_common(self.hot_keys)))
+        if self.hooks:
+            event = OpEvent(kind, name, key, seconds, bytes_in + bytes_out, error)
+            for hook in self.hooks:
+                try:
+                    hook(event)
+                except Exception as exc:
+                    warnings.warn(f"Stats hook {hook!r} failed: {exc!r}", RuntimeWarning,
+                                  stacklevel=2)
+
+    def retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Counters since creation (or ``reset``) as plain dicts."""
+        with self._lock:
+            ops = {n: c.snapshot() for (k, n), c in self._counters.items() if k == "op"}
+            requests = {
+                n: c.snapshot() for (k, n), c in self._counters.items() if k == "request"
+            }
+            return {
+                "seconds": time.time() - self.started,
+                "ops": ops,
+                "requests": requests,
+                "retries": self.retries,
+                "errors": dict(self._errors),
+                "hot_keys": self._keys.most_common(self.hot_keys),
+            }
@@ -1,16 +1,30 @@
 """
 SwiftStore: OpenStack Swift Object Storage backend for zarr v3.
 
-The store wraps python-swiftclient's synchronous Connection API with
-asyncio.to_thread so that Swift I/O never blocks the event loop.
+The store wraps python-swiftclient's synchronous Connection API with a
+bounded pool of worker threads, each owning its own keep-alive Connection,
+so that Swift I/O never blocks the event loop.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, unquote
 
 from swiftclient import Connection
+from swiftclient.client import resp_header_dict
 from swiftclient.exceptions import ClientException
 
 from zarr.abc.store import (
@@ -20,12 +34,641 @@ from zarr.abc.store import (
     SuffixByteRequest,
 )
 
+from .cache import MISSING, CacheEntry
+from .endpoints import balancer_for, current_endpoint, rebase
+from .retry import LatencyWindow, RetryPolicy
+from .utils import token_provider_for
+
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Iterable
 
     from zarr.abc.store import ByteRequest
     from zarr.core.buffer import Buffer, BufferPrototype
 
+    from .aio import AsyncConnection
+    from .cache import ChunkCache, MetadataCache, MetadataEntry
+    from .endpoints import EndpointBalancer
+    from .limiter import AdaptiveLimiter, ConcurrencyLimits
+    from .readahead import Prefetcher, ReadAhead
+    from .stats import StatsCollector
+    from .utils import TokenProvider
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_LIST_PAGE_SIZE = 10_000  # Swift's default container_listing_limit
+DEFAULT_COALESCE_GAP = 1 << 20  # 1 MiB
+DEFAULT_COALESCE_MAX_SIZE = 32 << 20  # 32 MiB
+MAX_RANGES_PER_REQUEST = 50  # Swift serves at most 50 ranges per GET
+DEFAULT_MAX_DELETES_PER_REQUEST = 10_000  # bulk middleware default
+BULK_DELETE_CONCURRENCY = 4  # bulk-delete requests in flight per delete_dir
+DEFAULT_BATCH_MAX_BYTES = 64 << 20  # 64 MiB
+DEFAULT_BATCH_MAX_ITEMS = 1_000
+DEFAULT_STREAM_CHUNK_SIZE = 1 << 20  # 1 MiB
+HASH_INLINE_MAX = 64 << 10  # smaller values are hashed on the event loop
+# documents whose contents the metadata cache keeps (zarr v3 and v2)
+METADATA_KEYS = frozenset({"zarr.json", ".zarray", ".zgroup", ".zattrs", ".zmetadata"})
+
+TRANSPORTS = ("swiftclient", "aiohttp")
+
+# request class of each Connection method, for ConcurrencyLimits (default: write)
+_REQUEST_CLASSES = {
+    "get_object": "read",
+    "head_object": "read",
+    "head_container": "read",
+    "get_capabilities": "read",
+    "get_container": "listing",
+    "get_account": "listing",
+}
+
+# (storage URL, container) pairs known to exist, shared by all stores
+_known_containers: set[tuple[str, str]] = set()
+
+
+class SwiftBulkError(OSError):
+    """A Swift bulk operation failed for some of its objects.
+
+    ``errors`` lists ``(object path, status)`` pairs as reported by Swift.
+    """
+
+    def __init__(self, message: str, errors: list[tuple[str, str]]) -> None:
+        super().__init__(f"{message}: {len(errors)} failed, e.g. {errors[:3]}")
+        self.errors = errors
+
+
+def _coalesce(
+    ranges: Iterable[tuple[int, int]], gap: int, max_size: int
+) -> list[tuple[int, int]]:
+    """Merge ``(start, end)`` ranges closer than ``gap`` into spans of at
+    most ``max_size`` bytes (a single range larger than that is kept whole).
+    """
+    spans: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if spans:
+            span_start, span_end = spans[-1]
+            if start <= span_end + gap and (
+                end <= span_end or end - span_start <= max_size
+            ):
+                spans[-1] = (span_start, max(end, span_end))
+                continue
+        spans.append((start, end))
+    return spans
+
+
+def _parse_byteranges(
+    headers: dict[str, str], content: bytes
+) -> list[tuple[int, memoryview]]:
+    """Split a (possibly multipart/byteranges) response into ``(offset, view)``
+    parts without copying the payload.
+    """
+    view = memoryview(content)
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("multipart/byteranges"):
+        boundary = content_type.split("boundary=", 1)[1].strip().strip('"').encode()
+        parts = []
+        delimiter = b"--" + boundary
+        pos = content.find(delimiter)
+        while pos >= 0:
+            pos += len(delimiter)
+            if content[pos:pos + 2] == b"--":
+                break
+            header_end = content.find(b"\r\n\r\n", pos)
+            start = length = None
+            for line in content[pos:header_end].decode("latin-1").splitlines():
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-range":
+                    span = value.split()[1].split("/")[0]
+                    first, last = span.split("-")
+                    start, length = int(first), int(last) - int(first) + 1
+            if start is None:
+                raise ValueError("multipart/byteranges part without Content-Range")
+            body_start = header_end + 4
+            parts.append((start, view[body_start:body_start + length]))
+            pos = content.find(delimiter, body_start + length)
+        return parts
+    content_range = headers.get("content-range")
+    if content_range:
+        first = content_range.split()[1].split("-")[0]
+        return [(int(first), view)]
+    return [(0, view)]  # server ignored the Range header
+
+
+async def _drain(
+    items: AsyncIterator[Any], func: Any, concurrency: int
+) -> list[Any]:
+    """Await ``func(item)`` for every item of ``items`` with at most
+    ``concurrency`` calls in flight, consuming ``items`` as it goes.
+
+    Returns the results in completion order. After a call raises, the
+    remaining items are skipped and the first exception is raised.
+    """
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=2 * concurrency)
+    results: list[Any] = []
+    failures: list[Exception] = []
+
+    async def _worker() -> None:
+        while (item := await queue.get()) is not None:
+            if failures:
+                continue  # keep draining so that the producer never blocks
+            try:
+                results.append(await func(item))
+            except Exception as exc:
+                failures.append(exc)
+
+    workers = [asyncio.ensure_future(_worker()) for _ in range(concurrency)]
+    try:
+        async for item in items:
+            if failures:
+                break
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+    if failures:
+        raise failures[0]
+    return results
+
+
+def _request(
+    url: str,
+    token: str,
+    method: str,
+    container: str,
+    obj: str | None = None,
+    *,
+    headers: dict[str, str] | None = None,
+    query_string: str | None = None,
+    data: Any = None,
+    http_conn: tuple[Any, Any],
+    service_token: str | None = None,
+) -> tuple[dict[str, str], bytes]:
+    """Generic Swift request returning ``(headers, body)``, in the style of
+    the ``swiftclient.client`` functions (for middleware such as
+    extract-archive whose result is only reported in the body).
+    """
+    parsed, conn = http_conn
+    path = f"{parsed.path}/{quote(container)}"
+    if obj:
+        path += f"/{quote(obj)}"
+    if query_string:
+        path += f"?{query_string}"
+    req_headers = dict(headers or {})
+    req_headers["X-Auth-Token"] = token
+    if service_token:
+        req_headers["X-Service-Token"] = service_token
+    if hasattr(data, "seek"):
+        data.seek(0)  # rewind on retry
+    conn.request(method, path, data, req_headers)
+    resp = conn.getresponse()
+    body = resp.read()
+    if resp.status < 200 or resp.status >= 300:
+        raise ClientException.from_response(resp, f"{method} failed", body)
+    return resp_header_dict(resp), body
+
+
+class _Connection(Connection):
+    """``swiftclient.Connection`` with a generic ``request`` method.
+
+    With a ``token_provider``, every request uses the provider's current
+    token, and a token Swift rejects is replaced through the provider
+    rather than by a private re-authentication of this connection.
+
+    Requests go to the host of the storage URL, or to the proxy chosen with
+    ``use_endpoint``; a keep-alive connection is kept per proxy.
+    """
+
+    def __init__(
+        self, *args: Any, token_provider: TokenProvider | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.token_provider = token_provider
+        self._provided_token: str | None = None
+        self._endpoint: str | None = None
+        self._http_conns: dict[str | None, tuple[Any, Any]] = {}
+
+    def use_endpoint(self, endpoint: str | None) -> None:
+        """Send the following requests to the proxy at ``endpoint``."""
+        if endpoint == self._endpoint:
+            return
+        if self.http_conn:
+            self._http_conns[self._endpoint] = self.http_conn
+        self.http_conn = self._http_conns.pop(endpoint, None)
+        self._endpoint = endpoint
+
+    def http_connection(self, url: str | None = None) -> tuple[Any, Any]:
+        return super().http_connection(rebase(url or self.url, self._endpoint))
+
+    def get_auth(self) -> tuple[str, str]:
+        if self.token_provider is None:
+            return super().get_auth()
+        # called after a 401 (which cleared self.token) or before first use
+        self.url, self.token = self.token_provider.get(stale=self._provided_token)
+        self._provided_token = self.token
+        return self.url, self.token
+
+    def _retry(self, reset_func: Any, func: Any, *args: Any, **kwargs: Any) -> Any:
+        if self.token_provider is not None:
+            url, token = self.token_provider.get()
+            if url != self.url:
+                self._close_idle()
+                self.http_conn = None
+            self.url, self.token = url, token
+            self._provided_token = token
+        return super()._retry(reset_func, func, *args, **kwargs)
+
+    def request(
+        self, method: str, container: str, obj: str | None = None, **kwargs: Any
+    ) -> tuple[dict[str, str], bytes]:
+        return self._retry(None, _request, method, container, obj, **kwargs)
+
+    def _close_idle(self) -> None:
+        for _, conn in self._http_conns.values():
+            conn.close()
+        self._http_conns.clear()
+
+    def close(self) -> None:
+        self._close_idle()
+        super().close()
+
+
+class _ConnectionPool:
+    """Bounded pool of swiftclient connections, one per worker thread.
+
+    ``swiftclient.Connection`` is not thread-safe, so each worker thread of a
+    dedicated executor lazily creates and keeps its own Connection. Requests
+    issued from the same worker reuse that Connection's keep-alive session.
+    """
+
+    def __init__(self, storage_options: dict[str, Any], max_connections: int) -> None:
+        if max_connections < 1:
+            raise ValueError(f"max_connections must be >= 1, got {max_connections}.")
+        # endpoints are chosen by the store, per request
+        self.storage_options = {k: v for k, v in storage_options.items() if k != "endpoints"}
+        self.max_connections = max_connections
+        self.token_provider = token_provider_for(storage_options)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[Connection] = []
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_connections,
+                        thread_name_prefix="zarrswift",
+                        initializer=self._init_worker,
+                    )
+        return self._executor
+
+    def _init_worker(self) -> None:
+        self._local.worker = True
+
+    def connection(self) -> Connection:
+        """Return the Connection owned by the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            options = self.storage_options
+            if getattr(self._local, "worker", False):
+                # requests run by workers are retried by the store's RetryPolicy
+                options = {**options, "retries": 0}
+            conn = _Connection(**options, token_provider=self.token_provider)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @property
+    def url(self) -> str:
+        """Storage URL, authenticating the calling thread's connection if needed."""
+        with self._lock:
+            for conn in self._connections:
+                if conn.url:
+                    return conn.url
+        conn = self.connection()
+        if not conn.url:
+            conn.get_auth()
+        return conn.url
+
+    def _invoke(
+        self, endpoint: str | None, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Any:
+        conn = self.connection()
+        conn.use_endpoint(endpoint)
+        return getattr(conn, method)(*args, **kwargs)
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run ``Connection.<method>(*args, **kwargs)`` on a pooled worker,
+        sent to the proxy in ``endpoints.current_endpoint`` if one is set.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self._invoke, current_endpoint.get(), method, args, kwargs),
+        )
+
+    async def run(self, func: Any, *args: Any) -> Any:
+        """Run ``func(conn, *args)`` on a pooled worker."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: func(self.connection(), *args)
+        )
+
+    def close(self) -> None:
+        """Close all connections; the pool is rebuilt on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            connections, self._connections = self._connections, []
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class _BufferReader:
+    """Read-only, seekable file-like view over a memoryview.
+
+    ``read`` hands out zero-copy slices of the underlying buffer, so
+    swiftclient streams a value to the socket without first materializing
+    it as ``bytes``. ``seek``/``tell`` let swiftclient rewind on retry, and
+    ``__len__`` lets it send a ``Content-Length`` instead of chunked
+    transfer encoding.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._pos = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        start = self._pos
+        end = len(self._view) if size is None or size < 0 else start + size
+        self._pos = min(end, len(self._view))
+        return self._view[start:self._pos]
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._pos, len(self._view))[whence]
+        self._pos = max(0, min(base + offset, len(self._view)))
+        return self._pos
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+
+def _md5_parts(view: memoryview, part_size: int | None = None) -> list[str]:
+    """Hex MD5 of ``view``, or of each ``part_size`` slice of it."""
+    if part_size is None:
+        return [hashlib.md5(view).hexdigest()]
+    return [
+        hashlib.md5(view[start:start + part_size]).hexdigest()
+        for start in range(0, len(view), part_size)
+    ]
+
+
+def _slo_etag(digests: list[str]) -> str:
+    """ETag Swift reports for an SLO with segments of these MD5s."""
+    return hashlib.md5("".join(digests).encode()).hexdigest()
+
+
+def _listed_etag(entry: dict[str, Any]) -> str | None:
+    """ETag of a listed object as a HEAD reports it (the SLO ETag for manifests)."""
+    etag = entry.get("slo_etag") or entry.get("hash")
+    return etag.strip('"') if etag else None
+
+
+def _fresh_bodies(
+    args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """``args`` and ``kwargs`` with a new reader for each request body.
+
+    A timed-out attempt on the swiftclient transport may still be sending
+    from its reader in a pool thread, so a retry must not share its cursor.
+    """
+
+    def fresh(value: Any) -> Any:
+        return _BufferReader(value._view) if isinstance(value, _BufferReader) else value
+
+    return tuple(map(fresh, args)), {name: fresh(value) for name, value in kwargs.items()}
+
+
+def _error_code(exc: BaseException) -> str:
+    """HTTP status of a failed request, or the exception's type name."""
+    status = getattr(exc, "http_status", None)
+    return str(status) if status is not None else type(exc).__name__
+
+
+def _instrumented(
+    op: str,
+    received: Any = None,
+    sent: Any = None,
+) -> Any:
+    """Record calls of a store coroutine in ``self.metrics`` when it is set.
+
+    ``received(result)`` and ``sent(args)`` return the bytes transferred.
+    """
+
+    def decorate(func: Any) -> Any:
+        @functools.wraps(func)
+        async def wrapper(self: SwiftStore, *args: Any, **kwargs: Any) -> Any:
+            metrics = self.metrics
+            if metrics is None:
+                return await func(self, *args, **kwargs)
+            key = args[0] if args and isinstance(args[0], str) else None
+            started = metrics.start("op", op)
+            result = error = None
+            try:
+                result = await func(self, *args, **kwargs)
+                return result
+            except BaseException as exc:
+                error = _error_code(exc)
+                raise
+            finally:
+                metrics.finish(
+                    "op",
+                    op,
+                    started,
+                    key,
+                    bytes_in=received(result) if received and error is None else 0,
+                    bytes_out=sent(args) if sent and error is None else 0,
+                    error=error,
+                )
+
+        return wrapper
+
+    return decorate
+
+
+def _instrumented_iter(op: str, received: Any = None) -> Any:
+    """``_instrumented`` for async generators; latency lasts until exhaustion.
+
+    ``received(item)`` returns the bytes transferred per yielded item.
+    """
+
+    def decorate(func: Any) -> Any:
+        @functools.wraps(func)
+        async def wrapper(self: SwiftStore, *args: Any, **kwargs: Any) -> Any:
+            metrics = self.metrics
+            if metrics is None:
+                async for item in func(self, *args, **kwargs):
+                    yield item
+                return
+            started = metrics.start("op", op)
+            error = None
+            nbytes = 0
+            try:
+                async for item in func(self, *args, **kwargs):
+                    if received is not None:
+                        nbytes += received(item)
+                    yield item
+            except GeneratorExit:
+                raise  # the consumer stopped early
+            except BaseException as exc:
+                error = _error_code(exc)
+                raise
+            finally:
+                key = args[0] if args and isinstance(args[0], str) else None
+                metrics.finish("op", op, started, key, bytes_in=nbytes, error=error)
+
+        return wrapper
+
+    return decorate
+
+
+def _nbytes(value: Buffer | None) -> int:
+    return len(value) if value is not None else 0
+
+
+def _slice(
+    data: bytes | memoryview, byte_range: ByteRequest | None
+) -> bytes | memoryview:
+    """Apply a zarr ``ByteRequest`` to an in-memory value."""
+    if byte_range is None:
+        return data
+    if isinstance(byte_range, RangeByteRequest):
+        return data[byte_range.start:byte_range.end]
+    if isinstance(byte_range, OffsetByteRequest):
+        return data[byte_range.offset:]
+    return data[-byte_range.suffix:] if byte_range.suffix else b""
+
+
+def _content_span(headers: dict[str, str]) -> tuple[int, int]:
+    """Absolute ``[start, stop)`` of a GET response body within the object."""
+    content_range = headers.get("content-range")
+    if content_range:
+        first_last, _, _ = content_range.split()[1].partition("/")
+        first, _, last = first_last.partition("-")
+        return int(first), int(last) + 1
+    return 0, int(headers.get("content-length") or 0)
+
+
+def _failed_keys(keys: Iterable[str], errors: list[tuple[str, str]]) -> list[str]:
+    """The keys named by the ``(/<container>/<object>, status)`` errors of a
+    bulk request; all of ``keys`` if an error names none of them.
+    """
+    keys = list(keys)
+    failed = {unquote(path).lstrip("/").partition("/")[2] for path, _ in errors}
+    if not failed.issubset(keys):
+        return keys
+    return [key for key in keys if key in failed]
+
+
+class _WriteBatch:
+    """Buffered ``set`` calls flushed as tar archives to extract-archive.
+
+    Created by ``SwiftStore.batch_writes``. Pending values are visible to
+    ``get``/``exists``/``getsize`` of the same store until they are flushed.
+    """
+
+    def __init__(self, store: SwiftStore, max_bytes: int, max_items: int) -> None:
+        self.store = store
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.pending: dict[str, bytes] = {}
+        self.nbytes = 0
+
+    async def add(self, full_key: str, data: bytes) -> None:
+        self.nbytes += len(data) - len(self.pending.get(full_key, b""))
+        self.pending[full_key] = data
+        if self.nbytes >= self.max_bytes or len(self.pending) >= self.max_items:
+            await self.flush()
+
+    def discard(self, full_key: str) -> None:
+        data = self.pending.pop(full_key, None)
+        if data is not None:
+            self.nbytes -= len(data)
+
+    def discard_prefix(self, full_prefix: str) -> None:
+        for full_key in [key for key in self.pending if key.startswith(full_prefix)]:
+            self.discard(full_key)
+
+    async def flush(self) -> None:
+        """Upload all pending values; raise ``SwiftBulkError`` on failures."""
+        pending, self.pending, self.nbytes = self.pending, {}, 0
+        if not pending:
+            return
+        store = self.store
+        try:
+            info = await store._capabilities()
+            if "bulk_upload" in info:
+                errors = await self._extract_archive(pending)
+            else:
+                errors = await self._put_each(pending)
+        except BaseException:
+            # ``set`` recorded the pending keys as written
+            for full_key in pending:
+                store._meta_invalidate(full_key)
+            raise
+        if errors:
+            for full_key in _failed_keys(pending, errors):
+                store._meta_invalidate(full_key)
+            raise SwiftBulkError("Failed to write batch", errors)
+
+    async def _extract_archive(self, pending: dict[str, bytes]) -> list[tuple[str, str]]:
+        store = self.store
+        base = f"{store.prefix}/" if store.prefix else ""
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            for full_key, data in pending.items():
+                member = tarfile.TarInfo(full_key[len(base):])
+                member.size = len(data)
+                tar.addfile(member, io.BytesIO(data))
+        body = archive.getbuffer()
+        data = body if store.transport == "aiohttp" else _BufferReader(body)
+        _, content = await store._call(
+            "request",
+            "PUT",
+            store.container,
+            store.prefix or None,
+            headers={"Accept": "application/json", "Content-Length": str(len(body))},
+            query_string="extract-archive=tar",
+            data=data,
+        )
+        result = json.loads(content)
+        errors = [(name, status) for name, status in result.get("Errors", [])]
+        status = result.get("Response Status", "201 Created")
+        if not errors and not status.startswith("2"):
+            errors = [(f"/{store.container}/{key}", status) for key in pending]
+        return errors
+
+    async def _put_each(self, pending: dict[str, bytes]) -> list[tuple[str, str]]:
+        store = self.store
+
+        async def _put(full_key: str, data: bytes) -> tuple[str, str] | None:
+            try:
+                await store._put_view(store.container, full_key, memoryview(data))
+            except ClientException as exc:
+                return (f"/{store.container}/{full_key}", f"{exc.http_status} {exc.http_reason}")
+            return None
+
+        results = await asyncio.gather(*(_put(k, v) for k, v in pending.items()))
+        return [error for error in results if error is not None]
+
 
 class SwiftStore(Store):
     """zarr v3 storage backend for OpenStack Swift Object Storage.
@@ -39,8 +682,93 @@ class SwiftStore(Store):
     storage_options:
         Keyword arguments forwarded to ``swiftclient.Connection`` (e.g.
         ``preauthurl``, ``preauthtoken``, ``authurl``, ``user``, ``key``).
+        ``endpoints``, a list of proxy base URLs or a
+        ``zarrswift.endpoints.Endpoints``, spreads requests over several
+        proxies of the cluster and routes around failed ones.
     read_only:
         Open the store in read-only mode.
+    max_connections:
+        Maximum number of concurrent Swift connections. Each connection is
+        owned by one worker thread of a dedicated executor and reused for
+        keep-alive across requests.
+    transport:
+        ``"swiftclient"`` (default) runs the blocking python-swiftclient API
+        on the connection pool. ``"aiohttp"`` uses a native asyncio client
+        (requires aiohttp) so that requests do not need a worker thread.
+    list_page_size:
+        Number of entries requested per container listing page. Must not
+        exceed the cluster's ``container_listing_limit`` (10,000 by default).
+    list_prefetch:
+        Request the next listing page while the current one is consumed.
+    coalesce_gap:
+        In ``get_partial_values``, byte ranges of the same object separated
+        by at most this many bytes are fetched with a single ranged request.
+    coalesce_max_size:
+        Upper bound on the size of a coalesced range.
+    multirange:
+        Fetch the coalesced ranges of one object with a single multi-range
+        GET (answered as ``multipart/byteranges``) instead of one GET each.
+    segment_size:
+        Values larger than this many bytes are uploaded as a Static Large
+        Object: the value is split into segments of ``segment_size`` bytes,
+        the segments are uploaded concurrently and an SLO manifest is
+        written under the key. The segments of an SLO that a ``set``
+        replaces are deleted after the write; values that fit in one object
+        only check for such an SLO when ``metadata_cache`` has seen one
+        under the key. ``None`` (default) disables segmentation; single
+        objects are limited to 5 GiB by Swift.
+    segment_container:
+        Container holding SLO segments (default: ``<container>_segments``).
+    download_part_size:
+        Download whole objects larger than this many bytes as parallel
+        ranged GETs of ``download_part_size`` bytes written into one
+        preallocated buffer. ``None`` (default) disables parallel download.
+    download_concurrency:
+        Maximum number of ranged GETs in flight per parallel download.
+    cache:
+        Optional ``zarrswift.cache.ChunkCache``. Full-object reads populate
+        it, later reads (including byte ranges) are served from it after
+        revalidation with Swift, and this store's writes and deletes
+        invalidate it.
+    metadata_cache:
+        Optional ``zarrswift.cache.MetadataCache``. Remembers, for its TTL,
+        the size and ETag of objects, "not found" answers, and the contents
+        of metadata documents (``zarr.json`` and the zarr v2 equivalents),
+        so that repeated ``get`` of metadata, ``exists`` and ``getsize``
+        are answered locally. Updated by this store's writes and deletes.
+    metadata_prefetch:
+        With a ``metadata_cache``, fill it from one paginated listing of the
+        store on the first lookup it cannot answer (see
+        ``prefetch_metadata``). Every key missing from the listing is then
+        known not to exist without a request. Best for stores whose listing
+        is much cheaper than the lookups it saves.
+    metrics:
+        Optional ``zarrswift.stats.StatsCollector`` recording counts, bytes,
+        latency histograms, errors and in-flight gauges of store operations
+        and Swift requests (see ``stats()``).
+    retry:
+        ``zarrswift.retry.RetryPolicy`` for failed requests (default:
+        ``RetryPolicy()``). Throttling, server errors, timeouts and dropped
+        connections are retried with jittered exponential backoff; a 404 is
+        not. The policy can also bound each attempt and hedge slow GETs.
+    concurrency:
+        Optional ``zarrswift.limiter.ConcurrencyLimits`` capping the Swift
+        requests in flight separately for reads, writes and listings,
+        optionally adapting the caps to throttling. ``None`` (default)
+        leaves requests bounded only by ``max_connections``.
+    read_ahead:
+        Optional ``zarrswift.readahead.ReadAhead``. Whole-chunk reads are
+        watched per array, and when they walk through the chunk grid with a
+        constant step, the next chunks of the walk are fetched in the
+        background. Hits and misses are reported by ``stats()``.
+    skip_unchanged:
+        Compute the MD5 of every value written with ``set`` and skip the
+        upload when it matches the ETag and size ``metadata_cache`` holds
+        for the key (from earlier requests, or from a listing with
+        ``prefetch_metadata`` or ``metadata_prefetch``). Other uploads send
+        the MD5 as ``ETag``, so Swift rejects a value corrupted in transit.
+        Requires ``metadata_cache``; values changed by other clients within
+        the cache's TTL may be skipped wrongly.
 
     Examples
     --------
@@ -68,41 +796,282 @@ class SwiftStore(Store):
         storage_options: dict[str, Any] | None = None,
         *,
         read_only: bool = False,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        transport: str = "swiftclient",
+        list_page_size: int = DEFAULT_LIST_PAGE_SIZE,
+        list_prefetch: bool = False,
+        coalesce_gap: int = DEFAULT_COALESCE_GAP,
+        coalesce_max_size: int = DEFAULT_COALESCE_MAX_SIZE,
+        multirange: bool = True,
+        segment_size: int | None = None,
+        segment_container: str | None = None,
+        download_part_size: int | None = None,
+        download_concurrency: int = 8,
+        cache: ChunkCache | None = None,
+        metadata_cache: MetadataCache | None = None,
+        metadata_prefetch: bool = False,
+        retry: RetryPolicy | None = None,
+        metrics: StatsCollector | None = None,
+        concurrency: ConcurrencyLimits | None = None,
+        read_ahead: ReadAhead | None = None,
+        skip_unchanged: bool = False,
     ) -> None:
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, got {transport!r}.")
+        if list_page_size < 1:
+            raise ValueError(f"list_page_size must be >= 1, got {list_page_size}.")
+        if segment_size is not None and segment_size < 1:
+            raise ValueError(f"segment_size must be >= 1, got {segment_size}.")
+        if download_part_size is not None and download_part_size < 1:
+            raise ValueError(
+                f"download_part_size must be >= 1, got {download_part_size}."
+            )
+        if skip_unchanged and metadata_cache is None:
+            raise ValueError("skip_unchanged requires a metadata_cache.")
         super().__init__(read_only=read_only)
         self.container = container
         self.prefix = prefix.strip("/")
         self.storage_options = storage_options or {}
-        self.conn = Connection(**self.storage_options)
+        self.max_connections = max_connections
+        self.transport = transport
+        self.list_page_size = list_page_size
+        self.list_prefetch = list_prefetch
+        self.coalesce_gap = coalesce_gap
+        self.coalesce_max_size = coalesce_max_size
+        self.multirange = multirange
+        self.segment_size = segment_size
+        self.segment_container = segment_container or f"{container}_segments"
+        self.download_part_size = download_part_size
+        self.download_concurrency = download_concurrency
+        self.cache = cache
+        self.metadata_cache = metadata_cache
+        self.metadata_prefetch = metadata_prefetch
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics
+        self.concurrency = concurrency
+        self._limiters: dict[str, AdaptiveLimiter] | None = (
+            concurrency.limiters() if concurrency is not None else None
+        )
+        self.read_ahead = read_ahead
+        self._prefetcher: Prefetcher | None = (
+            read_ahead.prefetcher() if read_ahead is not None else None
+        )
+        self.skip_unchanged = skip_unchanged
+        self._skips = {"checked": 0, "skipped": 0, "bytes_skipped": 0}
+        self._balancer: EndpointBalancer | None = balancer_for(self.storage_options)
+        self._latency = LatencyWindow()
+        self._prefetched_at: float | None = None
+        self._prefetch_lock: asyncio.Lock | None = None
+        self._pool_instance: _ConnectionPool | None = _ConnectionPool(
+            self.storage_options, max_connections
+        )
+        self._aio_instance: AsyncConnection | None = None
+        self._info: dict[str, Any] | None = None
+        self._batch: _WriteBatch | None = None
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
     async def _open(self) -> None:
-        await self._ensure_container()
+        if not self.read_only:
+            await self._ensure_container()
         await super()._open()
 
+    def close(self) -> None:
+        super().close()
+        if self._pool_instance is not None:
+            self._pool_instance.close()
+        if self._aio_instance is not None:
+            self._aio_instance.close()
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+
     def with_read_only(self, read_only: bool = False) -> SwiftStore:
-        return type(self)(
+        store = type(self)(
             self.container,
             prefix=self.prefix,
             storage_options=self.storage_options,
             read_only=read_only,
+            max_connections=self.max_connections,
+            transport=self.transport,
+            list_page_size=self.list_page_size,
+            list_prefetch=self.list_prefetch,
+            coalesce_gap=self.coalesce_gap,
+            coalesce_max_size=self.coalesce_max_size,
+            multirange=self.multirange,
+            segment_size=self.segment_size,
+            segment_container=self.segment_container,
+            download_part_size=self.download_part_size,
+            download_concurrency=self.download_concurrency,
+            cache=self.cache,
+            metadata_cache=self.metadata_cache,
+            metadata_prefetch=self.metadata_prefetch,
+            retry=self.retry,
+            metrics=self.metrics,
+            concurrency=self.concurrency,
+            read_ahead=self.read_ahead,
+            skip_unchanged=self.skip_unchanged,
         )
+        store._pool_instance = self._pool  # share connections
+        store._aio_instance = self._aio_instance
+        store._limiters = self._limiters
+        store._balancer = self._balancer
+        return store
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    @property
+    def _pool(self) -> _ConnectionPool:
+        if self._pool_instance is None:
+            self._pool_instance = _ConnectionPool(
+                self.storage_options, self.max_connections
+            )
+        return self._pool_instance
+
+    @property
+    def conn(self) -> Connection:
+        """Connection owned by the calling thread (for synchronous helpers)."""
+        return self._pool.connection()
+
+    @property
+    def _aio(self) -> AsyncConnection:
+        if self._aio_instance is None:
+            from .aio import AsyncConnection
+
+            self._aio_instance = AsyncConnection(
+                **self.storage_options,
+                max_connections=self.max_connections,
+                token_provider=token_provider_for(self.storage_options),
+            )
+        return self._aio_instance
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a ``swiftclient.Connection`` method with the retry policy."""
+        policy = self.retry
+        hedge = (
+            method == "get_object"
+            and policy.hedge_quantile is not None
+            and "resp_chunk_size" not in kwargs  # a losing stream would stay open
+        )
+        attempt = 1
+        while True:
+            try:
+                if hedge:
+                    return await self._hedged(method, args, kwargs)
+                return await self._attempt(method, args, kwargs)
+            except Exception as exc:
+                if attempt >= policy.max_attempts or not policy.retryable(exc):
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retry()
+                await asyncio.sleep(policy.backoff(attempt, exc))
+            attempt += 1
+            args, kwargs = _fresh_bodies(args, kwargs)
+
+    async def _attempt(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """One attempt, within the concurrency limit of its request class."""
+        if self._limiters is None:
+            return await self._send(method, args, kwargs)
+        limiter = self._limiters[_REQUEST_CLASSES.get(method, "write")]
+        async with limiter:
+            started = time.monotonic()
+            try:
+                result = await self._send(method, args, kwargs)
+            except Exception as exc:
+                limiter.record(time.monotonic() - started, exc)
+                raise
+            limiter.record(time.monotonic() - started)
+            return result
+
+    async def _send(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """One request to one of the ``endpoints`` proxies, if several are set."""
+        balancer = self._balancer
+        if balancer is None:
+            return await self._transmit(method, args, kwargs)
+        endpoint = balancer.acquire()
+        token = current_endpoint.set(endpoint.url)
+        started = time.monotonic()
+        try:
+            result = await self._transmit(method, args, kwargs)
+        except BaseException as exc:
+            balancer.release(endpoint, time.monotonic() - started, exc)
+            raise
+        finally:
+            current_endpoint.reset(token)
+        balancer.release(endpoint, time.monotonic() - started)
+        return result
+
+    async def _transmit(
+        self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Any:
+        """One request on the configured transport, bounded by the policy timeout."""
+        if self.transport == "aiohttp":
+            request = getattr(self._aio, method)(*args, **kwargs)
+        else:
+            request = self._pool.call(method, *args, **kwargs)
+        if self.retry.timeout is not None:
+            request = asyncio.wait_for(request, self.retry.timeout)
+        metrics = self.metrics
+        if metrics is None:
+            return await request
+        started = metrics.start("request", method)
+        error = None
+        try:
+            return await request
+        except BaseException as exc:
+            error = _error_code(exc)
+            raise
+        finally:
+            metrics.finish("request", method, started, error=error)
+
+    async def _hedged(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Send a duplicate GET if the first is slower than the hedge quantile.
+
+        The first successful answer wins and the other request is cancelled.
+        """
+        policy = self.retry
+        start = time.monotonic()
+        tasks = [asyncio.ensure_future(self._attempt(method, args, kwargs))]
+        try:
+            if len(self._latency) >= policy.hedge_min_samples:
+                delay = self._latency.quantile(policy.hedge_quantile)
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    tasks.append(asyncio.ensure_future(self._attempt(method, args, kwargs)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (t for t in done if not t.cancelled() and t.exception() is None), None
+                )
+                if winner is not None:
+                    self._latency.add(time.monotonic() - start)
+                    return winner.result()
+            return tasks[0].result()  # every attempt failed: raise the first error
+        finally:
+            for task in tasks:
+                task.cancel()
 
     # ------------------------------------------------------------------
-    # Pickle support (Connection is not picklable)
+    # Pickle support (connections and threads are not picklable)
     # ------------------------------------------------------------------
 
     def __getstate__(self) -> dict[str, Any]:
         state = self.__dict__.copy()
-        del state["conn"]
+        state["_pool_instance"] = None
+        state["_aio_instance"] = None
+        state["_batch"] = None
+        state["_prefetch_lock"] = None
         return state
 
     def __setstate__(self, state: dict[str, Any]) -> None:
+        # the pool is rebuilt lazily on first use
         self.__dict__.update(state)
-        self.conn = Connection(**self.storage_options)
 
     # ------------------------------------------------------------------
     # Identity
@@ -136,14 +1105,65 @@ class SwiftStore(Store):
         return full_key
 
     async def _ensure_container(self) -> None:
-        """Create the Swift container if it does not already exist."""
-        def _check_or_create() -> None:
-            _, listings = self.conn.get_account()
-            names = {item["name"] for item in listings}
-            if self.container not in names:
-                self.conn.put_container(self.container)
+        """Create the Swift container(s) if they do not already exist.
+
+        One HEAD per container, followed by a PUT on 404. Containers found
+        or created are remembered per storage URL for the lifetime of the
+        process, so reopening a store costs no requests.
+        """
+        containers = [self.container]
+        if self.segment_size is not None:
+            containers.append(self.segment_container)
+        url = await self._storage_url()
+
+        async def _ensure(container: str) -> None:
+            if (url, container) in _known_containers:
+                return
+            try:
+                await self._call("head_container", container)
+            except ClientException as exc:
+                if exc.http_status != 404:
+                    raise
+                await self._call("put_container", container)
+            _known_containers.add((url, container))
+
+        await asyncio.gather(*(_ensure(container) for container in containers))
+
+    async def _with_container(self, func: Any, *args: Any) -> Any:
+        """Run a write, creating the container(s) first if Swift answers 404.
+
+        Covers stores that were never opened for writing, such as a
+        ``with_read_only(False)`` copy of a read-only store, and containers
+        deleted after they were memoized.
+        """
+        try:
+            return await func(*args)
+        except ClientException as exc:
+            if exc.http_status != 404:
+                raise
+        url = await self._storage_url()
+        _known_containers.discard((url, self.container))
+        _known_containers.discard((url, self.segment_container))
+        await self._ensure_container()
+        return await func(*args)
+
+    async def _storage_url(self) -> str:
+        """Storage URL of the account, authenticating if needed."""
+        if self.transport == "aiohttp":
+            aio = self._aio
+            if not aio.url:
+                await aio._ensure_auth()
+            return aio.url
+        return await self._pool.run(lambda conn: conn.url or conn.get_auth()[0])
 
-        await asyncio.to_thread(_check_or_create)
+    async def _capabilities(self) -> dict[str, Any]:
+        """Cluster capabilities from ``/info`` (empty if unavailable)."""
+        if self._info is None:
+            try:
+                self._info = await self._call("get_capabilities")
+            except ClientException:
+                self._info = {}
+        return self._info
 
     @staticmethod
     def _range_header(byte_range: ByteRequest) -> str:
@@ -159,6 +1179,7 @@ class SwiftStore(Store):
     # Core async store interface
     # ------------------------------------------------------------------
 
+    @_instrumented("get", received=_nbytes)
     async def get(
         self,
         key: str,
@@ -171,52 +1192,806 @@ class SwiftStore(Store):
         ):
             raise ValueError(f"Unexpected byte_range, got {byte_range}.")
 
-        headers = {"Range": self._range_header(byte_range)} if byte_range is not None else {}
+        if self._batch is not None and full_key in self._batch.pending:
+            data = self._batch.pending[full_key]
+            return prototype.buffer.from_bytes(_slice(data, byte_range))
 
-        def _fetch() -> bytes:
-            _, content = self.conn.get_object(
-                self.container, full_key, headers=headers or None
-            )
-            return content
+        known = await self._meta_lookup(full_key)
+        if known is not None and not known.exists:
+            return None
+        if known is not None and known.data is not None:
+            return prototype.buffer.from_bytes(_slice(known.data, byte_range))
+
+        if byte_range is None:
+            if self._prefetcher is not None:
+                content = await self._prefetcher.get(full_key, self._read_full)
+            else:
+                content = await self._read_full(full_key)
+            return None if content is None else prototype.buffer.from_bytes(content)
+
+        if self.cache is not None:
+            # only whole-object reads populate the cache
+            entry = await self._cached(full_key, fetch=False)
+            if entry is not None:
+                self._meta_record(full_key, len(entry.data), entry.etag, entry.data)
+                return prototype.buffer.from_bytes(_slice(entry.data, byte_range))
 
         try:
-            content = await asyncio.to_thread(_fetch)
-        except ClientException:
+            _, content = await self._call(
+                "get_object",
+                self.container,
+                full_key,
+                headers={"Range": self._range_header(byte_range)},
+            )
+        except ClientException as exc:
+            # anything but a missing key or range is an error, not a fill value
+            if exc.http_status == 404:
+                self._meta_record(full_key, None)
+            elif exc.http_status != 416:
+                raise
             return None
         return prototype.buffer.from_bytes(content)
 
+    async def _read_full(self, full_key: str) -> bytes | bytearray | None:
+        """Whole value of ``full_key``, through the chunk cache; ``None`` if missing."""
+        if self.cache is not None:
+            entry = await self._cached(full_key)
+            if entry is None:
+                self._meta_record(full_key, None)
+                return None
+            self._meta_record(full_key, len(entry.data), entry.etag, entry.data)
+            return entry.data
+        try:
+            headers, content = await self._get_full(full_key)
+        except ClientException as exc:
+            if exc.http_status == 404:
+                self._meta_record(full_key, None)
+                return None
+            raise
+        self._meta_record(full_key, len(content), headers.get("etag"), content)
+        return content
+
+    async def _get_full(self, full_key: str) -> tuple[dict[str, str], bytes | bytearray]:
+        """GET a whole object, in parallel parts if ``download_part_size`` is set."""
+        if self.download_part_size is not None:
+            return await self._get_parallel(full_key)
+        return await self._call("get_object", self.container, full_key)
+
+    @_instrumented_iter("stream", received=len)
+    async def stream(
+        self,
+        key: str,
+        byte_range: ByteRequest | None = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Yield the value of ``key`` (or a byte range of it) as it arrives.
+
+        Chunks are at most ``chunk_size`` bytes, so memory use does not
+        depend on the object's size. A download interrupted by a retryable
+        error resumes where it stopped, with a ranged GET conditional on the
+        object's ETag. An empty or unsatisfiable range yields nothing.
+
+        Raises
+        ------
+        FileNotFoundError
+            If ``key`` does not exist.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1, got {chunk_size}.")
+        full_key = self._full_key(key)
+        if byte_range is not None and not isinstance(
+            byte_range, (RangeByteRequest, OffsetByteRequest, SuffixByteRequest)
+        ):
+            raise ValueError(f"Unexpected byte_range, got {byte_range}.")
+
+        data = None
+        if self._batch is not None and full_key in self._batch.pending:
+            data = self._batch.pending[full_key]
+        else:
+            known = await self._meta_lookup(full_key)
+            if known is not None and not known.exists:
+                raise FileNotFoundError(key)
+            if known is not None:
+                data = known.data
+        if data is not None:
+            view = memoryview(_slice(data, byte_range))
+            for start in range(0, len(view), chunk_size):
+                yield bytes(view[start:start + chunk_size])
+            return
+
+        headers = {"Range": self._range_header(byte_range)} if byte_range else {}
+        span: tuple[int, int] | None = None  # absolute [start, stop) of the value
+        received = 0
+        attempt = 1
+        while True:
+            try:
+                rheaders, body = await self._call(
+                    "get_object",
+                    self.container,
+                    full_key,
+                    headers=headers,
+                    resp_chunk_size=chunk_size,
+                )
+            except ClientException as exc:
+                if exc.http_status == 404:
+                    self._meta_record(full_key, None)
+                    raise FileNotFoundError(key) from exc
+                if exc.http_status == 416:
+                    return
+                raise
+            if span is None:
+                span = _content_span(rheaders)
+            try:
+                async for chunk in self._iter_body(body):
+                    received += len(chunk)
+                    yield chunk
+                return
+            except Exception as exc:
+                if attempt >= self.retry.max_attempts or not self.retry.retryable(exc):
+                    raise
+                if self.metrics is not None:
+                    self.metrics.retry()
+                await asyncio.sleep(self.retry.backoff(attempt, exc))
+                attempt += 1
+            if span[0] + received >= span[1]:
+                return  # everything arrived before the error
+            # resume the same version of the object where it broke off
+            headers = {"Range": f"bytes={span[0] + received}-{span[1] - 1}"}
+            etag = rheaders.get("etag")
+            if etag:
+                headers["If-Match"] = etag
+
+    async def _iter_body(self, body: Any) -> AsyncIterator[bytes]:
+        """Chunks of a ``get_object(resp_chunk_size=...)`` body; closes it."""
+        if self.transport == "aiohttp":
+            async with contextlib.aclosing(body):
+                async for chunk in body:
+                    yield chunk
+            return
+        # swiftclient's body reads from the *latest* response of the connection
+        # that sent the GET, which other requests reuse in the meantime: read
+        # this response's own stream instead
+        raw, size = body.resp.raw, body.chunk_size
+        try:
+            while True:
+                chunk = await self._pool.run(lambda conn: raw.read(size))
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            body.close()
+
+    # ------------------------------------------------------------------
+    # Chunk cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, full_key: str) -> str:
+        return f"{self.container}/{full_key}"
+
+    async def _cache_io(self, func: Any, *args: Any) -> Any:
+        """Run a cache operation, off the event loop if it touches disk."""
+        assert self.cache is not None
+        if self.cache.directory is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def _cached(self, full_key: str, fetch: bool = True) -> CacheEntry | None:
+        """Return a valid cache entry for ``full_key``.
+
+        A hit is revalidated with a conditional GET when the cache asks for
+        it; a changed object is replaced by the body of that same request.
+        On a miss the object is downloaded and cached if ``fetch`` is true.
+        ``None`` means the object does not exist (or was not fetched).
+        """
+        cache = self.cache
+        assert cache is not None
+        cache_key = self._cache_key(full_key)
+        entry = await self._cache_io(cache.get, cache_key)
+        if entry is not None and cache.validate:
+            try:
+                headers, content = await self._call(
+                    "get_object", self.container, full_key, headers=entry.validators
+                )
+            except ClientException as exc:
+                if exc.http_status == 304:
+                    cache.record(hit=True)
+                    return entry
+                if exc.http_status == 404:
+                    await self._cache_io(cache.invalidate, cache_key)
+                    return None
+                raise
+        elif entry is not None:
+            cache.record(hit=True)
+            return entry
+        elif not fetch:
+            return None
+        else:
+            try:
+                headers, content = await self._get_full(full_key)
+            except ClientException as exc:
+                if exc.http_status == 404:
+                    cache.record(hit=False)
+                    return None
+                raise
+        cache.record(hit=False)
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        await self._cache_io(cache.put, cache_key, content, etag, last_modified)
+        return CacheEntry(content, etag, last_modified)
+
+    # ------------------------------------------------------------------
+    # Metadata cache
+    # ------------------------------------------------------------------
+
+    def _meta_record(
+        self,
+        full_key: str,
+        size: int | None,
+        etag: str | None = None,
+        data: bytes | bytearray | memoryview | None = None,
+    ) -> None:
+        """Record what a request revealed about ``full_key`` (``None``: missing)."""
+        if self.metadata_cache is None:
+            return
+        if data is not None:
+            # keep contents of metadata documents only
+            is_metadata = full_key.rsplit("/", 1)[-1] in METADATA_KEYS
+            data = bytes(data) if is_metadata else None
+        etag = etag.strip('"') if etag else None  # SLO ETags are quoted
+        self.metadata_cache.put(self._cache_key(full_key), size, etag, data)
+
+    def _meta_invalidate(self, full_key: str) -> None:
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(self._cache_key(full_key))
+
+    async def _meta_lookup(self, full_key: str) -> MetadataEntry | None:
+        """Cached metadata of ``full_key``, ``MISSING``, or ``None`` if unknown."""
+        cache = self.metadata_cache
+        if cache is None:
+            return None
+        entry = cache.get(self._cache_key(full_key))
+        if entry is None and self.metadata_prefetch and self._prefetch_due():
+            if self._prefetch_lock is None:
+                self._prefetch_lock = asyncio.Lock()
+            async with self._prefetch_lock:
+                if self._prefetch_due():  # not done meanwhile by another task
+                    self._prefetched_at = time.monotonic()
+                    with contextlib.suppress(ClientException):
+                        await self.prefetch_metadata()
+            entry = cache.get(self._cache_key(full_key))
+        return entry
+
+    def _prefetch_due(self) -> bool:
+        assert self.metadata_cache is not None
+        last = self._prefetched_at
+        return last is None or time.monotonic() - last >= self.metadata_cache.ttl
+
+    async def prefetch_metadata(self, prefix: str = "") -> None:
+        """Fill ``metadata_cache`` from a listing of the keys under ``prefix``.
+
+        The listing carries the size and ETag of every object, so it answers
+        ``exists`` and ``getsize`` for all of them. Until the cache's TTL
+        expires, keys under ``prefix`` that were not listed are known not
+        to exist.
+        """
+        cache = self.metadata_cache
+        if cache is None:
+            raise ValueError("prefetch_metadata() requires a metadata_cache.")
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        full_prefix = self._full_key(prefix)
+        entries = [
+            (self._cache_key(entry["name"]), int(entry["bytes"]), _listed_etag(entry))
+            async for entry in self._iter_container(full_prefix)
+            if entry.get("name")
+        ]
+        cache.put_listing(self._cache_key(full_prefix), entries)
+
+    async def _get_parallel(self, full_key: str) -> tuple[dict[str, str], bytes | bytearray]:
+        """Download an object as parallel ranged GETs into one buffer.
+
+        The first part doubles as the size probe: its ``Content-Range``
+        carries the object size, so objects that fit in one part cost a
+        single request. The remaining parts are fetched with ``If-Match``
+        on the first part's ETag so that a concurrent overwrite is detected
+        rather than stitched together.
+        """
+        step = self.download_part_size
+        try:
+            headers, first = await self._call(
+                "get_object",
+                self.container,
+                full_key,
+                headers={"Range": f"bytes=0-{step - 1}"},
+            )
+        except ClientException as exc:
+            if exc.http_status != 416:
+                raise
+            return exc.http_response_headers or {}, b""  # empty object
+        content_range = headers.get("content-range")
+        size = int(content_range.rsplit("/", 1)[1]) if content_range else len(first)
+        if size <= len(first):
+            return headers, first
+
+        out = bytearray(size)
+        view = memoryview(out)
+        view[:len(first)] = first
+        etag = headers.get("etag")
+        semaphore = asyncio.Semaphore(self.download_concurrency)
+
+        async def _fetch(start: int) -> None:
+            end = min(start + step, size)
+            part_headers = {"Range": f"bytes={start}-{end - 1}"}
+            if etag:
+                part_headers["If-Match"] = etag
+            async with semaphore:
+                _, content = await self._call(
+                    "get_object", self.container, full_key, headers=part_headers
+                )
+            view[start:start + len(content)] = content
+
+        try:
+            await asyncio.gather(*(_fetch(start) for start in range(len(first), size, step)))
+        except ClientException as exc:
+            if exc.http_status != 412:
+                raise
+            # object changed mid-download: fall back to a single GET
+            return await self._call("get_object", self.container, full_key)
+        return headers, out
+
+    @_instrumented("get_partial_values", received=lambda r: sum(map(_nbytes, r)))
     async def get_partial_values(
         self,
         prototype: BufferPrototype,
         key_ranges: Iterable[tuple[str, ByteRequest | None]],
     ) -> list[Buffer | None]:
-        return list(
-            await asyncio.gather(
-                *(self.get(key, prototype, byte_range) for key, byte_range in key_ranges)
+        """Fetch many byte ranges, coalescing nearby ranges of the same key.
+
+        ``RangeByteRequest`` ranges of one key are merged into spans (see
+        ``coalesce_gap`` and ``coalesce_max_size``), the spans are fetched
+        with as few (multi-range) GETs as possible and every result is
+        sliced back out of the span without copying. Other requests are
+        forwarded to ``get``.
+        """
+        key_ranges = list(key_ranges)
+        results: list[Buffer | None] = [None] * len(key_ranges)
+        by_key: dict[str, list[int]] = {}
+        singles: list[int] = []
+        for i, (key, byte_range) in enumerate(key_ranges):
+            if isinstance(byte_range, RangeByteRequest):
+                by_key.setdefault(key, []).append(i)
+            else:
+                singles.append(i)
+
+        async def _single(i: int) -> None:
+            key, byte_range = key_ranges[i]
+            results[i] = await self.get(key, prototype, byte_range)
+
+        async def _coalesced(key: str, indices: list[int]) -> None:
+            ranges = [key_ranges[i][1] for i in indices]
+            known = await self._meta_lookup(self._full_key(key))
+            if known is not None and not known.exists:
+                return
+            if known is not None and known.data is not None:
+                for i, r in zip(indices, ranges, strict=True):
+                    results[i] = prototype.buffer.from_bytes(known.data[r.start:r.end])
+                return
+            if self.cache is not None:
+                entry = await self._cached(self._full_key(key), fetch=False)
+                if entry is not None:
+                    for i, r in zip(indices, ranges, strict=True):
+                        results[i] = prototype.buffer.from_bytes(entry.data[r.start:r.end])
+                    return
+            spans = _coalesce(
+                ((r.start, r.end) for r in ranges),
+                self.coalesce_gap,
+                self.coalesce_max_size,
             )
+            parts = await self._get_spans(key, spans)
+            if parts is None:
+                return
+            for i, r in zip(indices, ranges, strict=True):
+                for offset, view in parts:
+                    if offset <= r.start < offset + len(view):
+                        results[i] = prototype.buffer.from_bytes(
+                            view[r.start - offset:r.end - offset]
+                        )
+                        break
+
+        await asyncio.gather(
+            *(_single(i) for i in singles),
+            *(_coalesced(key, indices) for key, indices in by_key.items()),
         )
+        return results
 
-    async def exists(self, key: str) -> bool:
+    async def _get_spans(
+        self, key: str, spans: list[tuple[int, int]]
+    ) -> list[tuple[int, memoryview]] | None:
+        """GET ``(start, end)`` spans of one object; ``None`` if it is missing."""
         full_key = self._full_key(key)
+        if self.multirange:
+            batches = [
+                spans[i:i + MAX_RANGES_PER_REQUEST]
+                for i in range(0, len(spans), MAX_RANGES_PER_REQUEST)
+            ]
+        else:
+            batches = [[span] for span in spans]
+
+        async def _fetch(batch: list[tuple[int, int]]) -> list[tuple[int, memoryview]]:
+            header = "bytes=" + ",".join(f"{start}-{end - 1}" for start, end in batch)
+            try:
+                headers, content = await self._call(
+                    "get_object", self.container, full_key, headers={"Range": header}
+                )
+            except ClientException as exc:
+                if exc.http_status == 416:
+                    return []  # every range starts past the end of the object
+                raise
+            return _parse_byteranges(headers, content)
+
         try:
-            await asyncio.to_thread(self.conn.head_object, self.container, full_key)
+            fetched = await asyncio.gather(*(_fetch(batch) for batch in batches))
+        except ClientException as exc:
+            if exc.http_status != 404:
+                raise
+            return None
+        return [part for parts in fetched for part in parts]
+
+    @_instrumented("exists")
+    async def exists(self, key: str) -> bool:
+        full_key = self._full_key(key)
+        if self._batch is not None and full_key in self._batch.pending:
             return True
-        except ClientException:
+        known = await self._meta_lookup(full_key)
+        if known is not None:
+            return known.exists
+        try:
+            headers = await self._call("head_object", self.container, full_key)
+        except ClientException as exc:
+            if exc.http_status != 404:
+                raise
+            self._meta_record(full_key, None)
             return False
+        self._meta_record(full_key, int(headers.get("content-length", 0)), headers.get("etag"))
+        return True
 
+    @_instrumented("set", sent=lambda args: len(args[1]))
     async def set(self, key: str, value: Buffer) -> None:
         self._check_writable()
         full_key = self._full_key(key)
-        data = value.to_bytes()
-        await asyncio.to_thread(self.conn.put_object, self.container, full_key, data)
+        # upload straight from the buffer's memory instead of to_bytes()
+        data = memoryview(value.as_numpy_array()).cast("B")
+        batch = self._batch
+        segmented = self.segment_size is not None and len(data) > self.segment_size
+        batched = batch is not None and len(data) < batch.max_bytes and not segmented
+        etag = digests = None
+        if self.skip_unchanged:
+            digests = await self._md5(data, self.segment_size if segmented else None)
+            etag = _slo_etag(digests) if segmented else digests[0]
+            if await self._unchanged(full_key, len(data), etag):
+                return
+        # segments of an SLO this write replaces, deleted once it succeeded;
+        # small writes only look for one where the metadata cache saw it
+        old_segments = []
+        if segmented or self._slo_known(full_key):
+            old_segments = await self._slo_segments(full_key)
+        if old_segments:
+            batched = False  # the segments must outlive the old manifest
+        if batched:
+            assert batch is not None
+            # copy: the caller may reuse its buffer before the batch is flushed
+            await batch.add(full_key, data.tobytes())
+        elif segmented:
+            await self._with_container(self._put_slo, full_key, data, digests)
+        else:
+            put = functools.partial(self._put_view, etag=digests[0] if digests else None)
+            etag = await self._with_container(put, self.container, full_key, data)
+        if self.cache is not None:
+            await self._cache_io(self.cache.invalidate, self._cache_key(full_key))
+        if self._prefetcher is not None:
+            self._prefetcher.discard(full_key)
+        self._meta_record(full_key, len(data), etag, data)
+        if old_segments:
+            await self._delete_segments(full_key, old_segments)
+
+    @contextlib.asynccontextmanager
+    async def batch_writes(
+        self,
+        max_bytes: int = DEFAULT_BATCH_MAX_BYTES,
+        max_items: int = DEFAULT_BATCH_MAX_ITEMS,
+    ) -> AsyncIterator[_WriteBatch]:
+        """Buffer ``set`` calls and upload them as tar archives.
+
+        Inside the block, values are collected until ``max_bytes`` or
+        ``max_items`` is reached and then uploaded with one PUT to Swift's
+        ``extract-archive`` bulk middleware; the remainder is flushed on
+        exit. Without the middleware the batch is uploaded with concurrent
+        single PUTs. Pending values are visible to ``get``, ``exists`` and
+        ``getsize`` of this store. Objects Swift fails to create are
+        reported in a ``SwiftBulkError`` raised by the ``set`` that
+        triggered the flush, or on exit.
+
+        >>> async with store.batch_writes(max_items=500):
+        ...     await zarr.api.asynchronous.save_array(store, data)
+        """
+        self._check_writable()
+        if self._batch is not None:
+            raise RuntimeError("batch_writes() is already active on this store.")
+        batch = self._batch = _WriteBatch(self, max_bytes, max_items)
+        try:
+            yield batch
+        finally:
+            self._batch = None
+            await batch.flush()
+
+    async def _md5(self, data: memoryview, part_size: int | None = None) -> list[str]:
+        """``_md5_parts`` of ``data``, in a worker thread unless ``data`` is small."""
+        if len(data) <= HASH_INLINE_MAX:
+            return _md5_parts(data, part_size)
+        # hashlib releases the GIL: concurrent writes hash in parallel
+        return await asyncio.to_thread(_md5_parts, data, part_size)
+
+    async def _unchanged(self, full_key: str, size: int, etag: str) -> bool:
+        """Whether the stored object is known to hold a value of this size and MD5."""
+        self._skips["checked"] += 1
+        entry = await self._meta_lookup(full_key)
+        if entry is None or entry.size != size or entry.etag != etag:
+            return False
+        self._skips["skipped"] += 1
+        self._skips["bytes_skipped"] += size
+        return True
+
+    async def _put_view(
+        self, container: str, name: str, view: memoryview, **kwargs: Any
+    ) -> str:
+        """PUT ``view`` with an explicit Content-Length and no extra copy."""
+        # aiohttp sends memoryviews natively; swiftclient wants a file-like
+        contents = view if self.transport == "aiohttp" else _BufferReader(view)
+        return await self._call(
+            "put_object", container, name, contents, content_length=len(view), **kwargs
+        )
+
+    async def _put_slo(
+        self, full_key: str, data: memoryview, digests: list[str] | None = None
+    ) -> None:
+        """Upload ``data`` as concurrently written segments plus an SLO manifest.
+
+        Segments are named like the ``swift`` CLI names them,
+        ``<key>/slo/<timestamp>/<size>/<segment_size>/<index>``, so that a
+        rewrite never clobbers the segments of the manifest it replaces.
+        ``digests``, the MD5s of the segments, are sent as their ETags.
+        """
+        size, step = len(data), self.segment_size
+        base = f"{full_key}/slo/{time.time():.6f}/{size}/{step}"
+
+        async def _put_segment(index: int) -> dict[str, Any]:
+            name = f"{base}/{index:08d}"
+            segment = data[index * step:(index + 1) * step]
+            etag = await self._put_view(
+                self.segment_container, name, segment,
+                etag=digests[index] if digests else None,
+            )
+            return {
+                "path": f"/{self.segment_container}/{name}",
+                "etag": etag,
+                "size_bytes": len(segment),
+            }
+
+        manifest = await asyncio.gather(
+            *(_put_segment(i) for i in range((size + step - 1) // step))
+        )
+        await self._call(
+            "put_object",
+            self.container,
+            full_key,
+            json.dumps(manifest),
+            query_string="multipart-manifest=put",
+        )
+
+    def _slo_known(self, full_key: str) -> bool | None:
+        """Whether ``full_key`` may be an SLO, as far as the metadata cache
+        knows without a request: ``False`` for objects that are missing or no
+        larger than ``segment_size``, ``None`` if it does not know.
+        """
+        if self.segment_size is None:
+            return False
+        if self.metadata_cache is None:
+            return None
+        entry = self.metadata_cache.get(self._cache_key(full_key))
+        if entry is None:
+            return None
+        return entry is not MISSING and entry.size > self.segment_size
+
+    async def _is_slo(self, full_key: str) -> bool:
+        """Whether ``full_key`` is stored as an SLO, from a HEAD unless the
+        metadata cache rules it out.
+        """
+        if self._slo_known(full_key) is False:
+            return False
+        try:
+            headers = await self._call("head_object", self.container, full_key)
+        except ClientException as exc:
+            if exc.http_status != 404:
+                raise
+            self._meta_record(full_key, None)
+            return False
+        self._meta_record(full_key, int(headers.get("content-length", 0)), headers.get("etag"))
+        return headers.get("x-static-large-object", "").lower() == "true"
+
+    async def _slo_segments(self, full_key: str) -> list[str]:
+        """Paths (``/<container>/<object>``) of the segments of the SLO
+        stored under ``full_key``; empty if it is not an SLO.
+        """
+        if not await self._is_slo(full_key):
+            return []
+        _, content = await self._call(
+            "get_object", self.container, full_key, query_string="multipart-manifest=get"
+        )
+        return [segment["name"] for segment in json.loads(content)]
+
+    async def _delete_segments(self, full_key: str, paths: list[str]) -> None:
+        """Delete the segments of a replaced SLO, as ``swift upload`` does
+        without ``--leave-segments``. The new value is stored already, so
+        failures are reported as a warning rather than raised.
+        """
+
+        async def _delete(path: str) -> None:
+            container, _, name = path.lstrip("/").partition("/")
+            try:
+                await self._call("delete_object", container, name)
+            except ClientException as exc:
+                if exc.http_status != 404:
+                    raise
+
+        results = await asyncio.gather(*map(_delete, paths), return_exceptions=True)
+        errors = [exc for exc in results if isinstance(exc, Exception)]
+        if errors:
+            warnings.warn(
+                f"Failed to delete {len(errors)} old segments of {full_key!r}: {errors[0]!r}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
 
+    @_instrumented("delete")
     async def delete(self, key: str) -> None:
         self._check_writable()
         full_key = self._full_key(key)
+        if self._batch is not None:
+            self._batch.discard(full_key)
+        if self.cache is not None:
+            await self._cache_io(self.cache.invalidate, self._cache_key(full_key))
+        if self._prefetcher is not None:
+            self._prefetcher.discard(full_key)
         try:
-            await asyncio.to_thread(self.conn.delete_object, self.container, full_key)
-        except ClientException:
-            pass  # idempotent — key may not exist
+            if await self._is_slo(full_key):
+                await self._delete_slo(full_key)
+            else:
+                await self._call("delete_object", self.container, full_key)
+        except ClientException as exc:
+            if exc.http_status != 404:  # idempotent — key may not exist
+                self._meta_invalidate(full_key)
+                raise
+        self._meta_record(full_key, None)
+
+    async def _delete_slo(self, full_key: str) -> None:
+        """Delete an SLO manifest and its segments.
+
+        Swift's SLO middleware answers ``multipart-manifest=delete`` with
+        200 and reports failures, such as "Not an SLO manifest" for an
+        ordinary object, in a bulk-delete style body.
+        """
+        _, content = await self._call(
+            "request",
+            "DELETE",
+            self.container,
+            full_key,
+            headers={"Accept": "application/json"},
+            query_string="multipart-manifest=delete",
+        )
+        result = json.loads(content) if content else {}
+        errors = result.get("Errors") or []
+        status = result.get("Response Status", "200 OK")
+        if errors or not status.startswith("2"):
+            reason = errors[0][1] if errors else status
+            code, _, reason = reason.partition(" ")
+            raise ClientException(
+                f"SLO delete of {full_key!r} failed: {errors or status}",
+                http_status=int(code) if code.isdigit() else None,
+                http_reason=reason,
+            )
+
+    @_instrumented("delete_dir")
+    async def delete_dir(self, prefix: str) -> None:
+        """Remove every key under ``prefix`` (``clear()`` uses ``prefix=""``).
+
+        Keys are deleted with Swift's bulk-delete middleware in batches of
+        the cluster's ``max_deletes_per_request``, up to
+        ``BULK_DELETE_CONCURRENCY`` batches at a time, as listing pages
+        arrive. Without the middleware the keys are deleted with single
+        DELETEs, ``max_connections`` at a time. With ``segment_size`` set,
+        the SLO segments under the prefix are removed as well.
+        """
+        self._check_writable()
+        if prefix != "" and not prefix.endswith("/"):
+            prefix += "/"
+        full_prefix = self._full_key(prefix)
+        if self._batch is not None:
+            self._batch.discard_prefix(full_prefix)
+        if self.cache is not None:
+            await self._cache_io(self.cache.invalidate_prefix, self._cache_key(full_prefix))
+        if self._prefetcher is not None:
+            self._prefetcher.discard_prefix(full_prefix)
+        info = await self._capabilities()
+        bulk = info.get("bulk_delete")
+        targets = [self.container]
+        if self.segment_size is not None:
+            targets.append(self.segment_container)
+
+        errors: list[tuple[str, str]] = []
+        for container in targets:
+            if bulk is not None:
+                limit = bulk.get("max_deletes_per_request", DEFAULT_MAX_DELETES_PER_REQUEST)
+                errors += await self._bulk_delete_prefix(container, full_prefix, limit)
+            else:
+                errors += await self._single_delete_prefix(container, full_prefix)
+        if self.metadata_cache is not None:
+            # a complete listing above the prefix now reports its keys as missing
+            self.metadata_cache.invalidate_prefix(self._cache_key(full_prefix))
+            if errors:
+                self.metadata_cache.clear()
+        if errors:
+            raise SwiftBulkError(f"Failed to delete {prefix!r}", errors)
+
+    async def _iter_names(self, container: str, full_prefix: str) -> AsyncIterator[str]:
+        async for entry in self._iter_container(full_prefix, container=container):
+            if entry.get("name"):
+                yield entry["name"]
+
+    async def _bulk_delete_prefix(
+        self, container: str, full_prefix: str, limit: int
+    ) -> list[tuple[str, str]]:
+        async def _bulk_delete(names: list[str]) -> list[tuple[str, str]]:
+            body = "\n".join(quote(f"/{container}/{name}") for name in names)
+            _, content = await self._call(
+                "post_account",
+                headers={"Content-Type": "text/plain", "Accept": "application/json"},
+                query_string="bulk-delete",
+                data=body.encode(),
+            )
+            result = json.loads(content)
+            errors = [(name, status) for name, status in result.get("Errors", [])]
+            status = result.get("Response Status", "200 OK")
+            if not errors and not status.startswith("2"):
+                errors = [(f"/{container}/{full_prefix}", status)]
+            return errors
+
+        async def _batches() -> AsyncIterator[list[str]]:
+            batch: list[str] = []
+            async for name in self._iter_names(container, full_prefix):
+                batch.append(name)
+                if len(batch) == limit:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        results = await _drain(_batches(), _bulk_delete, BULK_DELETE_CONCURRENCY)
+        return [error for errors in results for error in errors]
+
+    async def _single_delete_prefix(
+        self, container: str, full_prefix: str
+    ) -> list[tuple[str, str]]:
+        async def _delete(name: str) -> tuple[str, str] | None:
+            try:
+                await self._call("delete_object", container, name)
+            except ClientException as exc:
+                if exc.http_status != 404:
+                    return (f"/{container}/{name}", f"{exc.http_status} {exc.http_reason}")
+            return None
+
+        # one DELETE in flight per pooled connection
+        names = self._iter_names(container, full_prefix)
+        results = await _drain(names, _delete, self.max_connections)
+        return [error for error in results if error is not None]
 
     # ------------------------------------------------------------------
     # Listing
@@ -226,16 +2001,60 @@ class SwiftStore(Store):
         async for key in self.list_prefix(""):
             yield key
 
+    async def _iter_container(
+        self,
+        full_prefix: str,
+        delimiter: str | None = None,
+        container: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield container listing entries page by page using ``marker``.
+
+        A page shorter than ``list_page_size`` is the last one. With
+        ``list_prefetch`` the next page is requested before the current
+        page is handed to the consumer.
+        """
+        limit = self.list_page_size
+        container = container or self.container
+
+        def fetch(marker: str | None) -> asyncio.Future[Any]:
+            return asyncio.ensure_future(
+                self._call(
+                    "get_container",
+                    container,
+                    marker=marker,
+                    limit=limit,
+                    prefix=full_prefix,
+                    delimiter=delimiter,
+                )
+            )
+
+        pending: asyncio.Future[Any] | None = fetch(None)
+        try:
+            while pending is not None:
+                _, page = await pending
+                pending = None
+                if len(page) == limit:
+                    last = page[-1]
+                    marker = last.get("name") or last.get("subdir")
+                    if self.list_prefetch:
+                        pending = fetch(marker)
+                for entry in page:
+                    yield entry
+                if len(page) == limit and pending is None:
+                    pending = fetch(marker)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    @_instrumented_iter("list_prefix")
     async def list_prefix(self, prefix: str) -> AsyncIterator[str]:
         full_prefix = self._full_key(prefix)
-        _, contents = await asyncio.to_thread(
-            self.conn.get_container, self.container, prefix=full_prefix
-        )
-        for entry in contents:
+        async for entry in self._iter_container(full_prefix):
             name = entry.get("name", "")
             if name:
                 yield self._strip_prefix(name)
 
+    @_instrumented_iter("list_dir")
     async def list_dir(self, prefix: str) -> AsyncIterator[str]:
         if prefix:
             full_prefix = self._full_key(prefix.rstrip("/")) + "/"
@@ -244,13 +2063,7 @@ class SwiftStore(Store):
         else:
             full_prefix = ""
 
-        _, contents = await asyncio.to_thread(
-            self.conn.get_container,
-            self.container,
-            prefix=full_prefix,
-            delimiter="/",
-        )
-        for entry in contents:
+        async for entry in self._iter_container(full_prefix, delimiter="/"):
             # "name" → actual object at this level
             # "subdir" → virtual directory
             name = entry.get("name") or entry.get("subdir", "")
@@ -261,27 +2074,123 @@ class SwiftStore(Store):
                 yield relative
 
     # ------------------------------------------------------------------
-    # Efficient size queries using Swift HEAD
+    # Efficient size queries using Swift HEAD and listings
     # ------------------------------------------------------------------
 
+    @_instrumented("getsize")
     async def getsize(self, key: str) -> int:
         full_key = self._full_key(key)
+        if self._batch is not None and full_key in self._batch.pending:
+            return len(self._batch.pending[full_key])
+        known = await self._meta_lookup(full_key)
+        if known is not None:
+            if known.size is None:
+                raise FileNotFoundError(key)
+            return known.size
         try:
-            headers = await asyncio.to_thread(
-                self.conn.head_object, self.container, full_key
+            headers = await self._call(
+                "head_object", self.container, full_key
             )
-            return int(headers.get("content-length", 0))
-        except ClientException:
-            raise FileNotFoundError(key)
+        except ClientException as exc:
+            if exc.http_status != 404:
+                raise
+            self._meta_record(full_key, None)
+            raise FileNotFoundError(key) from exc
+        size = int(headers.get("content-length", 0))
+        self._meta_record(full_key, size, headers.get("etag"))
+        return size
+
+    @_instrumented("getsize_prefix")
+    async def getsize_prefix(self, prefix: str) -> int:
+        """Total size of the keys under ``prefix``, summed from listing pages.
+
+        Costs one request per ``list_page_size`` objects instead of one HEAD
+        per object.
+        """
+        full_prefix = self._full_key(prefix)
+        pending = self._batch.pending if self._batch is not None else {}
+        total = sum(len(v) for k, v in pending.items() if k.startswith(full_prefix))
+        async for entry in self._iter_container(full_prefix):
+            name = entry.get("name")
+            if name and name not in pending:
+                total += int(entry["bytes"])
+        return total
+
+    @_instrumented("getsize_many")
+    async def getsize_many(self, keys: Iterable[str]) -> list[int | None]:
+        """Sizes of many keys (``None`` for missing keys) from one listing.
+
+        The listing covers the longest common prefix of ``keys`` and stops
+        after the last of them, so this pays off when the keys are a large
+        share of the objects under that prefix (e.g. the chunks of one
+        array). The answers are recorded in the ``metadata_cache``.
+        """
+        keys = list(keys)
+        sizes = await self._listed_sizes([self._full_key(key) for key in keys])
+        return [sizes.get(self._full_key(key)) for key in keys]
+
+    async def exists_many(self, keys: Iterable[str]) -> list[bool]:
+        """Existence of many keys from one listing (see ``getsize_many``)."""
+        return [size is not None for size in await self.getsize_many(keys)]
+
+    async def _listed_sizes(self, full_keys: list[str]) -> dict[str, int]:
+        wanted = set(full_keys)
+        if not wanted:
+            return {}
+        pending = self._batch.pending if self._batch is not None else {}
+        sizes = {k: len(pending[k]) for k in wanted if k in pending}
+        last = max(wanted)
+        listing = self._iter_container(os.path.commonprefix(full_keys))
+        async with contextlib.aclosing(listing):
+            async for entry in listing:
+                name = entry.get("name")
+                if not name:
+                    continue
+                if name > last:  # listings are sorted
+                    break
+                if name in wanted and name not in sizes:
+                    sizes[name] = int(entry["bytes"])
+                    self._meta_record(name, sizes[name], _listed_etag(entry))
+        for full_key in wanted.difference(sizes):
+            self._meta_record(full_key, None)
+        return sizes
 
     # ------------------------------------------------------------------
     # Convenience
     # ------------------------------------------------------------------
 
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of ``metrics`` (if set), connection usage and caches.
+
+        >>> store.stats()["ops"]["get"]["latency"]["p99"]
+        """
+        snapshot = self.metrics.snapshot() if self.metrics is not None else {}
+        pool = self._pool_instance
+        snapshot["connections"] = {
+            "open": len(pool._connections) if pool is not None else 0,
+            "max": self.max_connections,
+        }
+        if self.cache is not None:
+            snapshot["cache"] = self.cache.stats()
+        if self.metadata_cache is not None:
+            snapshot["metadata_cache"] = self.metadata_cache.stats()
+        if self._limiters is not None:
+            snapshot["concurrency"] = {
+                name: limiter.stats() for name, limiter in self._limiters.items()
+            }
+        if self._prefetcher is not None:
+            snapshot["read_ahead"] = self._prefetcher.stats()
+        if self._balancer is not None:
+            snapshot["endpoints"] = self._balancer.stats()
+        if self.skip_unchanged:
+            snapshot["skip_unchanged"] = dict(self._skips)
+        return snapshot
+
     @property
     def url(self) -> str:
         """Public URL of the store root."""
-        parts = [self.conn.url, self.container]
+        aio = self._aio_instance
+        parts = [aio.url if aio is not None and aio.url else self._pool.url, self.container]
         if self.prefix:
             parts.append(self.prefix)
         return "/".join(parts)
@@ -0,0 +1,722 @@
+"""
+In-process stand-in for an OpenStack Swift proxy, for offline tests and
+benchmarks.
+
+``FakeSwift`` implements the subset of the Swift API that SwiftStore uses:
+TempAuth v1.0, account/container/object CRUD, ranged and multi-range GETs,
+paginated JSON listings, server-side COPY, the bulk-delete and
+extract-archive middlewares, Static Large Objects, ``/info`` and
+``/healthcheck``. Latency, bandwidth and error rates can be injected to
+emulate a busy cluster, and ``proxy()`` adds more proxies to it::
+
+    with FakeSwift(latency=0.005) as server:
+        store = await SwiftStore.open("demo", storage_options=server.auth_options)
+
+Objects are kept in memory; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import random
+import tarfile
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+from urllib.parse import SplitResult, parse_qs, quote, unquote, urlsplit
+
+ACCOUNT = "AUTH_test"
+USER = "test:tester"
+KEY = "testing"
+
+DEFAULT_LISTING_LIMIT = 10000
+MAX_DELETES_PER_REQUEST = 10000
+
+
+class _Object:
+    __slots__ = ("data", "etag", "last_modified", "content_type", "manifest")
+
+    def __init__(self, data: bytes, content_type: str = "application/octet-stream",
+                 manifest: list[dict[str, Any]] | None = None) -> None:
+        self.data = data
+        self.content_type = content_type
+        self.manifest = manifest
+        self.last_modified = time.time()
+        if manifest is None:
+            self.etag = hashlib.md5(data).hexdigest()
+        else:
+            joined = "".join(seg["etag"] for seg in manifest)
+            self.etag = hashlib.md5(joined.encode()).hexdigest()
+
+
+class _ListingLimitExceeded(Exception):
+    """Swift answers 412 when ``limit`` exceeds container_listing_limit."""
+
+
+class FakeSwift:
+    """A threaded fake Swift proxy listening on localhost.
+
+    Parameters
+    ----------
+    latency:
+        Seconds of delay added before every response.
+    bandwidth:
+        Bytes per second used to throttle response and request bodies,
+        or ``None`` for unlimited.
+    error_rate:
+        Probability that an object request fails with ``error_status``.
+    error_status:
+        HTTP status returned for injected errors.
+    max_in_flight:
+        Emulate a rate limit: object requests arriving while more than this
+        many requests are being served get a 429. ``None`` (default)
+        accepts any number.
+    listing_limit:
+        Maximum number of entries per container listing page.
+    token_ttl:
+        Lifetime of issued tokens in seconds.
+    bulk / slo:
+        Whether the bulk and SLO middlewares are enabled.
+    host / port:
+        Address to listen on (default: a free port on localhost).
+    containers:
+        Initial contents, shared with the caller (``{container: {name: object}}``).
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        bandwidth: float | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        max_in_flight: int | None = None,
+        listing_limit: int = DEFAULT_LISTING_LIMIT,
+        token_ttl: int = 86400,
+        bulk: bool = True,
+        slo: bool = True,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        containers: dict[str, dict[str, _Object]] | None = None,
+    ) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        self.listing_limit = listing_limit
+        self.token_ttl = token_ttl
+        self.bulk = bulk
+        self.slo = slo
+        self.containers: dict[str, dict[str, _Object]] = (
+            containers if containers is not None else {}
+        )
+        self.tokens: dict[str, float] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.lock = threading.RLock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> Self:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Connection details
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def authurl(self) -> str:
+        return f"{self.url}/auth/v1.0"
+
+    @property
+    def storage_url(self) -> str:
+        return f"{self.url}/v1/{ACCOUNT}"
+
+    def issue_token(self) -> str:
+        token = f"AUTH_tk{uuid.uuid4().hex}"
+        with self.lock:
+            self.tokens[token] = time.time() + self.token_ttl
+        return token
+
+    @property
+    def storage_options(self) -> dict[str, Any]:
+        """Pre-authenticated options for ``SwiftStore``."""
+        return {"preauthurl": self.storage_url, "preauthtoken": self.issue_token()}
+
+    @property
+    def auth_options(self) -> dict[str, Any]:
+        """TempAuth v1.0 credentials for ``SwiftStore``."""
+        return {"authurl": self.authurl, "user": USER, "key": KEY}
+
+    def count(self, method: str | None = None) -> int:
+        """Number of requests served so far, optionally for one method."""
+        with self.lock:
+            if method is None:
+                return len(self.requests)
+            return sum(1 for m, _ in self.requests if m == method)
+
+    def reset_counts(self) -> None:
+        with self.lock:
+            self.requests.clear()
+
+    def proxy(self, **kwargs: Any) -> FakeSwift:
+        """Another proxy of the same cluster, not started yet.
+
+        It serves the same containers and accepts the same tokens; keyword
+        arguments (latency, error injection, port) and request counts are
+        its own.
+        """
+        options = {"listing_limit": self.listing_limit, "token_ttl": self.token_ttl,
+                   "bulk": self.bulk, "slo": self.slo}
+        proxy = FakeSwift(**{**options, **kwargs}, containers=self.containers)
+        proxy.tokens = self.tokens
+        proxy.lock = self.lock
+        return proxy
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately; avoid delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    @property
+    def fake(self) -> FakeSwift:
+        return self.server.fake  # type: ignore[attr-defined]
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+
+    def _throttle(self, nbytes: int) -> None:
+        if self.fake.bandwidth:
+            time.sleep(nbytes / self.fake.bandwidth)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            data = self.rfile.read(length)
+        elif self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+            data = b"".join(parts)
+        else:
+            data = b""
+        self._throttle(len(data))
+        return data
+
+    def _send(self, status: int, body: bytes = b"", headers: dict[str, Any] | None = None,
+              head: bool = False) -> None:
+        self.send_response(status)
+        headers = dict(headers or {})
+        headers.setdefault("Content-Length", str(len(body)))
+        headers.setdefault("X-Trans-Id", uuid.uuid4().hex)
+        for name, value in headers.items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        if body and not head:
+            self._throttle(len(body))
+            self.wfile.write(body)
+
+    def _json(self, status: int, payload: Any, head: bool = False) -> None:
+        body = json.dumps(payload).encode()
+        self._send(status, body, {"Content-Type": "application/json; charset=utf-8"}, head)
+
+    def _dispatch(self, method: str) -> None:
+        fake = self.fake
+        split = urlsplit(self.path)
+        with fake.lock:
+            fake.requests.append((method, split.path))
+            fake.in_flight += 1
+        try:
+            self._route(method, split)
+        finally:
+            with fake.lock:
+                fake.in_flight -= 1
+
+    def _route(self, method: str, split: SplitResult) -> None:
+        fake = self.fake
+        query = {k: v[-1] for k, v in parse_qs(split.query, keep_blank_values=True).items()}
+        if fake.latency:
+            time.sleep(fake.latency)
+        body = self._body() if method in ("PUT", "POST") else b""
+
+        if split.path.startswith("/auth/"):
+            return self._auth()
+        if split.path.rstrip("/") == "/info":
+            return self._info(method == "HEAD")
+        if split.path.rstrip("/") == "/healthcheck":
+            return self._send(200, b"OK", {"Content-Type": "text/plain"}, method == "HEAD")
+
+        parts = split.path.split("/", 4)
+        if len(parts) < 3 or parts[1] != "v1" or parts[2] != ACCOUNT:
+            return self._send(404)
+        if not self._authorized():
+            return self._send(401)
+        container = unquote(parts[3]) if len(parts) > 3 and parts[3] else None
+        obj = unquote(parts[4]) if len(parts) > 4 and parts[4] else None
+
+        if container is None:
+            return self._account(method, query, body)
+        if obj is None:
+            return self._container(method, container, query, body)
+        if fake.error_rate and random.random() < fake.error_rate:
+            return self._send(fake.error_status)
+        if fake.max_in_flight is not None and fake.in_flight > fake.max_in_flight:
+            with fake.lock:
+                fake.rejected += 1
+            return self._send(429)
+        return self._object(method, container, obj, query, body)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_HEAD(self) -> None:
+        self._dispatch("HEAD")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_COPY(self) -> None:
+        self._dispatch("COPY")
+
+    # ------------------------------------------------------------------
+    # Auth and info
+    # ------------------------------------------------------------------
+
+    def _auth(self) -> None:
+        user = self.headers.get("X-Auth-User") or self.headers.get("X-Storage-User")
+        key = self.headers.get("X-Auth-Key") or self.headers.get("X-Storage-Pass")
+        if user != USER or key != KEY:
+            return self._send(401)
+        token = self.fake.issue_token()
+        self._send(200, headers={
+            "X-Storage-Url": self.fake.storage_url,
+            "X-Auth-Token": token,
+            "X-Storage-Token": token,
+            "X-Auth-Token-Expires": str(self.fake.token_ttl),
+        })
+
+    def _authorized(self) -> bool:
+        token = self.headers.get("X-Auth-Token")
+        with self.fake.lock:
+            expires = self.fake.tokens.get(token or "")
+        return expires is not None and expires > time.time()
+
+    def _info(self, head: bool) -> None:
+        info: dict[str, Any] = {"swift": {"version": "fake", "container_listing_limit":
+                                          self.fake.listing_limit}}
+        if self.fake.bulk:
+            info["bulk_delete"] = {"max_deletes_per_request": MAX_DELETES_PER_REQUEST,
+                                   "max_failed_deletes": 1000}
+            info["bulk_upload"] = {"max_containers_per_extraction": 10000,
+                                   "max_failed_extractions": 1000}
+        if self.fake.slo:
+            info["slo"] = {"max_manifest_segments": 1000, "min_segment_size": 1}
+        self._json(200, info, head)
+
+    # ------------------------------------------------------------------
+    # Account
+    # ------------------------------------------------------------------
+
+    def _account(self, method: str, query: dict[str, str], body: bytes) -> None:
+        fake = self.fake
+        if method == "POST" and "bulk-delete" in query:
+            if not fake.bulk:
+                return self._send(204)
+            return self._bulk_delete(body)
+        if method in ("GET", "HEAD"):
+            with fake.lock:
+                names = sorted(fake.containers)
+            entries = [{"name": n, "count": len(fake.containers.get(n, {})), "bytes": 0}
+                       for n in names]
+            try:
+                entries = self._paginate(entries, query)
+            except _ListingLimitExceeded:
+                return self._send(412)
+            return self._json(200, entries, method == "HEAD")
+        if method == "POST":
+            return self._send(204)
+        self._send(405)
+
+    def _bulk_delete(self, body: bytes) -> None:
+        fake = self.fake
+        names = [unquote(line.strip()) for line in body.decode().splitlines() if line.strip()]
+        if len(names) > MAX_DELETES_PER_REQUEST:
+            return self._send(413)
+        deleted = not_found = 0
+        errors = []
+        with fake.lock:
+            for name in names:
+                container, _, obj = name.lstrip("/").partition("/")
+                objects = fake.containers.get(container)
+                if objects is None:
+                    not_found += 1
+                elif not obj:
+                    if objects:
+                        errors.append([quote(name), "409 Conflict"])
+                    else:
+                        del fake.containers[container]
+                        deleted += 1
+                elif obj in objects:
+                    del objects[obj]
+                    deleted += 1
+                else:
+                    not_found += 1
+        self._json(200, {
+            "Number Deleted": deleted,
+            "Number Not Found": not_found,
+            "Response Status": "400 Bad Request" if errors else "200 OK",
+            "Response Body": "",
+            "Errors": errors,
+        })
+
+    # ------------------------------------------------------------------
+    # Container
+    # ------------------------------------------------------------------
+
+    def _container(self, method: str, container: str, query: dict[str, str],
+                   body: bytes) -> None:
+        fake = self.fake
+        if method == "PUT" and "extract-archive" in query:
+            return self._extract_archive(container, "", body)
+        with fake.lock:
+            exists = container in fake.containers
+            if method == "PUT":
+                fake.containers.setdefault(container, {})
+                return self._send(202 if exists else 201)
+            if not exists:
+                return self._send(404)
+            objects = fake.containers[container]
+            if method == "DELETE":
+                if objects:
+                    return self._send(409)
+                del fake.containers[container]
+                return self._send(204)
+            if method == "POST":
+                return self._send(204)
+            snapshot = sorted(objects.items())
+        if method not in ("GET", "HEAD"):
+            return self._send(405)
+
+        prefix = query.get("prefix", "")
+        delimiter = query.get("delimiter", "")
+        entries: list[dict[str, Any]] = []
+        seen_subdirs: set[str] = set()
+        for name, item in snapshot:
+            if not name.startswith(prefix):
+                continue
+            if delimiter:
+                idx = name.find(delimiter, len(prefix))
+                if idx >= 0:
+                    subdir = name[: idx + len(delimiter)]
+                    if subdir not in seen_subdirs:
+                        seen_subdirs.add(subdir)
+                        entries.append({"subdir": subdir})
+                    continue
+            entries.append({
+                "name": name,
+                "bytes": self._size(item),
+                "hash": item.etag,
+                "last_modified": time.strftime(
+                    "%Y-%m-%dT%H:%M:%S.000000", time.gmtime(item.last_modified)),
+                "content_type": item.content_type,
+            })
+            if item.manifest is not None:
+                entries[-1]["slo_etag"] = f'"{item.etag}"'
+        try:
+            entries = self._paginate(entries, query)
+        except _ListingLimitExceeded:
+            return self._send(412)
+        headers = {"X-Container-Object-Count": len(snapshot)}
+        body_out = json.dumps(entries).encode()
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        self._send(200, body_out, headers, method == "HEAD")
+
+    def _paginate(self, entries: list[dict[str, Any]], query: dict[str, str]
+                  ) -> list[dict[str, Any]]:
+        def key(entry: dict[str, Any]) -> str:
+            return entry.get("name") or entry.get("subdir", "")
+
+        marker = query.get("marker")
+        if marker:
+            entries = [e for e in entries if key(e) > marker]
+        end_marker = query.get("end_marker")
+        if end_marker:
+            entries = [e for e in entries if key(e) < end_marker]
+        limit = int(query.get("limit") or self.fake.listing_limit)
+        if limit > self.fake.listing_limit:
+            raise _ListingLimitExceeded
+        return entries[:limit]
+
+    def _extract_archive(self, container: str, base: str, body: bytes) -> None:
+        fake = self.fake
+        if not fake.bulk:
+            return self._send(201)
+        created = 0
+        errors = []
+        with tarfile.open(fileobj=io.BytesIO(body), mode="r:*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                data = tar.extractfile(member).read()  # type: ignore[union-attr]
+                name = f"{base}/{member.name}" if base else member.name
+                with fake.lock:
+                    objects = fake.containers.get(container)
+                    if objects is None:
+                        errors.append([quote(f"/{container}/{name}"), "404 Not Found"])
+                        continue
+                    objects[name] = _Object(data)
+                created += 1
+        self._json(200, {
+            "Number Files Created": created,
+            "Response Status": "400 Bad Request" if errors else "201 Created",
+            "Response Body": "",
+            "Errors": errors,
+        })
+
+    # ------------------------------------------------------------------
+    # Object
+    # ------------------------------------------------------------------
+
+    def _size(self, item: _Object) -> int:
+        if item.manifest is None:
+            return len(item.data)
+        return sum(seg["size_bytes"] for seg in item.manifest)
+
+    def _content(self, item: _Object) -> bytes | None:
+        if item.manifest is None:
+            return item.data
+        parts = []
+        with self.fake.lock:
+            for seg in item.manifest:
+                container, _, obj = seg["name"].lstrip("/").partition("/")
+                segment = self.fake.containers.get(container, {}).get(obj)
+                if segment is None:
+                    return None
+                parts.append(segment.data)
+        return b"".join(parts)
+
+    def _object_headers(self, item: _Object) -> dict[str, Any]:
+        headers = {
+            "Content-Type": item.content_type,
+            "Etag": f'"{item.etag}"' if item.manifest is not None else item.etag,
+            "Last-Modified": formatdate(item.last_modified, usegmt=True),
+            "Accept-Ranges": "bytes",
+        }
+        if item.manifest is not None:
+            headers["X-Static-Large-Object"] = "True"
+        return headers
+
+    def _object(self, method: str, container: str, obj: str, query: dict[str, str],
+                body: bytes) -> None:
+        fake = self.fake
+        with fake.lock:
+            objects = fake.containers.get(container)
+        if objects is None:
+            return self._send(404)
+
+        if method == "PUT" and "extract-archive" in query:
+            return self._extract_archive(container, obj, body)
+
+        if method == "PUT":
+            copy_from = self.headers.get("X-Copy-From")
+            if copy_from:
+                return self._copy(unquote(copy_from), f"/{container}/{obj}")
+            if "multipart-manifest" in query and query["multipart-manifest"] == "put":
+                if not fake.slo:
+                    return self._send(400)
+                return self._put_manifest(objects, obj, body)
+            etag = self.headers.get("ETag")
+            item = _Object(body, self.headers.get("Content-Type") or "application/octet-stream")
+            if etag and etag.strip('"') != item.etag:
+                return self._send(422)
+            with fake.lock:
+                objects[obj] = item
+            return self._send(201, headers={"Etag": item.etag})
+
+        if method == "COPY":
+            destination = self.headers.get("Destination", "")
+            dest_account = self.headers.get("Destination-Account")
+            if dest_account and dest_account != ACCOUNT:
+                return self._send(404)
+            return self._copy(f"/{container}/{obj}", "/" + unquote(destination).lstrip("/"))
+
+        if method == "DELETE" and fake.slo and query.get("multipart-manifest") == "delete":
+            return self._delete_manifest(objects, container, obj)
+
+        with fake.lock:
+            item = objects.get(obj)
+        if item is None:
+            return self._send(404)
+
+        if method == "DELETE":
+            with fake.lock:
+                objects.pop(obj, None)
+            return self._send(204)
+
+        if method == "POST":
+            return self._send(202)
+
+        headers = self._object_headers(item)
+        if_match = self.headers.get("If-Match")
+        if if_match and if_match.strip('"') not in (item.etag, "*"):
+            return self._send(412)
+        inm = self.headers.get("If-None-Match")
+        if inm and inm.strip('"') == item.etag:
+            return self._send(304, headers=headers)
+
+        if query.get("multipart-manifest") == "get" and item.manifest is not None:
+            return self._json(200, item.manifest, method == "HEAD")
+
+        if method == "HEAD":
+            headers["Content-Length"] = self._size(item)
+            return self._send(200, headers=headers, head=True)
+
+        data = self._content(item)
+        if data is None:
+            return self._send(409)
+        range_header = self.headers.get("Range")
+        if not range_header:
+            return self._send(200, data, headers)
+        return self._ranged(data, range_header, headers)
+
+    def _delete_manifest(self, objects: dict[str, _Object], container: str, obj: str) -> None:
+        """``multipart-manifest=delete``: like Swift's SLO middleware, answer
+        200 and report the outcome in a bulk-delete body, leaving anything
+        but an SLO manifest in place.
+        """
+        fake = self.fake
+        deleted = not_found = 0
+        errors = []
+        with fake.lock:
+            item = objects.get(obj)
+            if item is None:
+                not_found += 1
+            elif item.manifest is None:
+                errors.append([quote(f"/{container}/{obj}"), "400 Not an SLO manifest"])
+            else:
+                for seg in item.manifest:
+                    seg_container, _, seg_obj = seg["name"].lstrip("/").partition("/")
+                    if fake.containers.get(seg_container, {}).pop(seg_obj, None) is None:
+                        not_found += 1
+                    else:
+                        deleted += 1
+                del objects[obj]
+                deleted += 1
+        self._json(200, {
+            "Number Deleted": deleted,
+            "Number Not Found": not_found,
+            "Response Status": "400 Bad Request" if errors else "200 OK",
+            "Response Body": "",
+            "Errors": errors,
+        })
+
+    def _ranged(self, data: bytes, range_header: str, headers: dict[str, Any]) -> None:
+        size = len(data)
+        spans = []
+        for spec in range_header.split("=", 1)[1].split(","):
+            first, _, last = spec.strip().partition("-")
+            if first == "":
+                start, stop = max(size - int(last), 0), size
+            else:
+                start = int(first)
+                stop = min(int(last) + 1, size) if last else size
+            if start < stop:
+                spans.append((start, stop))
+        if not spans:
+            headers["Content-Range"] = f"bytes */{size}"
+            return self._send(416, headers=headers)
+        if len(spans) == 1:
+            start, stop = spans[0]
+            headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+            return self._send(206, data[start:stop], headers)
+        boundary = uuid.uuid4().hex
+        out = io.BytesIO()
+        for start, stop in spans:
+            out.write(f"--{boundary}\r\n".encode())
+            out.write(f"Content-Type: {headers['Content-Type']}\r\n".encode())
+            out.write(f"Content-Range: bytes {start}-{stop - 1}/{size}\r\n\r\n".encode())
+            out.write(data[start:stop])
+            out.write(b"\r\n")
+        out.write(f"--{boundary}--\r\n".encode())
+        headers["Content-Type"] = f"multipart/byteranges; boundary={boundary}"
+        self._send(206, out.getvalue(), headers)
+
+    def _put_manifest(self, objects: dict[str, _Object], obj: str, body: bytes) -> None:
+        fake = self.fake
+        manifest = []
+        for seg in json.loads(body):
+            path = seg["path"]
+            container, _, name = path.lstrip("/").partition("/")
+            with fake.lock:
+                segment = fake.containers.get(container, {}).get(name)
+            if segment is None:
+                return self._send(400, f"{path} 404 Not Found".encode())
+            if seg.get("etag") and seg["etag"] != segment.etag:
+                return self._send(400, f"{path} Etag Mismatch".encode())
+            manifest.append({"name": path, "etag": segment.etag,
+                             "size_bytes": len(segment.data)})
+        item = _Object(b"", manifest=manifest)
+        with fake.lock:
+            objects[obj] = item
+        self._send(201, headers={"Etag": f'"{item.etag}"'})
+
+    def _copy(self, source: str, destination: str) -> None:
+        fake = self.fake
+        src_container, _, src_obj = source.lstrip("/").partition("/")
+        dst_container, _, dst_obj = destination.lstrip("/").partition("/")
+        with fake.lock:
+            item = fake.containers.get(src_container, {}).get(src_obj)
+            target = fake.containers.get(dst_container)
+            if item is None or target is None:
+                return self._send(404)
+            data = self._content(item)
+            if data is None:
+                return self._send(409)
+            target[dst_obj] = _Object(data, item.content_type)
+        self._send(201, headers={"Etag": target[dst_obj].etag})
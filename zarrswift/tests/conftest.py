@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from .. import storage
+from ..testing import FakeSwift
+
+
+@pytest.fixture(scope="module")
+def fake() -> Iterator[FakeSwift]:
+    with FakeSwift() as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def known_containers(monkeypatch: pytest.MonkeyPatch) -> None:
+    # servers on reused ports must not inherit memoized containers
+    monkeypatch.setattr(storage, "_known_containers", set())
@@ -0,0 +1,141 @@
+import pickle
+import time
+
+from ..cache import MISSING, ChunkCache, MetadataCache
+
+
+def test_memory_lru_eviction():
+    cache = ChunkCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a").data == b"1234"  # "a" is now most recent
+    cache.put("c", b"90")
+    cache.put("d", b"xy")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions == 1
+    assert cache.stats()["memory_bytes"] == 8
+
+    cache.put("huge", b"x" * 11)  # larger than the memory tier
+    assert cache.get("huge") is None
+
+
+def test_validators():
+    cache = ChunkCache()
+    cache.put("a", b"1", etag="abc", last_modified="Thu, 01 Jan 2026 00:00:00 GMT")
+    assert cache.get("a").validators == {
+        "If-None-Match": "abc",
+        "If-Modified-Since": "Thu, 01 Jan 2026 00:00:00 GMT",
+    }
+    cache.put("b", b"2")
+    assert cache.get("b").validators == {}
+
+
+def test_disk_tier_persists_and_is_mmapped(tmp_path):
+    cache = ChunkCache(max_bytes=0, directory=tmp_path)
+    cache.put("c/a", b"hello", etag="e1")
+    cache.put("c/empty", b"")
+    entry = cache.get("c/a")
+    assert isinstance(entry.data, memoryview)
+    assert bytes(entry.data) == b"hello"
+    assert entry.etag == "e1"
+
+    reopened = ChunkCache(directory=tmp_path)
+    assert bytes(reopened.get("c/a").data) == b"hello"
+    assert reopened.get("c/empty").data == b""
+    assert reopened.stats()["disk_bytes"] == 5
+
+
+def test_disk_tier_eviction(tmp_path):
+    cache = ChunkCache(max_bytes=0, directory=tmp_path, max_disk_bytes=8)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    cache.get("a")
+    cache.put("c", b"90")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions == 1
+    assert len(list(tmp_path.iterdir())) == 4  # .bin + .json per entry
+
+
+def test_invalidate(tmp_path):
+    cache = ChunkCache(directory=tmp_path)
+    for key in ("c/p/a", "c/p/b", "c/q/a"):
+        cache.put(key, b"x")
+    cache.invalidate("c/p/a")
+    assert cache.get("c/p/a") is None
+    cache.invalidate_prefix("c/p/")
+    assert cache.get("c/p/b") is None
+    assert cache.get("c/q/a") is not None
+    cache.clear()
+    assert cache.stats()["disk_entries"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_counters_and_pickle(tmp_path):
+    cache = ChunkCache(max_bytes=100, directory=tmp_path, validate=False)
+    cache.put("a", b"1")
+    cache.record(hit=True)
+    cache.record(hit=False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.validate is False
+    assert clone.max_bytes == 100
+    assert clone.hits == 0
+    assert clone.get("a").data == b"1"  # warm from the disk tier
+
+
+def test_metadata_ttl_and_negative_entries():
+    cache = MetadataCache(ttl=60)
+    cache.put("c/a", 3, "e1", b"{}")
+    cache.put_missing("c/b")
+    assert cache.get("c/a").size == 3
+    assert cache.get("c/a").data == b"{}"
+    assert cache.get("c/b") is MISSING
+    assert cache.get("c/x") is None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    expired = MetadataCache(ttl=0.01)
+    expired.put("c/a", 3)
+    time.sleep(0.02)
+    assert expired.get("c/a") is None
+
+
+def test_metadata_listing():
+    cache = MetadataCache()
+    cache.put("c/p/zarr.json", 2, "e1", b"{}")
+    cache.put_listing("c/p/", [("c/p/zarr.json", 2, "e1"), ("c/p/c/0", 5, "e2")])
+    assert cache.get("c/p/zarr.json").data == b"{}"  # same ETag keeps contents
+    assert cache.get("c/p/c/0").size == 5
+    assert cache.get("c/p/c/1") is MISSING
+    assert cache.get("c/q/c/1") is None
+    assert cache.covers("c/p/c/")
+
+    cache.invalidate_prefix("c/p/c/")
+    assert cache.get("c/p/c/0") is MISSING  # deleted under a complete listing
+    cache.invalidate_prefix("c/p/")
+    assert cache.get("c/p/c/0") is None
+
+    # an invalidated key is unknown, not missing, under a listing
+    cache.put_listing("c/r/", [("c/r/c/0", 5, "e3")])
+    cache.invalidate("c/r/c/0")
+    cache.invalidate("c/r/c/1")
+    assert cache.get("c/r/c/0") is None and cache.get("c/r/c/1") is None
+    assert cache.get("c/r/c/2") is MISSING
+    cache.put("c/r/c/1", 4)
+    assert cache.get("c/r/c/1").size == 4
+
+
+def test_metadata_eviction_drops_listings():
+    cache = MetadataCache(max_entries=2)
+    cache.put_listing("c/", [("c/a", 1, None), ("c/b", 1, None)])
+    assert cache.covers("c/")
+    cache.put("c/z", 1)
+    assert cache.get("c/a") is None  # evicted, and no longer known missing
+    assert not cache.covers("c/")
+
+    too_many = MetadataCache(max_entries=1)
+    too_many.put_listing("c/", [("c/a", 1, None), ("c/b", 1, None)])
+    assert not too_many.covers("c/")
+    assert pickle.loads(pickle.dumps(too_many)).max_entries == 1
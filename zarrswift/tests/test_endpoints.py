@@ -0,0 +1,109 @@
+import asyncio
+import pickle
+import time
+
+import pytest
+from swiftclient.exceptions import ClientException
+from zarr.core.buffer import cpu, default_buffer_prototype
+
+from .. import SwiftStore, storage
+from ..endpoints import Endpoints, rebase
+from ..retry import RetryPolicy
+from ..testing import FakeSwift
+
+
+def test_rebase():
+    url = "https://swift.example.org/v1/AUTH_test"
+    assert rebase(url, "http://10.0.0.2:8080") == "http://10.0.0.2:8080/v1/AUTH_test"
+    assert rebase(url, None) == url
+    with pytest.raises(ValueError):
+        Endpoints(())
+    with pytest.raises(ValueError):
+        Endpoints(("http://a",), strategy="random")
+
+
+def test_balancer_spreads_and_ejects():
+    balancer = Endpoints(("http://a", "http://b/", "http://c"), max_failures=2).balancer()
+    held = [balancer.acquire() for _ in range(6)]
+    assert sorted(e.url for e in held) == ["http://a"] * 2 + ["http://b"] * 2 + ["http://c"] * 2
+    for endpoint in held:
+        balancer.release(endpoint, 0.01)
+
+    a = balancer.endpoints[0]
+    balancer.release(balancer.acquire(), 0.01, ClientException("not found", http_status=404))
+    for _ in range(2):
+        a.in_flight += 1
+        balancer.release(a, 0.01, ConnectionRefusedError())
+    assert not a.healthy and a.ejections == 1
+    held = [balancer.acquire() for _ in range(10)]
+    assert {e.url for e in held} == {"http://b", "http://c"}
+    # the last proxy standing is never ejected
+    for endpoint in held:
+        balancer.release(endpoint, 0.01, ClientException("down", http_status=503))
+    stats = balancer.stats()
+    assert [s["healthy"] for s in stats].count(True) == 1
+    assert sum(s["ejections"] for s in stats) == 2
+    assert pickle.loads(pickle.dumps(balancer)).stats()[0]["requests"] == 0
+
+
+def test_balancer_slow_and_probation():
+    balancer = Endpoints(
+        ("http://a", "http://b", "http://c"),
+        strategy="round_robin",
+        slow_factor=3,
+        min_samples=5,
+        eject_time=0.01,
+        health_check=None,
+    ).balancer()
+    for _ in range(10):
+        for endpoint in balancer.endpoints:
+            balancer.acquire()
+            balancer.release(endpoint, 0.5 if endpoint.url == "http://c" else 0.01)
+    slow = balancer.endpoints[2]
+    assert not slow.healthy
+    time.sleep(0.02)
+    assert "http://c" in {balancer.acquire().url for _ in range(3)}
+    assert slow.healthy  # readmitted on probation: one more failure ejects it
+    balancer.release(slow, 0.01, ConnectionResetError())
+    assert not slow.healthy and slow.ejections == 2
+
+
+@pytest.mark.parametrize("transport", storage.TRANSPORTS)
+async def test_store_endpoints(transport):
+    if transport == "aiohttp":
+        pytest.importorskip("aiohttp")
+    with FakeSwift() as server:
+        dead = server.proxy().start()
+        dead.stop()  # nothing listens there any more
+        with server.proxy() as good, server.proxy(error_rate=1.0) as flaky:
+            endpoints = Endpoints(
+                (server.url, good.url, flaky.url, dead.url), max_failures=2, eject_time=0.2
+            )
+            store = await SwiftStore.open(
+                "balanced",
+                storage_options={**server.auth_options, "endpoints": endpoints},
+                transport=transport,
+                retry=RetryPolicy(max_attempts=10, backoff_base=0.001),
+            )
+            for i in range(30):
+                await store.set(f"c/{i}", cpu.Buffer.from_bytes(b"%d" % i))
+            stats = {s["url"]: s for s in store.stats()["endpoints"]}
+            assert stats[flaky.url]["ejections"] >= 1 and stats[dead.url]["ejections"] >= 1
+            assert stats[server.url]["ejections"] == stats[good.url]["ejections"] == 0
+            assert server.count("PUT") > 5 and good.count("PUT") > 5
+
+            # the proxy recovers: its health check readmits it
+            flaky.error_rate = 0.0
+            await asyncio.sleep(0.3)
+            proto = default_buffer_prototype()
+            deadline = time.monotonic() + 5
+            while not {s["url"]: s for s in store.stats()["endpoints"]}[flaky.url]["healthy"]:
+                assert time.monotonic() < deadline
+                await store.exists("c/0")
+                await asyncio.sleep(0.01)
+            assert flaky.count("GET") >= 1  # the health check
+            flaky.reset_counts()
+            for i in range(30):
+                assert (await store.get(f"c/{i}", proto)).to_bytes() == b"%d" % i
+            assert flaky.count("GET") > 5
+            store.close()
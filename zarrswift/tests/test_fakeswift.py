@@ -0,0 +1,193 @@
+"""
+Offline tests: the integration suite of ``test_storage`` against the
+in-process ``FakeSwift`` server, plus checks of the fake itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from typing import Any
+
+import pytest
+import requests
+from swiftclient import Connection
+from swiftclient.exceptions import ClientException
+from zarr.core.buffer import Buffer, cpu
+
+from .. import SwiftStore
+from ..retry import RetryPolicy
+from ..testing import FakeSwift
+from .test_storage import SwiftStoreTests
+
+
+@pytest.fixture(scope="module")
+def flaky_fake():
+    with FakeSwift(listing_limit=7, error_rate=0.1) as server:
+        yield server
+
+
+class TestFakeSwiftStore(SwiftStoreTests):
+    @pytest.fixture
+    def store_kwargs(self, fake: FakeSwift) -> dict[str, Any]:
+        return {
+            "container": "test_swiftstore",
+            "prefix": "test_zarr",
+            "storage_options": fake.auth_options,
+            "list_page_size": 5,
+        }
+
+
+class TestFakeSwiftStoreAiohttp(TestFakeSwiftStore):
+    @pytest.fixture
+    def store_kwargs(self, fake: FakeSwift) -> dict[str, Any]:
+        pytest.importorskip("aiohttp")
+        return {
+            "container": "test_swiftstore",
+            "prefix": "test_zarr_aio",
+            "storage_options": fake.auth_options,
+            "transport": "aiohttp",
+            "list_page_size": 3,
+        }
+
+
+class TestFakeSwiftStoreFlaky(TestFakeSwiftStore):
+    """One in ten object requests fails with a 503 and must be retried."""
+
+    @pytest.fixture
+    def store_kwargs(self, flaky_fake: FakeSwift) -> dict[str, Any]:
+        return {
+            "container": "test_swiftstore",
+            "prefix": "test_zarr",
+            # the helpers below retry through swiftclient
+            "storage_options": {**flaky_fake.auth_options, "starting_backoff": 0.001},
+            "list_page_size": 5,
+            "retry": RetryPolicy(max_attempts=10, backoff_base=0.001),
+        }
+
+    async def set(self, store: SwiftStore, key: str, value: Buffer) -> None:
+        # swiftclient can only retry uploads from a seekable file
+        body = io.BytesIO(value.to_bytes())
+        await asyncio.to_thread(
+            store.conn.put_object, store.container, store._full_key(key), body
+        )
+
+
+# ----------------------------------------------------------------------
+# The fake server itself
+# ----------------------------------------------------------------------
+
+
+def test_fake_auth_and_listing() -> None:
+    with FakeSwift(listing_limit=7) as server:
+        conn = Connection(**server.auth_options)
+        conn.put_container("listing")
+        for i in range(10):
+            conn.put_object("listing", f"k{i}", b"x" * i)
+        _, page = conn.get_container("listing", limit=4, marker="k2")
+        assert [o["name"] for o in page] == ["k3", "k4", "k5", "k6"]
+        _, everything = conn.get_container("listing", full_listing=True)
+        assert sum(o["bytes"] for o in everything) == 45
+        with pytest.raises(ClientException) as excinfo:
+            conn.get_container("listing", limit=100)  # above listing_limit
+        assert excinfo.value.http_status == 412
+
+        bad = Connection(authurl=server.authurl, user="test:tester", key="wrong", retries=0)
+        with pytest.raises(ClientException):
+            bad.get_auth()
+
+
+def test_fake_ranges(fake: FakeSwift) -> None:
+    conn = Connection(**fake.storage_options)
+    conn.put_container("ranges")
+    conn.put_object("ranges", "obj", bytes(range(100)))
+    _, body = conn.get_object("ranges", "obj", headers={"Range": "bytes=10-19"})
+    assert body == bytes(range(10, 20))
+    _, body = conn.get_object("ranges", "obj", headers={"Range": "bytes=-5"})
+    assert body == bytes(range(95, 100))
+    with pytest.raises(ClientException) as excinfo:
+        conn.get_object("ranges", "obj", headers={"Range": "bytes=200-"})
+    assert excinfo.value.http_status == 416
+
+
+def test_fake_multipart_delete(fake: FakeSwift) -> None:
+    conn = Connection(**fake.storage_options)
+    conn.put_container("manifests")
+    conn.put_object("manifests", "plain", b"x")
+
+    def multipart_delete(obj: str) -> dict[str, Any]:
+        resp = requests.delete(
+            f"{fake.storage_url}/manifests/{obj}?multipart-manifest=delete",
+            headers={"X-Auth-Token": fake.issue_token(), "Accept": "application/json"},
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    # like Swift's SLO middleware: the error in the body, the object kept
+    result = multipart_delete("plain")
+    assert result["Errors"] == [["/manifests/plain", "400 Not an SLO manifest"]]
+    assert conn.head_object("manifests", "plain")["content-length"] == "1"
+    assert multipart_delete("missing")["Number Not Found"] == 1
+
+
+async def test_segmented_store_deletes_plain_keys(fake: FakeSwift) -> None:
+    store = await SwiftStore.open(
+        "segmented_deletes", storage_options=fake.auth_options, segment_size=100
+    )
+    await store.set("small", cpu.Buffer.from_bytes(b"x" * 10))
+    await store.set("large", cpu.Buffer.from_bytes(b"y" * 250))
+    await store.delete("small")
+    await store.delete("large")
+    await store.delete("missing")
+    assert [key async for key in store.list()] == []
+    _, segments = await asyncio.to_thread(
+        Connection(**fake.auth_options).get_container, store.segment_container
+    )
+    assert segments == []
+    store.close()
+
+
+def test_fake_injected_latency_and_errors() -> None:
+    with FakeSwift(latency=0.05, error_rate=1.0, error_status=500) as server:
+        conn = Connection(**server.storage_options, retries=0)
+        started = time.perf_counter()
+        conn.put_container("slow")  # container requests never fail
+        assert time.perf_counter() - started >= 0.05
+        with pytest.raises(ClientException) as excinfo:
+            conn.put_object("slow", "obj", b"x")
+        assert excinfo.value.http_status == 500
+        assert server.count("PUT") == 2
+
+
+def test_fake_rate_limit() -> None:
+    with FakeSwift(latency=0.02, max_in_flight=2) as server:
+        conn = Connection(**server.storage_options, retries=0)
+        conn.put_container("limited")
+        conn.put_object("limited", "obj", b"x")
+
+        def head() -> int:
+            try:
+                Connection(**server.storage_options, retries=0).head_object("limited", "obj")
+            except ClientException as exc:
+                return exc.http_status
+            return 200
+
+        async def burst() -> list[int]:
+            return await asyncio.gather(*(asyncio.to_thread(head) for _ in range(6)))
+
+        statuses = asyncio.run(burst())
+        assert 429 in statuses and 200 in statuses
+        assert server.rejected == statuses.count(429)
+
+
+async def test_segmented_store_small_writes(fake: FakeSwift) -> None:
+    store = await SwiftStore.open(
+        "small_writes", storage_options=fake.auth_options, segment_size=100
+    )
+    fake.reset_counts()
+    for i in range(5):
+        await store.set(f"c/{i}", cpu.Buffer.from_bytes(b"x" * 10))
+    # writes that fit in one object do not look for an SLO to replace
+    assert fake.count("HEAD") == 0 and fake.count("PUT") == 5
+    store.close()
@@ -0,0 +1,125 @@
+import asyncio
+import pickle
+import threading
+
+import pytest
+from swiftclient.exceptions import ClientException
+from zarr.core.buffer import default_buffer_prototype
+
+from .. import SwiftStore
+from ..limiter import AdaptiveLimiter, ConcurrencyLimits
+
+PREAUTH = {"preauthurl": "http://127.0.0.1:1/v1/AUTH_test", "preauthtoken": "tk"}
+
+
+def test_limits_validation():
+    with pytest.raises(ValueError):
+        ConcurrencyLimits(read=0)
+    with pytest.raises(ValueError):
+        ConcurrencyLimits(decrease=1)
+    limiters = ConcurrencyLimits(read=3, write=2, listing=1).limiters()
+    assert {name: lim.maximum for name, lim in limiters.items()} == {
+        "read": 3, "write": 2, "listing": 1
+    }
+
+
+async def test_store_bounds_requests_per_class(monkeypatch):
+    store = SwiftStore(
+        "c", storage_options=PREAUTH, concurrency=ConcurrencyLimits(read=2, listing=1)
+    )
+    active = {"read": 0, "listing": 0}
+    peak = dict(active)
+
+    async def send(method, args, kwargs):
+        kind = "listing" if method == "get_container" else "read"
+        active[kind] += 1
+        peak[kind] = max(peak[kind], active[kind])
+        await asyncio.sleep(0.01)
+        active[kind] -= 1
+        if kind == "listing":
+            return {}, []
+        return {}, b"x"
+
+    monkeypatch.setattr(store, "_send", send)
+    proto = default_buffer_prototype()
+    results = await asyncio.gather(
+        *(store.get(f"k{i}", proto) for i in range(10)),
+        *(store.getsize_prefix("p") for _ in range(3)),
+    )
+    assert [r.to_bytes() for r in results[:10]] == [b"x"] * 10
+    assert peak == {"read": 2, "listing": 1}
+    assert store.stats()["concurrency"]["read"]["in_flight"] == 0
+    assert store.with_read_only(True)._limiters is store._limiters
+
+
+def test_adaptive_limit():
+    limiter = AdaptiveLimiter(8, ConcurrencyLimits(adaptive=True, min_limit=2))
+    limiter.record(0.01)
+    limiter.record(0.01, ClientException("slow down", http_status=429))
+    assert limiter.limit == 4
+    # a burst of rejections within one latency counts once
+    limiter.record(0.01, ClientException("slow down", http_status=498))
+    assert limiter.limit == 4
+    # other errors are no congestion signal
+    limiter._calm_until = 0
+    limiter.record(0.01, ClientException("missing", http_status=404))
+    assert limiter.limit == 4
+    limiter.record(0.01, TimeoutError())
+    assert limiter.limit == 2
+    limiter._calm_until = 0
+    limiter.record(0.01, ClientException("busy", http_status=503))
+    assert limiter.limit == 2  # min_limit
+    for _ in range(100):
+        limiter.record(0.01)
+    assert limiter.limit == 8
+    assert limiter.decreases == 3
+
+    fixed = AdaptiveLimiter(8, ConcurrencyLimits())
+    fixed.record(0.01, ClientException("slow down", http_status=429))
+    assert fixed.limit == 8
+
+    spiky = AdaptiveLimiter(8, ConcurrencyLimits(adaptive=True, latency_factor=4))
+    for _ in range(10):
+        spiky.record(0.01)
+    spiky.record(0.1)
+    assert spiky.limit == 4
+
+
+async def test_cancelled_waiter_releases_its_slot():
+    limiter = AdaptiveLimiter(1, ConcurrencyLimits())
+    await limiter.__aenter__()
+
+    async def waiting():
+        async with limiter:
+            pass
+
+    task = asyncio.ensure_future(waiting())
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await limiter.__aexit__()
+    assert limiter.in_flight == 0 and limiter.stats()["waiting"] == 0
+    assert pickle.loads(pickle.dumps(limiter)).maximum == 1
+
+
+def test_limiter_shared_across_event_loops():
+    limiter = AdaptiveLimiter(1, ConcurrencyLimits())
+    active = []
+    peak = []
+
+    async def worker():
+        for _ in range(20):
+            async with limiter:
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.001)
+                active.pop()
+
+    threads = [threading.Thread(target=asyncio.run, args=(worker(),)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert len(peak) == 60 and max(peak) == 1
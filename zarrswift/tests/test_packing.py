@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+from typing import Any
+
+import numpy as np
+import pytest
+import zarr.api.asynchronous
+from zarr.abc.store import RangeByteRequest, SuffixByteRequest
+from zarr.core.buffer import Buffer, cpu, default_buffer_prototype
+from zarr.testing.store import StoreTests
+
+from .. import SwiftStore
+from ..packing import PackedStore, _enclosing_arrays, _span
+from ..testing import FakeSwift
+
+
+def test_helpers():
+    assert _enclosing_arrays("temp/c/0/") == ["temp/"]
+    assert _enclosing_arrays("c") == [""]
+    assert _enclosing_arrays("a/c/c/") == ["a/", "a/c/"]
+    assert _enclosing_arrays("temp/") == []
+    assert _span(None, 10) == (0, 10)
+    assert _span(RangeByteRequest(2, 20), 10) == (2, 10)
+    assert _span(SuffixByteRequest(3), 10) == (7, 10)
+    with pytest.raises(ValueError):
+        PackedStore(SwiftStore("x"), pack_size=0)
+
+
+class TestPackedStore(StoreTests[PackedStore, cpu.Buffer]):
+    """The Store contract holds for keys in packs."""
+
+    store_cls = PackedStore
+    buffer_cls = cpu.Buffer
+
+    @pytest.fixture
+    def store_kwargs(self, fake: FakeSwift) -> dict[str, Any]:
+        return {
+            "store": SwiftStore(
+                container="test_packing", prefix="store", storage_options=fake.auth_options
+            )
+        }
+
+    @pytest.fixture
+    def open_kwargs(self, fake: FakeSwift) -> dict[str, Any]:
+        return {
+            "store_cls": SwiftStore,
+            "container": "test_packing",
+            "prefix": "store",
+            "storage_options": fake.auth_options,
+        }
+
+    @pytest.fixture
+    async def store(self, open_kwargs: dict[str, Any]) -> PackedStore:
+        store = await PackedStore.open(**open_kwargs)
+        await store.clear()
+        yield store
+        await store.clear()
+        store.close()
+
+    async def set(self, store: PackedStore, key: str, value: Buffer) -> None:
+        await store._store.set(key, value)
+
+    async def get(self, store: PackedStore, key: str) -> Buffer:
+        # a new store reads the index objects and footers written so far
+        await store.flush()
+        return await PackedStore(store._store).get(key, default_buffer_prototype())
+
+    def test_store_repr(self, store: PackedStore) -> None:
+        assert repr(store).startswith("PackedStore(SwiftStore(")
+
+    def test_store_supports_writes(self, store: PackedStore) -> None:
+        assert store.supports_writes
+
+    def test_store_supports_listing(self, store: PackedStore) -> None:
+        assert store.supports_listing
+
+
+async def test_packed_array(fake):
+    data = np.arange(40 * 40).reshape(40, 40)
+    swift = await SwiftStore.open("packed", storage_options=fake.auth_options)
+    await swift.clear()
+    store = PackedStore(swift, index_interval=4)
+    array = await zarr.api.asynchronous.create_array(
+        store, name="temp", shape=data.shape, chunks=(4, 4), dtype=data.dtype
+    )
+    fake.reset_counts()
+    await array.setitem(slice(None), data)
+    # 100 chunks committed in a few packs, indexed on the way
+    assert fake.count("PUT") < 30
+    objects = [key async for key in swift.list()]
+    assert all(key.startswith("temp/.zpack/") for key in objects if "zarr.json" not in key)
+    assert "temp/.zpack/index" in objects
+
+    keys = sorted([key async for key in store.list()])
+    assert len(keys) == 102 and keys[0] == "temp/c/0/0" and keys[-2] == "temp/zarr.json"
+    assert sorted([key async for key in store.list_prefix("temp/c/9/")]) == [
+        f"temp/c/9/{j}" for j in range(10)
+    ]
+    assert [key async for key in store.list_dir("temp")] == ["c", "zarr.json"]
+    assert [key async for key in store.list_dir("temp/c/0")] == [str(j) for j in range(10)]
+    chunk = await store.get("temp/c/1/1", default_buffer_prototype())
+    assert await store.getsize("temp/c/1/1") == len(chunk)
+
+    # reads of neighbouring chunks share requests
+    reader = PackedStore(swift)
+    array = await zarr.api.asynchronous.open_array(store=reader, path="temp")
+    fake.reset_counts()
+    np.testing.assert_array_equal(await array.getitem(slice(None)), data)
+    stats = reader.stats()["packing"]
+    assert stats["reads"] == 100 and stats["read_requests"] <= 35
+    assert fake.count("GET") < 50
+
+    # overwrites, deletions and a chunk too large to pack
+    expected = data.copy()
+    expected[:8] = -1
+    await array.setitem(slice(0, 8), -1)
+    await store.delete("temp/c/9/9")
+    expected[36:, 36:] = 0  # the fill value
+    large = PackedStore(swift, max_value_size=8)
+    await large.set("temp/c/5/5", await store.get("temp/c/9/8", default_buffer_prototype()))
+    expected[20:24, 20:24] = expected[36:40, 32:36]
+    assert "temp/c/5/5" in {key async for key in swift.list_prefix("temp/c/")}
+    for reader in (PackedStore(swift), pickle.loads(pickle.dumps(PackedStore(swift)))):
+        array = await zarr.api.asynchronous.open_array(store=reader, path="temp")
+        np.testing.assert_array_equal(await array.getitem(slice(None)), expected)
+        assert not await reader.exists("temp/c/9/9")
+        assert len([key async for key in reader.list_prefix("temp/")]) == 100
+
+    # compaction rewrites the packs and keeps every value
+    result = await store.compact()
+    assert result.bytes_reclaimed > 0 and result.packs_after == 1
+    objects = {key async for key in swift.list()}
+    packs = {key for key in objects if key.startswith("temp/.zpack/0")}
+    assert len(packs) == 1
+    assert objects - packs == {"zarr.json", "temp/zarr.json", "temp/c/5/5", "temp/.zpack/index"}
+    assert store.stats()["packing"]["garbage_bytes"] == 0
+    fake.reset_counts()
+    array = await zarr.api.asynchronous.open_array(store=PackedStore(swift), path="temp")
+    np.testing.assert_array_equal(await array.getitem(slice(None)), expected)
+    assert (await store.compact()).bytes_reclaimed == 0
+
+    await store.delete_dir("temp")
+    assert [key async for key in swift.list()] == ["zarr.json"]
+    assert await store.is_empty("temp")
+    swift.close()
+
+
+async def test_concurrent_writes_share_packs(fake):
+    swift = await SwiftStore.open("packed_writes", storage_options=fake.auth_options)
+    await swift.clear()
+    store = PackedStore(swift, linger=0.05)
+    fake.reset_counts()
+    await asyncio.gather(
+        *(store.set(f"a/c/{i}", cpu.Buffer.from_bytes(b"%d" % i)) for i in range(50))
+    )
+    assert fake.count("PUT") == 1
+    # written values are read back while waiting for their commit
+    writing = asyncio.ensure_future(store.set("a/c/0", cpu.Buffer.from_bytes(b"new")))
+    await asyncio.sleep(0)
+    proto = default_buffer_prototype()
+    assert (await store.get("a/c/0", proto)).to_bytes() == b"new"
+    assert (await store.get("a/c/0", proto, RangeByteRequest(1, 2))).to_bytes() == b"e"
+    await writing
+    stats = store.stats()["packing"]
+    assert stats["commits"] == 2 and stats["values_packed"] == 51
+    swift.close()
+
+
+async def test_reads_during_reload(fake):
+    swift = await SwiftStore.open("packed_reload", storage_options=fake.auth_options)
+    await swift.clear()
+    store = PackedStore(swift)
+    values = {f"a/c/{i}": b"%d" % i for i in range(20)}
+    for key, value in values.items():  # one pack each, all of them small
+        await store.set(key, cpu.Buffer.from_bytes(value))
+    proto = default_buffer_prototype()
+
+    async def read_all(reader):
+        found = await asyncio.gather(*(reader.get(key, proto) for key in values))
+        return {key: value.to_bytes() for key, value in zip(values, found) if value}
+
+    # a reader reloading on every access never sees an empty index
+    reader = PackedStore(swift, ttl=0)
+    for _ in range(3):
+        assert await read_all(reader) == values
+    # neither do reads running alongside a compaction
+    compacting = asyncio.ensure_future(store.compact())
+    while not compacting.done():
+        assert await read_all(store) == values
+    assert (await compacting).packs_after == 1
+    assert await read_all(store) == values
+    swift.close()
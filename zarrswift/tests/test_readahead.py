@@ -0,0 +1,115 @@
+import asyncio
+import pickle
+
+import numpy as np
+import pytest
+import zarr
+import zarr.api.asynchronous
+
+from .. import SwiftStore
+from ..readahead import ReadAhead, parse_chunk_key
+from ..testing import FakeSwift
+
+
+def test_parse_chunk_key():
+    assert parse_chunk_key("temp/c/3/0/12") == ("temp/", "/", (3, 0, 12))
+    assert parse_chunk_key("c/5") == ("", "/", (5,))
+    assert parse_chunk_key("a/b/c.1.2") == ("a/b/", ".", (1, 2))
+    assert parse_chunk_key("abc/1") is None
+    assert parse_chunk_key("temp/zarr.json") is None
+    assert parse_chunk_key("temp/0.1") is None  # zarr v2
+    assert parse_chunk_key("temp/c/1.2") is None  # mixed separators
+    with pytest.raises(ValueError):
+        ReadAhead(depth=0)
+
+
+class _Chunks:
+    """``fetch`` over an in-memory chunk grid of ``shape``, counting reads."""
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.fetched = []
+        self.slow = set()  # keys that take a long time
+
+    async def __call__(self, full_key):
+        self.fetched.append(full_key)
+        await asyncio.sleep(10 if full_key in self.slow else 0.001)
+        parsed = parse_chunk_key(full_key)
+        if parsed is not None and any(c >= n for c, n in zip(parsed[2], self.shape)):
+            return None
+        return full_key.encode()
+
+
+async def _settle(prefetcher):
+    while prefetcher.stats()["in_flight"]:
+        await asyncio.sleep(0.001)
+
+
+async def test_prefetcher_follows_walks():
+    prefetcher = ReadAhead(depth=3).prefetcher()
+    fetch = _Chunks((10, 4))
+
+    # walk along the first axis: after two equal steps, read ahead
+    for i in range(10):
+        key = f"arr/c/{i}/1"
+        assert await prefetcher.get(key, fetch) == key.encode()
+    stats = prefetcher.stats()
+    assert stats["misses"] == 3 and stats["hits"] == 7
+    assert fetch.fetched.count("arr/c/5/1") == 1  # never fetched twice
+    await _settle(prefetcher)
+    assert prefetcher.stats()["wasted"] == 3  # guesses past the last chunk
+
+    # a new direction cancels the guesses in flight
+    fetch.slow = {"arr/c/0/3", "arr/c/0/4", "arr/c/0/5"}
+    for j in range(3):
+        await prefetcher.get(f"arr/c/0/{j}", fetch)
+    assert prefetcher.stats()["in_flight"] == 3
+    await prefetcher.get("arr/c/9/0", fetch)
+    assert prefetcher.stats()["cancelled"] == 3
+    assert prefetcher.stats()["in_flight"] == 0
+
+    # metadata keys are passed through
+    assert await prefetcher.get("arr/zarr.json", fetch) == b"arr/zarr.json"
+    clone = pickle.loads(pickle.dumps(prefetcher))
+    assert clone.config == prefetcher.config and clone.stats()["hits"] == 0
+
+
+async def test_prefetcher_buffer_and_discard():
+    prefetcher = ReadAhead(depth=4, confirm=1, max_bytes=8).prefetcher()
+    fetch = _Chunks((100,))
+    await prefetcher.get("c/0", fetch)
+    await prefetcher.get("c/1", fetch)
+    await _settle(prefetcher)
+    stats = prefetcher.stats()
+    # four 3-byte chunks were fetched ahead; the two oldest did not fit
+    assert (stats["buffered"], stats["buffered_bytes"], stats["wasted"]) == (2, 6, 2)
+    prefetcher.discard("c/4")
+    prefetcher.discard_prefix("")
+    assert prefetcher.stats()["buffered"] == 0
+
+
+async def test_store_read_ahead():
+    data = np.arange(20 * 30).reshape(20, 30)
+    with FakeSwift(latency=0.002) as server:
+        store = await SwiftStore.open(
+            "readahead",
+            storage_options=server.auth_options,
+            read_ahead=ReadAhead(depth=4),
+        )
+        array = await zarr.api.asynchronous.create_array(
+            store, name="temp", shape=data.shape, chunks=(2, 30), dtype=data.dtype
+        )
+        await array.setitem(slice(None), data)
+        array = await zarr.api.asynchronous.open_array(store=store, path="temp")
+        server.reset_counts()
+        for t in range(0, 20, 2):
+            np.testing.assert_array_equal(await array.getitem(slice(t, t + 2)), data[t:t + 2])
+        stats = store.stats()["read_ahead"]
+        assert stats["hits"] >= 7 and stats["hit_rate"] >= 0.7
+        # every chunk was fetched once, by the reader or ahead of it
+        assert 10 <= server.count("GET") <= stats["misses"] + stats["issued"]
+
+        # writes replace read-ahead data
+        await array.setitem(slice(0, 2), -data[:2])
+        np.testing.assert_array_equal(await array.getitem(slice(0, 2)), -data[:2])
+        store.close()
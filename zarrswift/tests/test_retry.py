@@ -0,0 +1,140 @@
+import asyncio
+import pickle
+import ssl
+
+import pytest
+import requests
+from swiftclient.exceptions import ClientException
+from zarr.core.buffer import default_buffer_prototype
+
+from .. import SwiftStore
+from ..storage import _BufferReader
+from ..retry import LatencyWindow, RetryPolicy
+
+PREAUTH = {"preauthurl": "http://127.0.0.1:1/v1/AUTH_test", "preauthtoken": "tk"}
+
+
+def error(status, **headers):
+    return ClientException("failed", http_status=status, http_response_headers=headers)
+
+
+def test_retryable():
+    policy = RetryPolicy()
+    assert policy.retryable(error(503))
+    assert policy.retryable(TimeoutError())
+    assert policy.retryable(ConnectionResetError())
+    assert not policy.retryable(error(404))
+    assert not policy.retryable(error(None))  # e.g. no auth URL or bad credentials
+    assert not policy.retryable(ValueError())
+    assert not policy.retryable(FileNotFoundError())
+    assert not policy.retryable(PermissionError())
+    assert not policy.retryable(ssl.SSLCertVerificationError())
+    assert policy.retryable(requests.ConnectionError())
+    assert not policy.retryable(requests.exceptions.SSLError())
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+    for attempt in range(1, 8):
+        assert 0 <= policy.backoff(attempt) <= min(3, 0.5 * 2 ** (attempt - 1))
+    assert policy.backoff(1, error(503, **{"Retry-After": "2"})) == 2
+    assert policy.backoff(1, error(503, **{"Retry-After": "60"})) == 3
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+    with pytest.raises(ValueError):
+        RetryPolicy(hedge_quantile=1)
+
+
+def test_latency_window():
+    window = LatencyWindow(size=100, refresh=1)
+    for i in range(200):
+        window.add(i / 1000)
+    assert len(window) == 100
+    assert window.quantile(0.5) == 0.15
+    assert window.quantile(0.99) == 0.199
+    assert len(pickle.loads(pickle.dumps(window))) == 0
+
+
+def scripted_store(monkeypatch, outcomes, **policy):
+    """SwiftStore whose requests return or raise ``outcomes`` in turn."""
+    store = SwiftStore("c", storage_options=PREAUTH, retry=RetryPolicy(**policy))
+    calls = []
+
+    async def attempt(method, args, kwargs):
+        calls.append(method)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, float):
+            await asyncio.sleep(outcome)
+            return {}, b"slow"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(store, "_attempt", attempt)
+    return store, calls
+
+
+async def test_retries_transient_errors(monkeypatch):
+    store, calls = scripted_store(
+        monkeypatch, [error(503), TimeoutError(), ({}, b"ok")], backoff_base=0.001
+    )
+    value = await store.get("k", default_buffer_prototype())
+    assert value.to_bytes() == b"ok"
+    assert len(calls) == 3
+
+
+async def test_retry_reads_body_from_start(monkeypatch):
+    store = SwiftStore(
+        "c", storage_options=PREAUTH, retry=RetryPolicy(backoff_base=0.001)
+    )
+    bodies = []
+
+    async def attempt(method, args, kwargs):
+        reader = kwargs["contents"]
+        bodies.append(reader)
+        if len(bodies) == 1:
+            reader.read(3)  # a timed-out attempt left mid-upload
+            raise TimeoutError
+        return reader.read()
+
+    monkeypatch.setattr(store, "_attempt", attempt)
+    reader = _BufferReader(memoryview(b"payload"))
+    assert await store._call("put_object", "c", "k", contents=reader) == b"payload"
+    assert bodies[0] is not bodies[1]
+
+
+async def test_get_raises_instead_of_returning_missing(monkeypatch):
+    store, calls = scripted_store(
+        monkeypatch, [error(503)], max_attempts=2, backoff_base=0.001
+    )
+    with pytest.raises(ClientException):
+        await store.get("k", default_buffer_prototype())
+    with pytest.raises(ClientException):
+        await store.exists("k")
+    assert len(calls) == 4
+
+    store, calls = scripted_store(monkeypatch, [error(404)])
+    assert await store.get("k", default_buffer_prototype()) is None
+    assert not await store.exists("k")
+    with pytest.raises(FileNotFoundError):
+        await store.getsize("k")
+    assert len(calls) == 3  # a 404 is not retried
+
+
+async def test_hedged_get(monkeypatch):
+    # first request hangs, the hedge answers
+    store, calls = scripted_store(
+        monkeypatch, [5.0, ({}, b"fast")], hedge_quantile=0.9, hedge_min_samples=3
+    )
+    for _ in range(3):
+        store._latency.add(0.001)
+    value = await asyncio.wait_for(store.get("k", default_buffer_prototype()), 1)
+    assert value.to_bytes() == b"fast"
+    assert len(calls) == 2
+
+    # without enough samples there is no hedge
+    store, calls = scripted_store(
+        monkeypatch, [0.01, ({}, b"fast")], hedge_quantile=0.9, hedge_min_samples=3
+    )
+    assert (await store.get("k", default_buffer_prototype())).to_bytes() == b"slow"
+    assert len(calls) == 1
@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+from swiftclient.exceptions import ClientException
+from zarr.core.buffer import cpu, default_buffer_prototype
+
+from .. import SwiftStore
+from ..retry import RetryPolicy
+from ..stats import Histogram, StatsCollector
+
+PREAUTH = {"preauthurl": "http://127.0.0.1:1/v1/AUTH_test", "preauthtoken": "tk"}
+
+
+def test_histogram():
+    hist = Histogram()
+    for _ in range(98):
+        hist.observe(0.0015)  # 2 ms bucket
+    hist.observe(0.1)
+    hist.observe(30.0)  # beyond the last bucket
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["p50"] == snapshot["p90"] == 0.002
+    assert snapshot["p99"] == 0.128
+    assert snapshot["max"] == 30.0
+    assert snapshot["buckets"][float("inf")] == 1
+
+
+def test_collector_counts_and_hooks():
+    events = []
+    collector = StatsCollector(hooks=[events.append], hot_keys=2)
+    for key in ("a", "b", "a", "c", "a"):
+        started = collector.start("op", "get")
+        collector.finish("op", "get", started, key, bytes_in=10)
+    started = collector.start("request", "get_object")
+    assert collector.snapshot()["requests"]["get_object"]["in_flight"] == 1
+    collector.finish("request", "get_object", started, error="503")
+
+    snapshot = collector.snapshot()
+    assert snapshot["ops"]["get"]["count"] == 5
+    assert snapshot["ops"]["get"]["bytes_in"] == 50
+    assert snapshot["requests"]["get_object"]["errors"] == 1
+    assert snapshot["requests"]["get_object"]["max_in_flight"] == 1
+    assert snapshot["errors"] == {"503": 1}
+    assert snapshot["hot_keys"][0] == ("a", 3)
+    assert len(events) == 6
+    assert events[-1].error == "503"
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    collector.add_hook(broken)
+    with pytest.warns(RuntimeWarning):
+        collector.finish("op", "get", collector.start("op", "get"))
+
+    collector.reset()
+    assert collector.snapshot()["ops"] == {}
+    clone = pickle.loads(pickle.dumps(collector))
+    assert clone.hooks == [] and clone.hot_keys == 2
+
+
+async def test_store_metrics(monkeypatch):
+    metrics = StatsCollector()
+    store = SwiftStore(
+        "c",
+        storage_options=PREAUTH,
+        metrics=metrics,
+        retry=RetryPolicy(backoff_base=0.001),
+    )
+    responses = [ClientException("busy", http_status=503), ({}, b"abc")]
+
+    async def call(method, *args, **kwargs):
+        if method == "put_object":
+            return "etag"
+        if args[1] == "missing":
+            raise ClientException("missing", http_status=404)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(store._pool, "call", call)
+    proto = default_buffer_prototype()
+    await store.set("k", cpu.Buffer.from_bytes(b"abcd"))
+    assert (await store.get("k", proto)).to_bytes() == b"abc"
+    assert await store.get("missing", proto) is None
+
+    stats = store.stats()
+    assert stats["ops"]["set"]["bytes_out"] == 4
+    assert stats["ops"]["get"]["count"] == 2
+    assert stats["ops"]["get"]["bytes_in"] == 3
+    assert stats["requests"]["get_object"]["count"] == 3
+    assert stats["retries"] == 1
+    assert stats["errors"] == {"503": 1, "404": 1}
+    assert stats["connections"]["max"] == store.max_connections
+    assert "ops" not in SwiftStore("c", storage_options=PREAUTH).stats()
@@ -22,17 +22,27 @@ from zarr.core.buffer import cpu as cpu_buffer
 from zarr.testing.store import StoreTests
 
 from .. import SwiftStore
+from ..storage import (
+    _BufferReader,
+    _coalesce,
+    _drain,
+    _failed_keys,
+    _parse_byteranges,
+)
 
 if TYPE_CHECKING:
     pass
 
-pytestmark = pytest.mark.skipif(
+skip_no_swift = pytest.mark.skipif(
     not os.environ.get("ZARR_TEST_SWIFT"),
     reason="Set ZARR_TEST_SWIFT=1 to run Swift integration tests",
 )
 
 
-class TestSwiftStore(StoreTests[SwiftStore, cpu_buffer.Buffer]):
+class SwiftStoreTests(StoreTests[SwiftStore, cpu_buffer.Buffer]):
+    """Store tests shared by the live suite and the offline one in
+    ``test_fakeswift``; subclasses provide ``store_kwargs``."""
+
     store_cls = SwiftStore
     buffer_cls = cpu_buffer.Buffer
 
@@ -40,22 +50,6 @@ class TestSwiftStore(StoreTests[SwiftStore, cpu_buffer.Buffer]):
     # Fixtures
     # ------------------------------------------------------------------
 
-    @pytest.fixture
-    def store_kwargs(self) -> dict[str, Any]:
-        options = {
-            "authurl": os.environ.get("ST_AUTH"),
-            "user": os.environ.get("ST_USER"),
-            "key": os.environ.get("ST_KEY"),
-            "preauthurl": os.environ.get("OS_STORAGE_URL"),
-            "preauthtoken": os.environ.get("OS_AUTH_TOKEN"),
-        }
-        options = {k: v for k, v in options.items() if v}
-        return {
-            "container": "test_swiftstore",
-            "prefix": "test_zarr",
-            "storage_options": options,
-        }
-
     @pytest.fixture
     async def store(self, open_kwargs: dict[str, Any]) -> SwiftStore:
         store = await SwiftStore.open(**open_kwargs)
@@ -125,3 +119,611 @@ class TestSwiftStore(StoreTests[SwiftStore, cpu_buffer.Buffer]):
         # clean up
         await asyncio.to_thread(store2.conn.delete_container, new_name)
         store2.close()
+
+    async def test_get_partial_values_coalesced(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        from zarr.abc.store import RangeByteRequest
+
+        data = bytes(range(256)) * 4
+        await store.set("shard", self.buffer_cls.from_bytes(data))
+        requests = [(s, s + 7) for s in (0, 10, 100, 500, 1000)] + [(1020, 1100)]
+        for multirange in (True, False):
+            kwargs = {**store_kwargs, "coalesce_gap": 16, "multirange": multirange}
+            coalescing = SwiftStore(**kwargs)
+            results = await coalescing.get_partial_values(
+                default_buffer_prototype(),
+                [("shard", RangeByteRequest(s, e)) for s, e in requests]
+                + [("missing", RangeByteRequest(0, 1))],
+            )
+            assert results[-1] is None
+            for (start, end), result in zip(requests, results, strict=False):
+                assert result.to_bytes() == data[start:end]
+
+    async def test_set_segmented(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        from zarr.abc.store import RangeByteRequest
+
+        kwargs = {**store_kwargs, "segment_size": 1 << 20}
+        segmented = await SwiftStore.open(**kwargs)
+        data = os.urandom((5 << 20) // 2)
+        await segmented.set("large", self.buffer_cls.from_bytes(data))
+        headers = await asyncio.to_thread(
+            store.conn.head_object, store.container, store._full_key("large")
+        )
+        assert headers.get("x-static-large-object") == "True"
+        assert await segmented.getsize("large") == len(data)
+        proto = default_buffer_prototype()
+        assert (await segmented.get("large", proto)).to_bytes() == data
+        part = await segmented.get("large", proto, RangeByteRequest(1048570, 1048590))
+        assert part.to_bytes() == data[1048570:1048590]
+
+        await segmented.delete("large")
+        _, segments = await asyncio.to_thread(
+            store.conn.get_container,
+            segmented.segment_container,
+            prefix=store._full_key("large"),
+        )
+        assert segments == []
+
+    async def test_set_segmented_replaces_segments(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        from ..cache import MetadataCache
+
+        segmented = await SwiftStore.open(
+            **{**store_kwargs, "segment_size": 1 << 20, "metadata_cache": MetadataCache()}
+        )
+
+        async def segments() -> list[dict[str, Any]]:
+            _, listing = await asyncio.to_thread(
+                store.conn.get_container,
+                segmented.segment_container,
+                prefix=store._full_key("large"),
+            )
+            return listing
+
+        for size in (3 << 20, 5 << 19, 3 << 20):
+            data = os.urandom(size)
+            await segmented.set("large", self.buffer_cls.from_bytes(data))
+            # only the segments of the current manifest are left
+            assert len(await segments()) == -(-size // (1 << 20))
+        proto = default_buffer_prototype()
+        assert (await segmented.get("large", proto)).to_bytes() == data
+        # the metadata cache knows "large" is an SLO, so a small write removes it
+        await segmented.set("large", self.buffer_cls.from_bytes(b"small"))
+        assert await segments() == []
+        assert (await segmented.get("large", proto)).to_bytes() == b"small"
+        await segmented.set("large", self.buffer_cls.from_bytes(data))
+        await segmented.delete("large")
+        assert await segments() == []
+        assert not await segmented.exists("large")
+
+    async def test_get_parallel(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        kwargs = {**store_kwargs, "download_part_size": 1000, "download_concurrency": 3}
+        parallel = SwiftStore(**kwargs)
+        proto = default_buffer_prototype()
+        for size in (0, 10, 1000, 1001, 12345):
+            data = os.urandom(size)
+            await store.set(f"blob{size}", self.buffer_cls.from_bytes(data))
+            assert (await parallel.get(f"blob{size}", proto)).to_bytes() == data
+        assert await parallel.get("missing", proto) is None
+
+    @pytest.mark.parametrize("bulk", [True, False])
+    async def test_delete_dir_batches(self, store: SwiftStore, bulk: bool) -> None:
+        for i in range(12):
+            await store.set(f"doomed/c/{i}", self.buffer_cls.from_bytes(b"x"))
+        await store.set("kept", self.buffer_cls.from_bytes(b"x"))
+        info = await store._capabilities()
+        if bulk and "bulk_delete" not in info:
+            pytest.skip("bulk middleware not enabled")
+        if not bulk:
+            store._info = {}  # force the single-DELETE fallback
+        await store.delete_dir("doomed")
+        assert [k async for k in store.list()] == ["kept"]
+
+    async def test_batch_writes(self, store: SwiftStore) -> None:
+        proto = default_buffer_prototype()
+        values = {f"batched/c/{i}": str(i).encode() for i in range(25)}
+        last = "batched/c/24"
+        async with store.batch_writes(max_items=10) as batch:
+            for key, value in values.items():
+                await store.set(key, self.buffer_cls.from_bytes(value))
+            assert len(batch.pending) == 5
+            assert (await store.get(last, proto)).to_bytes() == values[last]
+            assert await store.exists(last)
+            assert await store.getsize(last) == len(values[last])
+            await store.delete(last)
+        del values[last]
+        assert sorted([k async for k in store.list_prefix("batched/")]) == sorted(values)
+        for key, value in values.items():
+            assert (await self.get(store, key)).to_bytes() == value
+
+    async def test_batch_writes_delete_dir(self, store: SwiftStore) -> None:
+        # zarr's mode="w" sequence: write, then clear the group before flushing
+        async with store.batch_writes():
+            await store.set("group/a/c/0", self.buffer_cls.from_bytes(b"0"))
+            await store.set("group/b", self.buffer_cls.from_bytes(b"1"))
+            await store.set("other", self.buffer_cls.from_bytes(b"2"))
+            await store.delete_dir("group")
+            assert not await store.exists("group/a/c/0")
+            assert await store.exists("other")
+        assert [k async for k in store.list()] == ["other"]
+
+    async def test_failed_writes_under_listing(
+        self,
+        store: SwiftStore,
+        store_kwargs: dict[str, Any],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from swiftclient.exceptions import ClientException
+
+        from ..cache import MetadataCache
+        from ..storage import SwiftBulkError
+
+        cached = SwiftStore(**{**store_kwargs, "metadata_cache": MetadataCache()})
+        await cached.prefetch_metadata("listed/")  # a complete listing of the prefix
+        cached._info = {}  # batches as single PUTs
+        put_view = cached._put_view
+
+        async def failing_put(container: str, name: str, *args: Any, **kwargs: Any) -> Any:
+            if name.endswith("listed/c/1"):
+                raise ClientException("refused", http_status=503)
+            return await put_view(container, name, *args, **kwargs)
+
+        monkeypatch.setattr(cached, "_put_view", failing_put)
+        with pytest.raises(SwiftBulkError):
+            async with cached.batch_writes():
+                for i in range(3):
+                    await cached.set(f"listed/c/{i}", self.buffer_cls.from_bytes(b"%d" % i))
+        # the keys Swift stored are still known; the failed one is asked for
+        proto = default_buffer_prototype()
+        assert (await cached.get("listed/c/0", proto)).to_bytes() == b"0"
+        assert (await cached.get("listed/c/2", proto)).to_bytes() == b"2"
+        assert await cached.get("listed/c/1", proto) is None
+
+        # a failed delete leaves the key to Swift, not missing
+        call = cached._call
+
+        async def failing_delete(method: str, *args: Any, **kwargs: Any) -> Any:
+            if method == "delete_object":
+                raise ClientException("refused", http_status=500)
+            return await call(method, *args, **kwargs)
+
+        monkeypatch.setattr(cached, "_call", failing_delete)
+        with pytest.raises(ClientException):
+            await cached.delete("listed/c/0")
+        monkeypatch.setattr(cached, "_call", call)
+        assert (await cached.get("listed/c/0", proto)).to_bytes() == b"0"
+        assert await cached.exists("listed/c/0")
+
+    async def test_cache_read_through(
+        self, store: SwiftStore, store_kwargs: dict[str, Any], tmp_path: Any
+    ) -> None:
+        from zarr.abc.store import RangeByteRequest
+
+        from ..cache import ChunkCache
+
+        cache = ChunkCache(directory=tmp_path)
+        cached = SwiftStore(**{**store_kwargs, "cache": cache})
+        proto = default_buffer_prototype()
+        await cached.set("k", self.buffer_cls.from_bytes(b"0123456789"))
+        assert (await cached.get("k", proto)).to_bytes() == b"0123456789"
+        assert (await cached.get("k", proto)).to_bytes() == b"0123456789"
+        part = await cached.get("k", proto, RangeByteRequest(2, 5))
+        assert part.to_bytes() == b"234"
+        assert (cache.misses, cache.hits) == (1, 2)
+
+        # a write through another store is caught by revalidation
+        await self.set(store, "k", self.buffer_cls.from_bytes(b"changed"))
+        assert (await cached.get("k", proto)).to_bytes() == b"changed"
+        await cached.delete("k")
+        assert await cached.get("k", proto) is None
+        assert cache.stats()["disk_entries"] == 0
+
+    async def test_metadata_cache(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        from ..cache import MetadataCache
+
+        metadata = MetadataCache()
+        cached = SwiftStore(**{**store_kwargs, "metadata_cache": metadata})
+        proto = default_buffer_prototype()
+        doc = b'{"zarr_format": 3, "node_type": "group"}'
+        await cached.set("g/zarr.json", self.buffer_cls.from_bytes(doc))
+        assert (await cached.get("g/zarr.json", proto)).to_bytes() == doc
+        assert await cached.getsize("g/zarr.json") == len(doc)
+        assert not await cached.exists("g/a/zarr.json")
+        assert await cached.get("g/a/zarr.json", proto) is None
+        assert (metadata.hits, metadata.misses) == (3, 1)
+
+        await cached.delete("g/zarr.json")
+        assert not await cached.exists("g/zarr.json")
+
+        # a listing answers lookups of every key under the prefix
+        await self.set(store, "h/c/0", self.buffer_cls.from_bytes(b"xyz"))
+        prefetched = SwiftStore(
+            **{**store_kwargs, "metadata_cache": MetadataCache(), "metadata_prefetch": True}
+        )
+        assert await prefetched.getsize("h/c/0") == 3
+        assert not await prefetched.exists("h/c/1")
+        assert prefetched.metadata_cache.stats()["listed_prefixes"] == 1
+
+    async def test_skip_unchanged(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        from ..cache import MetadataCache
+
+        with pytest.raises(ValueError, match="metadata_cache"):
+            SwiftStore(**{**store_kwargs, "skip_unchanged": True})
+        values = {
+            "s/zarr.json": b'{"zarr_format": 3, "node_type": "array"}',
+            "s/c/0": os.urandom(200_000),  # hashed off the event loop
+            "s/large": os.urandom(3 << 19),  # an SLO of 2 segments
+        }
+        kwargs = {
+            **store_kwargs,
+            "segment_size": 1 << 20,
+            "metadata_cache": MetadataCache(),
+            "metadata_prefetch": True,
+            "skip_unchanged": True,
+        }
+        first = SwiftStore(**kwargs)
+        for key, value in values.items():
+            await first.set(key, self.buffer_cls.from_bytes(value))
+        assert first.stats()["skip_unchanged"]["skipped"] == 0
+
+        # a re-run knows the ETags from one listing and uploads nothing
+        rerun = SwiftStore(**{**kwargs, "metadata_cache": MetadataCache()})
+        for key, value in values.items():
+            await rerun.set(key, self.buffer_cls.from_bytes(value))
+        stats = rerun.stats()["skip_unchanged"]
+        assert (stats["checked"], stats["skipped"]) == (3, 3)
+        assert stats["bytes_skipped"] == sum(map(len, values.values()))
+
+        await rerun.set("s/c/0", self.buffer_cls.from_bytes(b"changed"))
+        await rerun.set("s/c/1", self.buffer_cls.from_bytes(b"new"))
+        assert rerun.stats()["skip_unchanged"]["skipped"] == 3
+        proto = default_buffer_prototype()
+        assert (await store.get("s/c/0", proto)).to_bytes() == b"changed"
+        assert (await store.get("s/c/1", proto)).to_bytes() == b"new"
+
+        # uploads carry their MD5: Swift rejects a mismatch
+        from swiftclient.exceptions import ClientException
+
+        with pytest.raises(ClientException) as excinfo:
+            await rerun._put_view(
+                rerun.container, rerun._full_key("s/c/0"), memoryview(b"xyz"), etag="0" * 32
+            )
+        assert excinfo.value.http_status == 422
+        await rerun.delete("s/large")
+
+    async def test_sizes_from_listing(self, store: SwiftStore) -> None:
+        for i in range(7):
+            await store.set(f"arr/c/{i}", self.buffer_cls.from_bytes(b"x" * i))
+        await store.set("arr/zarr.json", self.buffer_cls.from_bytes(b"{}"))
+        await store.set("other/c/0", self.buffer_cls.from_bytes(b"xyz"))
+        assert await store.getsize_prefix("arr/c/") == sum(range(7))
+        assert await store.getsize_prefix("arr/") == sum(range(7)) + 2
+
+        keys = ["arr/c/6", "arr/c/1", "arr/c/9", "arr/zarr.json"]
+        assert await store.getsize_many(keys) == [6, 1, None, 2]
+        assert await store.exists_many(keys) == [True, True, False, True]
+        assert await store.exists_many([]) == []
+
+    async def test_stream(self, store: SwiftStore) -> None:
+        from zarr.abc.store import OffsetByteRequest, RangeByteRequest, SuffixByteRequest
+
+        data = os.urandom(100_000)
+        await store.set("big", self.buffer_cls.from_bytes(data))
+        chunks = [c async for c in store.stream("big", chunk_size=4096)]
+        assert b"".join(chunks) == data
+        assert max(map(len, chunks)) <= 4096
+        for byte_range, expected in [
+            (RangeByteRequest(10, 50_000), data[10:50_000]),
+            (OffsetByteRequest(99_990), data[99_990:]),
+            (SuffixByteRequest(7), data[-7:]),
+        ]:
+            parts = [c async for c in store.stream("big", byte_range, chunk_size=1000)]
+            assert b"".join(parts) == expected
+
+        # interleaved streams share the connection pool
+        async def read(byte_range: RangeByteRequest) -> bytes:
+            return b"".join([c async for c in store.stream("big", byte_range, chunk_size=7)])
+
+        ranges = [RangeByteRequest(i * 1000, i * 1000 + 100) for i in range(20)]
+        parts = await asyncio.gather(*(read(r) for r in ranges))
+        assert parts == [data[r.start:r.end] for r in ranges]
+
+        # stopping early releases the connection for the next request
+        async for _ in store.stream("big", chunk_size=10):
+            break
+        assert (await store.get("big", default_buffer_prototype())).to_bytes() == data
+        with pytest.raises(FileNotFoundError):
+            async for _ in store.stream("missing"):
+                pass
+
+    async def test_list_paginates(
+        self, store: SwiftStore, store_kwargs: dict[str, Any]
+    ) -> None:
+        keys = sorted(f"paged/c/{i}" for i in range(7))
+        for key in keys:
+            await store.set(key, self.buffer_cls.from_bytes(b"x"))
+        for prefetch in (False, True):
+            kwargs = {**store_kwargs, "list_page_size": 2, "list_prefetch": prefetch}
+            small = SwiftStore(**kwargs)
+            assert sorted([k async for k in small.list_prefix("paged/")]) == keys
+            assert sorted([k async for k in small.list_dir("paged/c")]) == sorted(
+                k.rsplit("/", 1)[1] for k in keys
+            )
+
+
+@skip_no_swift
+class TestSwiftStore(SwiftStoreTests):
+    @pytest.fixture
+    def store_kwargs(self) -> dict[str, Any]:
+        options = {
+            "authurl": os.environ.get("ST_AUTH"),
+            "user": os.environ.get("ST_USER"),
+            "key": os.environ.get("ST_KEY"),
+            "preauthurl": os.environ.get("OS_STORAGE_URL"),
+            "preauthtoken": os.environ.get("OS_AUTH_TOKEN"),
+        }
+        options = {k: v for k, v in options.items() if v}
+        return {
+            "container": "test_swiftstore",
+            "prefix": "test_zarr",
+            "storage_options": options,
+        }
+
+
+class TestSwiftStoreAiohttp(TestSwiftStore):
+    """Run the same suite on the native asyncio transport."""
+
+    @pytest.fixture
+    def store_kwargs(self) -> dict[str, Any]:
+        pytest.importorskip("aiohttp")
+        options = {
+            "authurl": os.environ.get("ST_AUTH"),
+            "user": os.environ.get("ST_USER"),
+            "key": os.environ.get("ST_KEY"),
+            "preauthurl": os.environ.get("OS_STORAGE_URL"),
+            "preauthtoken": os.environ.get("OS_AUTH_TOKEN"),
+        }
+        options = {k: v for k, v in options.items() if v}
+        return {
+            "container": "test_swiftstore",
+            "prefix": "test_zarr_aio",
+            "storage_options": options,
+            "transport": "aiohttp",
+        }
+
+
+# ----------------------------------------------------------------------
+# Offline tests (no Swift service required)
+# ----------------------------------------------------------------------
+
+PREAUTH = {"preauthurl": "http://127.0.0.1:1/v1/AUTH_test", "preauthtoken": "tk"}
+
+
+def test_pool_connection_per_thread() -> None:
+    store = SwiftStore("c", storage_options=PREAUTH, max_connections=4)
+    main = store.conn
+    assert store.conn is main
+
+    async def _worker_conn():
+        return await store._pool.run(lambda conn: conn)
+
+    other = asyncio.run(_worker_conn())
+    assert other is not main
+    assert store._pool.executor._max_workers == 4
+
+
+def test_pool_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        SwiftStore("c", storage_options=PREAUTH, max_connections=0)
+
+
+def test_pool_shared_with_read_only() -> None:
+    store = SwiftStore("c", storage_options=PREAUTH)
+    ro = store.with_read_only(True)
+    assert ro._pool is store._pool
+    assert ro.read_only
+
+
+def test_pickle_rebuilds_pool_lazily() -> None:
+    import pickle
+
+    store = SwiftStore("c", prefix="p", storage_options=PREAUTH, max_connections=3)
+    store.conn  # materialize a connection
+    clone = pickle.loads(pickle.dumps(store))
+    assert clone == store
+    assert clone._pool_instance is None
+    assert clone._pool.max_connections == 3
+    assert clone.conn.url == PREAUTH["preauthurl"]
+
+
+def test_invalid_transport() -> None:
+    with pytest.raises(ValueError):
+        SwiftStore("c", storage_options=PREAUTH, transport="curl")
+
+
+def test_aiohttp_transport_is_lazy() -> None:
+    pytest.importorskip("aiohttp")
+    store = SwiftStore("c", storage_options=PREAUTH, transport="aiohttp")
+    assert store._aio_instance is None
+    assert store._aio.url == PREAUTH["preauthurl"]
+    assert store.with_read_only(True)._aio_instance is store._aio_instance
+
+
+def test_invalid_list_page_size() -> None:
+    with pytest.raises(ValueError):
+        SwiftStore("c", storage_options=PREAUTH, list_page_size=0)
+
+
+async def test_open_skips_known_and_read_only_containers() -> None:
+    from .. import storage
+
+    # nothing listens on PREAUTH's URL: any request would fail
+    store = await SwiftStore.open("c", storage_options=PREAUTH, read_only=True)
+    assert store._is_open
+    storage._known_containers.add((PREAUTH["preauthurl"], "c"))
+    store = await SwiftStore.open("c", storage_options=PREAUTH)
+    assert store._is_open
+
+
+async def test_write_creates_missing_container(monkeypatch: pytest.MonkeyPatch) -> None:
+    from swiftclient.exceptions import ClientException
+
+    from .. import storage
+
+    monkeypatch.setattr(storage, "_known_containers", {(PREAUTH["preauthurl"], "c")})
+    store = SwiftStore("c", storage_options=PREAUTH)
+    containers: set[str] = set()
+    calls = []
+
+    async def call(method: str, container: str, *args: Any, **kwargs: Any) -> Any:
+        calls.append(method)
+        if method == "put_container":
+            containers.add(container)
+        elif container not in containers:
+            raise ClientException("missing", http_status=404)
+        return "etag" if method == "put_object" else {}
+
+    monkeypatch.setattr(store, "_call", call)
+    await store.set("k", cpu_buffer.Buffer.from_bytes(b"x"))
+    assert calls == ["put_object", "head_container", "put_container", "put_object"]
+
+
+def test_coalesce() -> None:
+    ranges = [(100, 110), (0, 10), (12, 20), (50, 60)]
+    assert _coalesce(ranges, gap=5, max_size=1000) == [(0, 20), (50, 60), (100, 110)]
+    assert _coalesce(ranges, gap=100, max_size=1000) == [(0, 110)]
+    assert _coalesce(ranges, gap=100, max_size=60) == [(0, 60), (100, 110)]
+    assert _coalesce([(0, 10), (5, 8)], gap=0, max_size=1) == [(0, 10)]
+
+
+async def test_drain_bounds_concurrency() -> None:
+    produced = in_flight = peak = 0
+
+    async def items():
+        nonlocal produced
+        for i in range(100):
+            produced += 1
+            yield i
+
+    async def work(item: int, fail: int | None = None) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if item == fail:
+            raise ValueError(item)
+        return item
+
+    assert sorted(await _drain(items(), work, 4)) == list(range(100))
+    assert peak == 4
+    # a failure stops the listing instead of consuming it to the end
+    produced = 0
+    with pytest.raises(ValueError):
+        await _drain(items(), lambda item: work(item, fail=10), 4)
+    assert produced < 50
+
+
+def test_failed_keys() -> None:
+    keys = ["p/a b", "p/c/0", "p/c/1"]
+    assert _failed_keys(keys, [("/cont/p/a%20b", "400 Bad Request")]) == ["p/a b"]
+    assert _failed_keys(keys, [("/cont/p/c/1", "503"), ("/cont/p/c/0", "503")]) == [
+        "p/c/0",
+        "p/c/1",
+    ]
+    # an error that names no pending key fails them all
+    assert _failed_keys(keys, [("/cont/p", "400 Bad Request")]) == keys
+
+
+def test_parse_byteranges() -> None:
+    body = (
+        b"--xyz\r\nContent-Type: application/octet-stream\r\n"
+        b"Content-Range: bytes 2-4/20\r\n\r\nabc\r\n"
+        b"--xyz\r\nContent-Range: bytes 10-11/20\r\n\r\nde\r\n--xyz--\r\n"
+    )
+    headers = {"content-type": "multipart/byteranges; boundary=xyz"}
+    parts = _parse_byteranges(headers, body)
+    assert [(offset, bytes(view)) for offset, view in parts] == [(2, b"abc"), (10, b"de")]
+
+    parts = _parse_byteranges({"content-range": "bytes 5-7/20"}, b"fgh")
+    assert [(offset, bytes(view)) for offset, view in parts] == [(5, b"fgh")]
+
+    parts = _parse_byteranges({}, b"whole")
+    assert [(offset, bytes(view)) for offset, view in parts] == [(0, b"whole")]
+
+
+def test_buffer_reader_is_zero_copy() -> None:
+    data = bytearray(b"0123456789")
+    reader = _BufferReader(memoryview(data))
+    assert len(reader) == 10
+    chunk = reader.read(4)
+    assert isinstance(chunk, memoryview) and chunk.obj is data
+    assert bytes(chunk) == b"0123"
+    assert reader.tell() == 4
+    assert bytes(reader.read()) == b"456789"
+    assert bytes(reader.read(3)) == b""
+    reader.seek(0)
+    assert bytes(reader.read(2)) == b"01"
+    reader.seek(-3, 2)
+    assert bytes(reader.read(10)) == b"789"
+
+
+class _BrokenBody:
+    """swiftclient ``_ObjectBody`` whose stream fails after ``fail_after`` bytes."""
+
+    def __init__(self, data: bytes, chunk_size: int, fail_after: int | None) -> None:
+        self.data = data
+        self.chunk_size = chunk_size
+        self.sent = 0
+        self.fail_after = fail_after
+        self.closed = False
+        self.resp = self.raw = self  # the body reads ``resp.raw``
+
+    def read(self, size: int) -> bytes:
+        if self.fail_after is not None and self.sent >= self.fail_after:
+            raise ConnectionResetError("connection dropped")
+        chunk = self.data[self.sent:self.sent + size]
+        self.sent += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+async def test_stream_resumes_after_dropped_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from ..retry import RetryPolicy
+
+    store = SwiftStore("c", storage_options=PREAUTH, retry=RetryPolicy(backoff_base=0.001))
+    data = bytes(range(256)) * 40
+    requests = []
+    bodies = []
+
+    async def call(method: str, container: str, obj: str, **kwargs: Any) -> Any:
+        requests.append(kwargs["headers"])
+        header = kwargs["headers"].get("Range", "bytes=0-")
+        first, _, last = header.split("=")[1].partition("-")
+        start, stop = int(first), int(last) + 1 if last else len(data)
+        body = _BrokenBody(data[start:stop], kwargs["resp_chunk_size"],
+                           1000 if len(requests) == 1 else None)
+        bodies.append(body)
+        headers = {"etag": "abc", "content-length": str(stop - start)}
+        if "Range" in kwargs["headers"]:
+            headers["content-range"] = f"bytes {start}-{stop - 1}/{len(data)}"
+        return headers, body
+
+    monkeypatch.setattr(store, "_call", call)
+    assert b"".join([c async for c in store.stream("k", chunk_size=300)]) == data
+    assert requests[1] == {"Range": f"bytes=1200-{len(data) - 1}", "If-Match": "abc"}
+    assert all(body.closed for body in bodies)
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from zarr.core.buffer import cpu, default_buffer_prototype
+
+from .. import SwiftStore, storage
+from ..retry import RetryPolicy
+from ..testing import FakeSwift
+from ..transfer import _Blocking, copy_prefix, copy_store
+
+
+async def _fill(store, keys):
+    for i, key in enumerate(keys):
+        await store.set(key, cpu.Buffer.from_bytes(key.encode() * (i + 1)))
+
+
+async def _read(store, prefix=""):
+    proto = default_buffer_prototype()
+    keys = sorted([key async for key in store.list_prefix(prefix)])
+    return {key: (await store.get(key, proto)).to_bytes() for key in keys}
+
+
+async def test_copy_prefix_server_side():
+    keys = [f"staging/c/{i}" for i in range(12)] + ["staging/zarr.json", "other/x"]
+    with FakeSwift(listing_limit=5) as server:
+        source = await SwiftStore.open(
+            "src", storage_options=server.auth_options, list_page_size=5
+        )
+        public = await SwiftStore.open(
+            "public",
+            prefix="datasets",
+            storage_options=server.auth_options,
+            list_page_size=5,
+        )
+        await _fill(source, keys)
+        server.reset_counts()
+
+        result = await copy_prefix(source, "staging/", public, "v1/", concurrency=4)
+        assert (result.copied, result.skipped, result.server_side) == (13, 0, True)
+        assert server.count("GET") == 4  # listing pages only: no data went through us
+        copied = await _read(public)
+        source_data = await _read(source, "staging/")
+        assert copied == {k.replace("staging/", "v1/"): v for k, v in source_data.items()}
+
+        # a second run finds everything up to date; changed keys are copied again
+        await source.set("staging/c/3", cpu.Buffer.from_bytes(b"changed"))
+        await public.delete("v1/c/7")
+        result = await copy_prefix(source, "staging/", public, "v1/")
+        assert (result.copied, result.skipped) == (2, 11)
+        assert result.nbytes == len(b"changed") + len(source_data["staging/c/7"])
+
+        # re-prefix within one container
+        result = await copy_prefix(source, "staging/", dest_prefix="archive/")
+        assert result.copied == 13
+        assert len(await _read(source, "archive/")) == 13
+
+        with pytest.raises(ValueError, match="overlap"):
+            await copy_prefix(source, "staging/", dest_prefix="staging/old/")
+        with pytest.raises(ValueError, match="overlap"):
+            await copy_store(source, source)
+        source.close()
+        public.close()
+
+
+@pytest.mark.parametrize("transport", storage.TRANSPORTS)
+async def test_copy_store_across_accounts(transport):
+    if transport == "aiohttp":
+        pytest.importorskip("aiohttp")
+    keys = [f"c/{i}" for i in range(10)] + ["zarr.json"]
+    with FakeSwift() as here, FakeSwift(error_rate=0.2) as there:
+        source = await SwiftStore.open(
+            "data", prefix="ds", storage_options=here.auth_options, transport=transport
+        )
+        await _fill(source, keys)
+        destination = await SwiftStore.open(
+            "data",
+            prefix="ds",
+            storage_options={**there.auth_options, "retries": 0},
+            transport=transport,
+            retry=RetryPolicy(max_attempts=20, backoff_base=0.001),
+        )
+        result = await copy_store(source, destination, chunk_size=7)
+        assert (result.copied, result.server_side) == (11, False)
+        assert await _read(destination) == await _read(source)
+
+        result = await copy_store(source, destination)
+        assert (result.copied, result.skipped) == (0, 11)
+        source.close()
+        destination.close()
+
+
+async def test_copy_slo_resumes_by_size():
+    with FakeSwift() as server:
+        source = await SwiftStore.open(
+            "slo", storage_options=server.auth_options, segment_size=10
+        )
+        await source.set("big", cpu.Buffer.from_bytes(bytes(range(35))))
+        destination = await SwiftStore.open("plain", storage_options=server.auth_options)
+        assert (await copy_store(source, destination)).copied == 1
+        proto = default_buffer_prototype()
+        assert (await destination.get("big", proto)).to_bytes() == bytes(range(35))
+        assert (await copy_store(source, destination)).skipped == 1
+        source.close()
+        destination.close()
+
+
+async def test_blocking_close_waits_for_read():
+    started, release, closed = asyncio.Event(), asyncio.Event(), []
+
+    async def chunks():
+        try:
+            yield b"a"
+            started.set()
+            await release.wait()
+            yield b"b"
+        finally:
+            closed.append(True)
+
+    body = _Blocking(chunks(), asyncio.get_running_loop())
+    reader = iter(body)
+    assert await asyncio.to_thread(next, reader) == b"a"
+    pending = asyncio.ensure_future(asyncio.to_thread(next, reader))
+    await started.wait()
+    closing = asyncio.ensure_future(body.aclose())
+    await asyncio.sleep(0.01)
+    assert not closed  # the read in flight still owns the generator
+    release.set()
+    assert await pending == b"b"
+    await closing
+    assert closed
+    with pytest.raises(RuntimeError):
+        await asyncio.to_thread(next, reader)
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import os
+import threading
+import time
 import pytest
 from unittest import mock
+from swiftclient.exceptions import ClientException
 from .. import SwiftStore
 from .. import utils
 
@@ -50,6 +53,109 @@ def test_getenv_auth():
     os.environ.update(auth)
 
 
+class FakeAuth:
+    "Stands in for requests.get against a TempAuth endpoint"
+
+    def __init__(self, expires=None, delay=0):
+        self.calls = 0
+        self.expires = expires
+        self.delay = delay
+
+    def __call__(self, url, headers=None, timeout=None):
+        time.sleep(self.delay)
+        self.calls += 1
+        response = mock.Mock(ok=True, headers={
+            "x-storage-url": "http://swift/v1/AUTH_test",
+            "x-auth-token": f"tk{self.calls}",
+        })
+        if self.expires is not None:
+            response.headers["x-auth-token-expires"] = str(self.expires)
+        return response
+
+
+def test_token_provider_refreshes_before_expiry(monkeypatch):
+    fake = FakeAuth(expires=0.2)
+    monkeypatch.setattr(utils.requests, "get", fake)
+    provider = utils.TokenProvider("http://auth", "a:u", "k")
+    assert provider.get() == ("http://swift/v1/AUTH_test", "tk1")
+    assert provider.get()[1] == "tk1"
+    assert provider.expires_at > time.time()
+    time.sleep(0.2)  # inside the refresh margin (half the lifetime here)
+    assert provider.get()[1] == "tk2"
+    assert fake.calls == 2
+
+
+def test_token_provider_single_flight(monkeypatch):
+    fake = FakeAuth(delay=0.05)
+    monkeypatch.setattr(utils.requests, "get", fake)
+    provider = utils.TokenProvider("http://auth", "a:u", "k")
+    provider.seed("http://swift/v1/AUTH_test", "tk0")
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(provider.get(stale="tk0")[1]))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tokens == ["tk1"] * 16
+    assert fake.calls == 1
+
+    provider.invalidate("tk1")
+    provider.seed("http://swift/v1/AUTH_test", "tk0")  # ignored after a refresh
+    assert provider.get()[1] == "tk2"
+
+
+async def test_token_provider_async(monkeypatch):
+    monkeypatch.setattr(utils.requests, "get", FakeAuth())
+    provider = utils.TokenProvider("http://auth", "a:u", "k")
+    assert (await provider.aget())[1] == "tk1"
+    assert (await provider.aget(stale="tk1"))[1] == "tk2"
+
+
+def test_token_provider_errors(monkeypatch):
+    response = mock.Mock(ok=False, status_code=401, reason="Unauthorized",
+                         content=b"", headers={})
+    monkeypatch.setattr(utils.requests, "get", lambda *a, **kw: response)
+    with pytest.raises(ClientException) as exc:
+        utils.TokenProvider("http://auth", "a:u", "k").get()
+    assert exc.value.http_status == 401
+
+
+def test_token_provider_for():
+    assert utils.token_provider_for({"preauthurl": "u", "preauthtoken": "t"}) is None
+    options = {"authurl": "http://auth-for", "user": "a:u", "key": "k"}
+    assert utils.token_provider_for({**options, "auth_version": "3"}) is None
+    provider = utils.token_provider_for({**options, "preauthurl": "u", "preauthtoken": "t"})
+    assert provider is utils.token_provider("http://auth-for", "a:u", "k")
+    assert provider.get() == ("u", "t")
+
+
+def test_connections_share_provider_tokens(monkeypatch):
+    from ..storage import _Connection
+
+    monkeypatch.setattr(utils.requests, "get", FakeAuth())
+    options = {"authurl": "http://auth-conn", "user": "a:u", "key": "k"}
+    provider = utils.token_provider_for(options)
+    conn = _Connection(**options, token_provider=provider, retries=0,
+                       starting_backoff=0)
+    seen = []
+
+    def func(url, token, **kwargs):
+        seen.append(token)
+        if token == "tk1":
+            raise ClientException("rejected", http_status=401)
+        return token
+
+    assert conn._retry(None, func) == "tk2"  # re-authenticated once on 401
+    other = _Connection(**options, token_provider=provider, retries=0,
+                       starting_backoff=0)
+    assert other._retry(None, func) == "tk2"  # picks up the shared token
+    assert seen == ["tk1", "tk2", "tk2"]
+    assert provider.refreshes == 2
+
+
 @skip_no_swift
 def test_acquire_token():
     
@@ -0,0 +1,335 @@
+"""
+Copy keys between SwiftStores without routing data through the client.
+
+``copy_prefix`` and ``copy_store`` copy every object under a prefix of one
+store to another prefix, container or store. Within one account, each
+object is copied by Swift itself with a ``PUT`` carrying ``X-Copy-From``,
+so no data crosses the client. Between accounts, objects are streamed from
+the source into the destination in chunks of constant size. Keys whose
+destination already has the same ETag are skipped, which makes an
+interrupted copy resumable by running it again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+from swiftclient.exceptions import ClientException
+
+from .storage import DEFAULT_STREAM_CHUNK_SIZE, SwiftBulkError, SwiftStore
+
+DEFAULT_COPY_CONCURRENCY = 32
+
+
+@dataclass
+class CopyResult:
+    """What ``copy_prefix`` did.
+
+    Parameters
+    ----------
+    copied:
+        Objects copied.
+    skipped:
+        Objects already present with the same ETag at the destination.
+    nbytes:
+        Size of the copied objects.
+    server_side:
+        Whether Swift copied the objects (same account) or they were
+        streamed through the client (different accounts).
+    """
+
+    copied: int = 0
+    skipped: int = 0
+    nbytes: int = 0
+    server_side: bool = True
+
+
+async def copy_store(
+    source: SwiftStore, destination: SwiftStore, **kwargs: Any
+) -> CopyResult:
+    """Copy every key of ``source`` to ``destination`` (see ``copy_prefix``)."""
+    return await copy_prefix(source, "", destination, "", **kwargs)
+
+
+async def copy_prefix(
+    source: SwiftStore,
+    prefix: str = "",
+    destination: SwiftStore | None = None,
+    dest_prefix: str | None = None,
+    *,
+    concurrency: int = DEFAULT_COPY_CONCURRENCY,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+) -> CopyResult:
+    """Copy the keys of ``source`` starting with ``prefix``.
+
+    Key ``prefix + rest`` is copied to ``dest_prefix + rest`` of
+    ``destination``. The source and destination listings are read
+    concurrently and merged, and up to ``concurrency`` objects are copied
+    at a time.
+
+    Parameters
+    ----------
+    source:
+        Store to copy from.
+    prefix:
+        Store-relative prefix of the keys to copy (``""``: all keys).
+    destination:
+        Store to copy to (default: ``source``). It may use another
+        container, prefix or account.
+    dest_prefix:
+        Prefix replacing ``prefix`` in the copied keys (default: ``prefix``).
+    concurrency:
+        Maximum number of objects copied at a time.
+    chunk_size:
+        Chunk size of streamed copies between accounts.
+
+    Returns
+    -------
+    CopyResult
+
+    Raises
+    ------
+    ValueError
+        If the source and destination key ranges overlap.
+    SwiftBulkError
+        If some objects could not be copied, after copying all others.
+        Running the copy again retries only the missing objects.
+
+    Notes
+    -----
+    A destination object is considered up to date when its ETag equals the
+    source's. The ETag of a Static Large Object is not the checksum of its
+    content, and its copy is a single object, so SLOs are compared by size.
+    Copies of SLOs are limited to Swift's maximum object size (5 GiB).
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}.")
+    if destination is None:
+        destination = source
+    if dest_prefix is None:
+        dest_prefix = prefix
+    destination._check_writable()
+    src_full = source._full_key(prefix)
+    dst_full = destination._full_key(dest_prefix)
+    server_side = await source._storage_url() == await destination._storage_url()
+    if (
+        server_side
+        and source.container == destination.container
+        and (src_full.startswith(dst_full) or dst_full.startswith(src_full))
+    ):
+        raise ValueError(
+            f"Cannot copy {src_full!r} to {dst_full!r}: the key ranges overlap."
+        )
+    await destination._ensure_container()
+
+    result = CopyResult(server_side=server_side)
+    errors: list[tuple[str, str]] = []
+    queue: asyncio.Queue[tuple[str, dict[str, Any]] | None] = asyncio.Queue(
+        maxsize=2 * concurrency
+    )
+
+    async def _copy(rest: str, entry: dict[str, Any]) -> None:
+        src_name, dst_name = src_full + rest, dst_full + rest
+        if server_side:
+            etag = await destination._call(
+                "put_object",
+                destination.container,
+                dst_name,
+                None,
+                content_length=0,
+                headers={"X-Copy-From": quote(f"/{source.container}/{src_name}")},
+            )
+        else:
+            etag = await _stream_copy(source, src_name, destination, dst_name, entry,
+                                      chunk_size)
+        if destination.cache is not None:
+            await destination._cache_io(
+                destination.cache.invalidate, destination._cache_key(dst_name)
+            )
+        destination._meta_record(dst_name, int(entry["bytes"]), etag)
+        result.copied += 1
+        result.nbytes += int(entry["bytes"])
+
+    async def _worker() -> None:
+        while (item := await queue.get()) is not None:
+            rest, entry = item
+            try:
+                await _copy(rest, entry)
+            except ClientException as exc:
+                errors.append((f"/{source.container}/{src_full + rest}",
+                               f"{exc.http_status} {exc.http_reason}"))
+            except Exception as exc:
+                errors.append((f"/{source.container}/{src_full + rest}", repr(exc)))
+
+    workers = [asyncio.ensure_future(_worker()) for _ in range(concurrency)]
+    existing = _Listing(destination, dst_full)
+    try:
+        async for rest, entry in _entries(source, src_full):
+            match = await existing.find(rest)
+            if match is not None and _unchanged(entry, match):
+                result.skipped += 1
+            else:
+                await queue.put((rest, entry))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await existing.aclose()
+    if errors:
+        raise SwiftBulkError(f"Failed to copy {len(errors)} objects", errors)
+    return result
+
+
+def _unchanged(entry: dict[str, Any], existing: dict[str, Any]) -> bool:
+    """Whether ``existing`` is an up-to-date copy of listing entry ``entry``."""
+    if "slo_etag" in entry:
+        return existing.get("bytes") == entry.get("bytes")
+    return existing.get("hash") == entry.get("hash")
+
+
+async def _entries(
+    store: SwiftStore, full_prefix: str
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Listing entries under ``full_prefix`` as ``(rest of name, entry)``."""
+    async for entry in store._iter_container(full_prefix):
+        name = entry.get("name")
+        if name:
+            yield name[len(full_prefix):], entry
+
+
+class _Listing:
+    """Sorted listing read ahead by a background task, searched in order.
+
+    ``find`` must be called with increasing names, as it consumes the
+    listing up to the name it looks for.
+    """
+
+    def __init__(self, store: SwiftStore, full_prefix: str) -> None:
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]] | None] = asyncio.Queue(
+            maxsize=store.list_page_size
+        )
+        self._head: tuple[str, dict[str, Any]] | None = None
+        self._done = False
+        self._task = asyncio.ensure_future(self._fill(store, full_prefix))
+
+    async def _fill(self, store: SwiftStore, full_prefix: str) -> None:
+        try:
+            async for item in _entries(store, full_prefix):
+                await self._queue.put(item)
+        finally:
+            await self._queue.put(None)
+
+    async def find(self, rest: str) -> dict[str, Any] | None:
+        while not self._done and (self._head is None or self._head[0] < rest):
+            self._head = await self._queue.get()
+            if self._head is None:
+                self._done = True
+                self._task.result()  # raise listing errors
+        if self._head is not None and self._head[0] == rest:
+            return self._head[1]
+        return None
+
+    async def aclose(self) -> None:
+        self._task.cancel()
+        # errors of a listing that was still needed were raised by find()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await self._task
+
+
+async def _stream_copy(
+    source: SwiftStore,
+    src_name: str,
+    destination: SwiftStore,
+    dst_name: str,
+    entry: dict[str, Any],
+    chunk_size: int,
+) -> str:
+    """Stream one object from ``source`` into ``destination``; its new ETag.
+
+    An upload cannot be rewound, so a failed copy is restarted from the
+    first byte, following the destination's retry policy.
+    """
+    policy = destination.retry
+    kwargs = {"content_type": entry.get("content_type")}
+    if "slo_etag" not in entry and entry.get("hash"):
+        kwargs["etag"] = entry["hash"]  # Swift verifies the received data
+    attempt = 1
+    while True:
+        failures: list[BaseException] = []
+        chunks = _relay(source.stream(source._strip_prefix(src_name),
+                                      chunk_size=chunk_size), failures)
+        if destination.transport == "aiohttp":
+            body: Any = chunks
+        else:
+            body = _Blocking(chunks, asyncio.get_running_loop())
+        try:
+            return await destination._attempt(
+                "put_object", (destination.container, dst_name, body), kwargs
+            )
+        except Exception as exc:
+            cause = failures[0] if failures else exc  # the source, not the upload
+            if isinstance(cause, FileNotFoundError):
+                raise ClientException(
+                    "Object vanished during copy", http_status=404
+                ) from cause
+            if attempt >= policy.max_attempts or not policy.retryable(cause):
+                raise cause
+            if destination.metrics is not None:
+                destination.metrics.retry()
+            await asyncio.sleep(policy.backoff(attempt, cause))
+            attempt += 1
+        finally:
+            await body.aclose()
+
+
+async def _relay(
+    chunks: AsyncIterator[bytes], failures: list[BaseException]
+) -> AsyncIterator[bytes]:
+    """Pass ``chunks`` through, keeping the error that ends them, if any."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as exc:
+        failures.append(exc)
+        raise
+    finally:
+        await chunks.aclose()  # type: ignore[attr-defined]
+
+
+class _Blocking:
+    """Iterate ``chunks`` from a worker thread while ``loop`` runs it.
+
+    A timed-out upload may still be reading in its worker thread, so
+    ``aclose`` waits for the chunk being fetched before closing ``chunks``.
+    Reads after that fail, which aborts the abandoned upload.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        self._chunks = chunks
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        while (
+            chunk := asyncio.run_coroutine_threadsafe(self._next(), self._loop).result()
+        ) is not None:
+            yield chunk
+
+    async def _next(self) -> bytes | None:
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("Copy source closed")
+            return await anext(self._chunks, None)
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            self._closed = True
+            await self._chunks.aclose()  # type: ignore[attr-defined]
@@ -1,7 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
 import os
+import random
+import threading
+import time
+
 import requests
+from swiftclient.exceptions import ClientException
+
+# refresh tokens this many seconds before they expire
+DEFAULT_REFRESH_MARGIN = 300
 
 
 def getenv_auth():
@@ -20,23 +29,142 @@ def getenv_auth():
     return auth
 
 
+class TokenProvider:
+    """Thread- and async-safe cache of a Swift auth v1.0 token.
+
+    The token is fetched on first use and refreshed ahead of its
+    ``X-Auth-Token-Expires`` deadline, at a random point within the last
+    ``refresh_margin`` seconds so that many processes sharing credentials
+    do not re-authenticate at the same instant. Concurrent callers wait
+    for a single refresh instead of each authenticating. A token rejected
+    by Swift is dropped with ``invalidate`` and replaced on next use.
+
+    Use ``token_provider`` to get the instance shared by every connection
+    of the process for the same credentials.
+    """
+
+    def __init__(self, authurl, user, key, refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 timeout=None):
+        self.authurl = authurl
+        self.user = user
+        self.key = key
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.url = None
+        self.token = None
+        self.expires_at = None  # wall-clock expiry, if Swift reported one
+        self.refreshes = 0
+        self._refresh_at = None  # monotonic deadline for the next refresh
+        self._rejected = None  # last invalidated token
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"TokenProvider(authurl={self.authurl!r}, user={self.user!r})"
+
+    def seed(self, url, token):
+        "Use a pre-auth token (of unknown lifetime) until it is rejected"
+        with self._lock:
+            if self.token is None and not self.refreshes and token != self._rejected:
+                self.url, self.token = url, token
+
+    def _fresh(self, stale):
+        return (
+            self.token is not None
+            and self.token != stale
+            and (self._refresh_at is None or time.monotonic() < self._refresh_at)
+        )
+
+    def get(self, stale=None):
+        "Return ``(storage_url, token)``; ``stale`` is a token known to be rejected"
+        if self._fresh(stale):
+            return self.url, self.token
+        with self._lock:
+            # only the first waiter refreshes; the rest reuse its token
+            if not self._fresh(stale):
+                self._refresh()
+            return self.url, self.token
+
+    async def aget(self, stale=None):
+        "``get`` for coroutines; a refresh runs in a worker thread"
+        if self._fresh(stale):
+            return self.url, self.token
+        return await asyncio.to_thread(self.get, stale)
+
+    def invalidate(self, token):
+        "Drop ``token`` if it is still the current one"
+        with self._lock:
+            if self.token == token:
+                self.token = None
+                self._rejected = token
+
+    def _refresh(self):
+        headers = {"X-Auth-User": self.user, "X-Auth-Key": self.key}
+        r = requests.get(self.authurl, headers=headers, timeout=self.timeout)
+        if not r.ok:
+            raise ClientException(
+                "Auth GET failed",
+                http_status=r.status_code,
+                http_reason=r.reason,
+                http_response_content=r.content,
+                http_response_headers=dict(r.headers),
+            )
+        self.url = r.headers['x-storage-url']
+        self.token = r.headers.get('x-storage-token') or r.headers['x-auth-token']
+        self.refreshes += 1
+        token_expires = r.headers.get('x-auth-token-expires')
+        if token_expires:
+            lifetime = float(token_expires)
+            margin = min(self.refresh_margin, lifetime / 2)
+            lead = margin * random.uniform(0.5, 1.0)
+            self.expires_at = time.time() + lifetime
+            self._refresh_at = time.monotonic() + lifetime - lead
+        else:
+            self.expires_at = self._refresh_at = None
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def token_provider(authurl, user, key, **kwargs):
+    "TokenProvider shared by the whole process for these credentials"
+    with _providers_lock:
+        provider = _providers.get((authurl, user, key))
+        if provider is None:
+            provider = TokenProvider(authurl, user, key, **kwargs)
+            _providers[(authurl, user, key)] = provider
+        return provider
+
+
+def token_provider_for(storage_options):
+    "Shared TokenProvider for auth v1.0 ``storage_options``, or None"
+    get = storage_options.get
+    if not (get("authurl") and get("user") and get("key")):
+        return None
+    if str(get("auth_version", "1")).split(".")[0] != "1":
+        return None  # other auth versions are left to swiftclient
+    provider = token_provider(get("authurl"), get("user"), get("key"),
+                              timeout=get("timeout"))
+    if get("preauthurl") and get("preauthtoken"):
+        provider.seed(get("preauthurl"), get("preauthtoken"))
+    return provider
+
+
 def acquire_token(authurl, user, key=None, update_env=True):
     "Swift auth v1.0"
     assert ':' in user, "Must be of the form '<project>:<user>'"
     if not key:
         import getpass
         key = getpass.getpass('Key: ')
-    headers = {"X-Auth-User": user, "X-Auth-Key": key}
-    r = requests.get(authurl, headers=headers)
-    r.raise_for_status()
-    token_expires = r.headers.get('x-auth-token-expires')
-    if token_expires:
+    provider = token_provider(authurl, user, key)
+    url, token = provider.get()
+    if provider.expires_at is not None:
         from datetime import timedelta
-        dt = timedelta(seconds=int(token_expires))
+        dt = timedelta(seconds=int(provider.expires_at - time.time()))
         print("Token expires in: " + str(dt))
     auth = {
-        "preauthurl": r.headers['x-storage-url'],
-        "preauthtoken": r.headers['x-auth-token'],
+        "preauthurl": url,
+        "preauthtoken": token,
     }
     if update_env:
         os.environ['OS_STORAGE_URL'] = auth['preauthurl']